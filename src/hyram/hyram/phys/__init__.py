@@ -6,9 +6,11 @@ You should have received a copy of the GNU General Public License along with HyR
 If not, see https://www.gnu.org/licenses/.
 """
 
-from ._jet import Jet
+from ._jet import Jet, JetBatch
 from ._indoor_release import IndoorRelease
-from ._flame import Flame
+from ._flame import Flame, FlameBatch, TransientFlame, AtmosphericTransmissivity
+from ._surrogate import JetSurrogate, FlameSurrogate
+from ._cache import ResultCache
 from ._comps import Fluid, Orifice, Source, Enclosure, Vent
 from ._unconfined_overpressure import BST_method, TNT_method, Bauwens_method
 from . import c_api, api
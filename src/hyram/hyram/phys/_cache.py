@@ -0,0 +1,249 @@
+"""
+Copyright 2015-2022 National Technology & Engineering Solutions of Sandia, LLC (NTESS).
+Under the terms of Contract DE-NA0003525 with NTESS, the U.S. Government retains certain rights in this software.
+
+You should have received a copy of the GNU General Public License along with HyRAM+.
+If not, see https://www.gnu.org/licenses/.
+"""
+
+from __future__ import print_function, absolute_import, division
+
+import hashlib
+import inspect
+import io
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from .. import __version__
+from ._comps import Fluid, Orifice
+from ._flame import Flame
+from ._jet import Jet
+
+
+class ResultCache:
+    '''
+    Content-addressed, on-disk cache of solved jets and flames
+
+    Each entry is stored under a hash of all of the inputs (physical and numerical) and the
+    package version, as an .npz file of the solution arrays and a .json file of the scalar
+    properties that also holds the sha256 of the .npz file, which is checked when loading.
+    Entries that fail the check are removed and recalculated.  The least recently used
+    entries are removed when the total size of the cache exceeds max_size.  Flames given a
+    Combustion object (chem) are not cached, as it is not part of the key.
+    '''
+    # arguments that do not change the solution
+    _ignored = ('self', 'chem', 'verbose', 'suppressWarnings')
+    _flame_scalars = ('Lvis', 'Wf', 'tauf', 'Xrad', 'Srad', 'Frf', 'dstar')
+
+    def __init__(self, directory, max_size=500e6):
+        '''
+        Parameters
+        ----------
+        directory : str
+            directory in which to store the results (created if it does not exist)
+        max_size : float, optional
+            maximum total size (bytes) of the stored results
+        '''
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_size = max_size
+
+    @classmethod
+    def _canonical(cls, value):
+        '''
+        JSON-serializable form of an input, which is the same for equal inputs
+        '''
+        if isinstance(value, Fluid):
+            return {'species': value.species, 'T': cls._canonical(value.T), 'P': cls._canonical(value.P),
+                    'rho': cls._canonical(value.rho), 'v': cls._canonical(value.v)}
+        if isinstance(value, Orifice):
+            return {'d': cls._canonical(value.d), 'Cd': cls._canonical(value.Cd)}
+        if isinstance(value, dict):
+            return {str(k): cls._canonical(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple, np.ndarray)):
+            return [cls._canonical(v) for v in value]
+        if isinstance(value, (bool, np.bool_)):
+            return bool(value)
+        if isinstance(value, (int, float, np.integer, np.floating)):
+            return repr(float(value))
+        if value is None or isinstance(value, str):
+            return value
+        raise TypeError('Cannot cache results for input {!r}'.format(value))
+
+    def key(self, kind, inputs):
+        '''
+        Hash identifying a result
+
+        Parameters
+        ----------
+        kind : str
+            type of result (e.g., 'Jet')
+        inputs : dict
+            all inputs that determine the result
+
+        Returns
+        -------
+        hexadecimal sha256 of the canonical inputs, kind and package version
+        '''
+        text = json.dumps({'kind': kind, 'version': __version__, 'inputs': self._canonical(inputs)},
+                          sort_keys=True)
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def _paths(self, key):
+        return os.path.join(self.directory, key + '.json'), os.path.join(self.directory, key + '.npz')
+
+    def _write(self, path, data):
+        with tempfile.NamedTemporaryFile(dir=self.directory, delete=False) as temp:
+            temp.write(data)
+        os.replace(temp.name, path)
+
+    def _remove(self, key):
+        for path in self._paths(key):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def load(self, key):
+        '''
+        Loads a stored result
+
+        Returns
+        -------
+        (arrays, scalars) : (dict, dict), or None if there is no valid result stored under key
+        '''
+        meta_path, data_path = self._paths(key)
+        try:
+            with open(meta_path) as meta_file:
+                meta = json.load(meta_file)
+            with open(data_path, 'rb') as data_file:
+                data = data_file.read()
+        except (OSError, ValueError):
+            return None
+        if meta.get('version') != __version__ or hashlib.sha256(data).hexdigest() != meta.get('sha256'):
+            self._remove(key)
+            return None
+        with np.load(io.BytesIO(data)) as arrays:
+            arrays = {name: arrays[name] for name in arrays.files}
+        os.utime(meta_path)  # most recently used
+        return arrays, meta['scalars']
+
+    def store(self, key, arrays, scalars=None):
+        '''
+        Stores a result, then removes the least recently used results if the cache is too large
+
+        Parameters
+        ----------
+        key : str
+            hash identifying the result (see key)
+        arrays : dict of ndarrays
+            arrays to store
+        scalars : dict of floats, optional
+            scalar properties to store
+        '''
+        buffer = io.BytesIO()
+        np.savez(buffer, **arrays)
+        data = buffer.getvalue()
+        meta = {'version': __version__, 'sha256': hashlib.sha256(data).hexdigest(),
+                'scalars': {name: float(value) for name, value in (scalars or {}).items()}}
+        meta_path, data_path = self._paths(key)
+        self._write(data_path, data)
+        self._write(meta_path, json.dumps(meta).encode())
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.json'):
+                key = name[:-len('.json')]
+                meta_path, data_path = self._paths(key)
+                try:  # entries may be removed by another process while listing
+                    mtime, size = os.path.getmtime(meta_path), os.path.getsize(meta_path)
+                except OSError:
+                    continue
+                try:
+                    size += os.path.getsize(data_path)
+                except OSError:
+                    pass
+                entries.append((mtime, size, key))
+        entries.sort()
+        total = sum(entry[1] for entry in entries)
+        for _, size, key in entries[:-1]:
+            if total <= self.max_size:
+                break
+            self._remove(key)
+            total -= size
+
+    def clear(self):
+        '''
+        Removes all stored results
+        '''
+        for name in os.listdir(self.directory):
+            if name.endswith('.json') or name.endswith('.npz'):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+
+    @classmethod
+    def _arguments(cls, function, *args, **kwargs):
+        arguments = inspect.signature(function).bind(None, *args, **kwargs)
+        arguments.apply_defaults()
+        return dict(arguments.arguments)
+
+    @staticmethod
+    def _setup(obj, arguments):
+        names = list(inspect.signature(obj._setup).parameters)
+        obj._setup(*[arguments[name] for name in names])
+
+    def jet(self, fluid, orifice, ambient, **kwargs):
+        '''
+        Jet (see Jet for the arguments), loaded from the cache if it has been solved before,
+        otherwise solved and stored
+        '''
+        arguments = self._arguments(Jet.__init__, fluid, orifice, ambient, **kwargs)
+        key = self.key('Jet', {k: v for k, v in arguments.items() if k not in self._ignored})
+        stored = self.load(key)
+        del arguments['self']
+        if stored is None:
+            jet = Jet(**arguments)
+            self.store(key, {'S': jet.S, 'solution': np.column_stack([jet.V_cl, jet.B, jet.rho_cl, jet.Y_cl,
+                                                                       jet.theta, jet.x, jet.y])})
+            return jet
+        arrays, _ = stored
+        jet = Jet.__new__(Jet)
+        self._setup(jet, arguments)
+        jet._set_solution(arrays['S'], arrays['solution'])
+        return jet
+
+    def flame(self, fluid, orifice, ambient, **kwargs):
+        '''
+        Flame (see Flame for the arguments), loaded from the cache if it has been solved before,
+        otherwise solved and stored; flames with a given chem are solved and not stored
+        '''
+        arguments = self._arguments(Flame.__init__, fluid, orifice, ambient, **kwargs)
+        if arguments['chem'] is not None:
+            del arguments['self']
+            return Flame(**arguments)
+        key = self.key('Flame', {k: v for k, v in arguments.items() if k not in self._ignored})
+        stored = self.load(key)
+        del arguments['self']
+        if stored is None:
+            flame = Flame(**arguments)
+            self.store(key, {'S': flame.S, 'solution': np.column_stack([flame.V_cl, flame.B, flame.theta,
+                                                                         flame.f_cl, flame.x, flame.y])},
+                       {name: getattr(flame, name) for name in self._flame_scalars})
+            return flame
+        arrays, scalars = stored
+        flame = Flame.__new__(Flame)
+        self._setup(flame, arguments)
+        flame.S = arrays['S']
+        for name, values in zip(['V_cl', 'B', 'theta', 'f_cl', 'x', 'y'], arrays['solution'].T):
+            setattr(flame, name, values)
+        for name, value in scalars.items():
+            setattr(flame, name, value)
+        flame._correlations_current = True
+        return flame
@@ -8,16 +8,20 @@ If not, see https://www.gnu.org/licenses/.
 
 from __future__ import print_function, absolute_import, division
 
+import inspect
 import os
+import time
 import warnings
 import copy
+from concurrent.futures import ThreadPoolExecutor
 
 import matplotlib.pyplot as plt
 import numpy as np
 from mpl_toolkits.axes_grid1 import ImageGrid
 from scipy import constants as const
-from scipy import integrate, interpolate, optimize
+from scipy import integrate, optimize
 
+from ._interp import StreamlineIndex
 from ._jet import DevelopingFlow
 from ._therm import Combustion
 from ._comps import Fluid
@@ -25,6 +29,8 @@ from ..utilities.custom_warnings import PhysicsWarning
 
 
 class Flame:
+    _streamline_index = None
+
     def __init__(self, fluid, orifice, ambient, mdot=None,
                  theta0=0., x0=0, y0=0,
                  nn_conserve_momentum=True, nn_T='solve_energy',
@@ -94,6 +100,28 @@ class Flame:
         n_pts_integral: int, optional
             maximum number of points in integration (from 0 to numB)
         '''
+        self._setup(fluid, orifice, ambient, mdot, theta0, x0, y0, nn_conserve_momentum, nn_T, chem,
+                    lamf, lamv, betaA, alpha_buoy, af, T_establish_min, verbose, wind_speed)
+        self.solve(Smax, dS, tol, numB, n_pts_integral)
+
+    @classmethod
+    def _unsolved(cls, *args, **kwargs):
+        '''
+        flame that is set up (see _setup) but not integrated, taking the same arguments as Flame;
+        the correlations (length) are available, but not the centerline
+        '''
+        arguments = inspect.signature(cls.__init__).bind(None, *args, **kwargs)
+        arguments.apply_defaults()
+        flame = cls.__new__(cls)
+        flame._setup(*[arguments.arguments[name] for name in inspect.signature(flame._setup).parameters])
+        return flame
+
+    def _setup(self, fluid, orifice, ambient, mdot, theta0, x0, y0, nn_conserve_momentum, nn_T, chem,
+               lamf, lamv, betaA, alpha_buoy, af, T_establish_min, verbose, wind_speed):
+        '''
+        sets up the developing flow and entrainment parameters, everything needed before the
+        chemistry, correlations and integration stages
+        '''
         self.x, self.y, self.S = [], [], []
         self.developing_flow = DevelopingFlow(fluid, orifice, ambient, mdot,
                                               theta0=theta0, x0=x0, y0=y0,
@@ -109,76 +137,168 @@ class Flame:
         self.Emom = betaA * np.sqrt(const.pi / 4.0 * expanded_plug_node.d ** 2 *
                                     expanded_plug_node.rho * expanded_plug_node.v ** 2 / ambient.rho)
         self.lamf, self.lamv, self.alpha_buoy = lamf, lamv, alpha_buoy
+        self.nn_conserve_momentum, self.nn_T = nn_conserve_momentum, nn_T
         self.chem = chem
         self.af = af
         self.verbose = verbose
         self.wind_speed = wind_speed
-        self.solve(Smax, dS, tol, numB, n_pts_integral)
+        # time (s) spent in each stage: chemistry -> correlations -> integration
+        self.timings = {}
+        self._correlations_current = False
+
+    def _init_chemistry(self):
+        '''
+        Chemistry stage: initializes the combustion chemistry at the ambient temperature and
+        pressure, or reinitializes it if it was created at other conditions (e.g., a chemistry
+        object shared between flames), otherwise the existing chemistry is used as is.
+        '''
+        #ESH note: self.developing_flow.fluid_exp is at a much lower temperature than ambient and gives funky heat flux numbers if used in the Combustion object, hence initilization at ambient T and P - could be improved. 
+        start = time.perf_counter()
+        if self.chem is None:
+            self.chem = Combustion(Fluid(T = self.ambient.T, P = self.ambient.P, species = self.fluid.species))
+        elif self.chem.Treac != self.ambient.T or abs(self.chem.P / self.ambient.P - 1) > 1e-10:
+            self.chem.reinitilize(Fluid(T = self.ambient.T, P = self.ambient.P, species = self.fluid.species))
+        else:
+            self.timings.setdefault('chemistry', 0.)
+            return
+        self._correlations_current = False
+        self.timings['chemistry'] = time.perf_counter() - start
+
+    def _radial_grid(self, numB, n_pts_integral, num_rows=1):
+        '''
+        buffers for the radial integrals in the governing equations, allocated once for
+        each number of points and of flames, and the fractional positions of the logarithmically
+        spaced grid points (0 at 1e-7 m, 1 at numB*B)
+        '''
+        key = (numB, n_pts_integral, num_rows)
+        if getattr(self, '_grid', None) is None or self._grid['key'] != key:
+            self._grid = {'key': key,
+                          'log_fraction': np.linspace(0, 1, n_pts_integral - 1),
+                          'r': np.zeros((num_rows, n_pts_integral)),
+                          'weights': np.zeros((num_rows, n_pts_integral)),
+                          'dfdS': np.zeros((num_rows, 2, n_pts_integral)),
+                          'dVdS': np.ones((num_rows, 3, n_pts_integral)),
+                          'integrands': np.zeros((num_rows, n_pts_integral, 8))}
+        return self._grid
 
     def _govEqns(self, S, ind_vars, numB=5, n_pts_integral=100):
         '''
-        Governing equations for a flame, written in terms of d/dS of (V_cl, B, theta, f_cl, x, and y).
+        Governing equations for a flame, written in terms of d/dS of (V_cl, B, theta, f_cl, x, and y)
+        (see _derivatives).'''
+        return self._derivatives(np.asarray(ind_vars)[np.newaxis], numB, n_pts_integral)[0]
+
+    def _derivatives(self, ind_vars, numB=5, n_pts_integral=100):
+        '''
+        Governing equations for one or more flames with the parameters (ambient, chemistry,
+        entrainment) of this flame, written in terms of d/dS of (V_cl, B, theta, f_cl, x, and y).
         
         A matrix soluition to the continuity, x-momentum, y-mometum and mixture fraction equations
         solves for d/dS of the dependent variables V_cl, B, theta, and f_cl.  Numerically integrated
-        to infinity = numB * B(S) using numpts discrete points.'''
-        
+        to infinity = numB * B(S) using numpts discrete points.
+
+        Parameters
+        ----------
+        ind_vars : ndarray
+            rows of [V_cl, B, theta, f_cl, x, y], one for each flame
+
+        Returns
+        -------
+        ndarray of d/dS of [V_cl, B, theta, f_cl, x, y], one row for each flame
+        '''
         # break independent variables out of ind_vars
-        [V_cl, B, theta, f_cl, x, y] = ind_vars
+        V_cl, B, theta, f_cl, x, y = ind_vars.T
+        B_, V_cl_, f_cl_ = B[:, np.newaxis], V_cl[:, np.newaxis], f_cl[:, np.newaxis]
         
-        # needed to integrate to infinity (numB*B):
-        r = np.zeros(n_pts_integral)
-        r[1:] = np.logspace(-7, np.log10(numB * B), n_pts_integral - 1)
+        # needed to integrate to infinity (numB*B), one row for each flame:
+        grid = self._radial_grid(numB, n_pts_integral, len(B))
+        r, weights = grid['r'], grid['weights']  # trapz(g, r) = sum(g * weights)
+        r[:, 1:] = 1e-7 * (numB * B_ / 1e-7) ** grid['log_fraction']
+        dr = r[:, 1:] - r[:, :-1]
+        weights[:, 0], weights[:, -1] = 0, 0
+        weights[:, 1:] = dr / 2
+        weights[:, :-1] += dr / 2
 
         # mixture fraction and velocity have Gaussian shapes
-        f = f_cl * np.exp(-(r / (self.lamf * B)) ** 2)
-        V = V_cl * np.exp(-(r / (self.lamv * B)) ** 2)
+        r_B2 = (r / B_) ** 2
+        f_shape = np.exp(-r_B2 / self.lamf ** 2)
+        V_shape = np.exp(-r_B2 / self.lamv ** 2)
+        f = f_cl_ * f_shape
+        V = V_cl_ * V_shape
 
         # density isn't a nice Gaussian, due to combustion 
-        try:
-            rho = self.chem.rho_prod(f)
-            drhodf = self.chem.drhodf(f)
-        except:
+        if not (f_cl.min() >= 0 and f_cl.max() <= 1):
             warnings.warn('Clipping f - something has gone wrong.', category=PhysicsWarning)
             f = np.clip(f, 0, 1)
-            rho = self.chem.rho_prod(f)
-            drhodf = self.chem.drhodf(f)
+        rho, drhodf = self.chem.rho_and_drhodf(f)
 
-        rho_int = integrate.trapz(self.ambient.rho - rho, r)
+        rho_deficit = self.ambient.rho - rho
+        rho_int = np.sum(rho_deficit * weights, axis=1)
+        cos_theta, sin_theta = np.cos(theta), np.sin(theta)
 
-        Ebuoy = (2 * np.pi * self.alpha_buoy * np.sin(theta) * 
+        Ebuoy = (2 * np.pi * self.alpha_buoy * sin_theta * 
                     const.g * (rho_int) / (B * V_cl * self.developing_flow.fluid_exp.rho))  # m**2/s
         E = self.Emom + Ebuoy
 
         # right-hand side of governing equations:
-        RHS = np.array([self.ambient.rho * E / (2 * const.pi),  # continuity
-                        self.wind_speed * self.ambient.rho * E / (2 * const.pi),  # x-momentum
-                        integrate.trapz((self.ambient.rho - rho) * const.g * r, r),  # y-momentum
-                        0])  # mixture fraction
-
-        zero = np.zeros_like(r)
-        dfdS = np.array([zero, 2 * r ** 2 / self.lamf ** 2 / B ** 3 * f, zero, f / f_cl])
-        dVdS = np.array([V / V_cl, 2 * r ** 2 / self.lamv ** 2 / B ** 3 * V, zero, zero])
-        drhodS = drhodf * dfdS
-        dthetadS = np.array([zero, zero, np.ones_like(r), zero])
+        RHS = np.zeros((len(B), 4))
+        RHS[:, 0] = self.ambient.rho * E / (2 * const.pi)  # continuity
+        RHS[:, 1] = self.wind_speed * self.ambient.rho * E / (2 * const.pi)  # x-momentum
+        # y-momentum from the integrals below, mixture fraction: 0
+
+        # non-zero derivatives of the profiles with respect to (V_cl, B, theta, f_cl):
+        # df/dB and df/df_cl, dV/dV_cl and dV/dB (and 1 for plain integrals)
+        dfdS, dVdS = grid['dfdS'], grid['dVdS']
+        dshape_dB = 2 * r_B2 / B_  # d/dB of the exponents, times lam**2
+        np.multiply(dshape_dB / self.lamf ** 2, f, out=dfdS[:, 0])
+        dfdS[:, 1] = f_shape
+        dVdS[:, 0] = V_shape
+        np.multiply(dshape_dB / self.lamv ** 2, V, out=dVdS[:, 1])
+
+        # weights of df/dS and dV/dS in the integrated left-hand side of
+        # the continuity, momentum (times cos, sin theta) and mixture fraction equations,
+        # and the integrands of the buoyancy and turning terms
+        integrands = grid['integrands']
+        rhoV = rho * V
+        integrands[..., 0] = drhodf * V
+        integrands[..., 1] = drhodf * V ** 2
+        integrands[..., 2] = drhodf * V * f + rhoV
+        integrands[..., 3] = rho
+        integrands[..., 4] = 2 * rhoV
+        integrands[..., 5] = rho * f
+        integrands[..., 6] = rho_deficit
+        integrands[..., 7] = rhoV * V
+        integrands *= (r * weights)[..., np.newaxis]  # int(g*r dr) = sum(g * r * weights)
+        f_terms = np.matmul(dfdS, integrands[..., :3])  # (d/dB, d/df_cl) x equation
+        V_terms = np.matmul(dVdS, integrands[..., 3:])  # (d/dV_cl, d/dB, 1) x equation
+        RHS[:, 2] = const.g * V_terms[:, 2, 3]  # y-momentum
+        turning = V_terms[:, 2, 4]
 
         # left-hand side of governing equations:
-        LHS = np.array([drhodS * V * r + rho * dVdS * r,  # continuity
-                        drhodS * V ** 2 * np.cos(theta) * r + 2 * rho * V * dVdS * np.cos(
-                            theta) * r + rho * V ** 2 * -np.sin(theta) * dthetadS * r,  # x-momentum
-                        drhodS * V ** 2 * np.sin(theta) * r + 2 * rho * V * dVdS * np.sin(
-                            theta) * r + rho * V ** 2 * np.cos(theta) * dthetadS * r,  # y-momentum
-                        drhodS * V * f * r + rho * dVdS * f * r + rho * V * dfdS * r])  # mixture fraction
-        LHS = integrate.trapz(LHS, r)
+        # (the momentum terms are in row 1 until split into x and y below)
+        LHS = np.zeros((len(B), 4, 4))
+        rows = [0, 1, 3]
+        LHS[:, rows, 0] = V_terms[:, 0, :3]
+        LHS[:, rows, 1] = f_terms[:, 0] + V_terms[:, 1, :3]
+        LHS[:, rows, 3] = f_terms[:, 1]
+        momentum = LHS[:, 1].copy()
+        LHS[:, 1] = momentum * cos_theta[:, np.newaxis]  # x-momentum
+        LHS[:, 2] = momentum * sin_theta[:, np.newaxis]  # y-momentum
+        LHS[:, 1, 2] = -turning * sin_theta
+        LHS[:, 2, 2] = turning * cos_theta
         
-        dz = np.append(np.linalg.solve(LHS, RHS), np.array([np.cos(theta), np.sin(theta)]), axis=0)
-
+        dz = np.empty((len(B), 6))
+        dz[:, :4] = np.linalg.solve(LHS, RHS[..., np.newaxis])[..., 0]
+        dz[:, 4] = cos_theta
+        dz[:, 5] = sin_theta
         return dz
 
     def solve(self, Smax=np.inf, dS=None, tol=1e-6,
               numB=5, n_pts_integral=100):
         '''
         Solves for a flame. Returns a dictionary of flame results.  Also updates the Flame class with those results.
+
+        Integration stage: the chemistry and correlations (see length) are only calculated
+        if they have not been already.
         
         Parameters
         ----------
@@ -190,16 +310,12 @@ class Flame:
         res : dict
             dictionary of flame results
         '''
-        #ESH note: self.developing_flow.fluid_exp is at a much lower temperature than ambient and gives funky heat flux numbers if used in the Combustion object, hence initilization at ambient T and P - could be improved. 
-        try:
-            if self.chem.Treac != self.ambient.T or abs(self.chem.P / self.ambient.P - 1) > 1e-10:
-                self.chem.reinitilize(Fluid(T = self.ambient.T, P = self.ambient.P, species = self.fluid.species))
-        except:
-            self.chem = Combustion(Fluid(T = self.ambient.T, P = self.ambient.P, species = self.fluid.species))
+        self._init_chemistry()
+        Smax = min(Smax, self.length())
 
         if self.verbose:
             print('solving for the flame...', end='')
-        Smax = min(Smax, self.length())
+        start = time.perf_counter()
 
         Y_cl0 = self.initial_node.Y_cl
         f_cl0 = optimize.newton(lambda f: Y_cl0 - self.chem._Yreac(f)[self.chem.reac],
@@ -224,10 +340,20 @@ class Flame:
         result['S'] = sol.t
         for k, v in result.items():
             self.__dict__[k] = v
+        self.timings['integration'] = time.perf_counter() - start
         if self.verbose:
             print('done.')
         return result
 
+    @property
+    def streamline_index(self):
+        '''
+        interpolation index of the centerline arrays, rebuilt only when the solution changes
+        '''
+        if self._streamline_index is None or not self._streamline_index.is_current(self):
+            self._streamline_index = StreamlineIndex(self, ['S', 'x', 'y', 'theta', 'B', 'V_cl', 'f_cl'])
+        return self._streamline_index
+
     def length(self):
         '''
         These correlations come from Schefer et al. IJHE 31 (2006): 1332-1340
@@ -240,97 +366,275 @@ class Flame:
         .Wf (flame width), 
         .tauf (flame residence time)
         .Xrad (radiant fraction)
+
+        Correlations stage: calculated once (after the chemistry), then returned from the flame
         '''
-        try:
-            if self.chem.Treac != self.ambient.T or abs(self.chem.P / self.ambient.P - 1) > 1e-10:
-                self.chem.reinitilize(Fluid(T = self.ambient.T, P = self.ambient.P, species = self.fluid.species))
-        except:
-            self.chem = Combustion(Fluid(T = self.ambient.T, P = self.ambient.P, species = self.fluid.species))
-        fs, Tad = self.chem.fstoich, self.chem.T_prod(self.chem.fstoich)
-        Tamb = self.ambient.T
-        rhoair, rhof = self.ambient.rho, self.chem.rho_prod(self.chem.fstoich)
-        orifice1, gas1 = self.developing_flow.orifice_exp, self.developing_flow.fluid_exp
+        # a flame restored from stored results (see ResultCache) has its correlations,
+        # but no chemistry until it is needed
+        if self.chem is not None or not self._correlations_current:
+            self._init_chemistry()
+        if self._correlations_current:
+            return self.Lvis
+        start = time.perf_counter()
+        (self.Frf, self.dstar, self.Lvis, self.Wf, self.tauf, self.Xrad,
+         self.Srad) = self._correlations(self.chem, self.ambient, self.developing_flow.fluid_exp,
+                                         self.developing_flow.orifice_exp, self.af)
+        self._correlations_current = True
+        self.timings['correlations'] = time.perf_counter() - start
+        return self.Lvis
+
+    @staticmethod
+    def _correlations(chem, ambient, gas1, orifice1, af):
+        '''
+        correlations (see length) for an expanded flow (gas1) through an effective orifice (orifice1)
+
+        Returns
+        -------
+        Frf, dstar, Lvis, Wf, tauf, Xrad, Srad
+        '''
+        fs, Tad = chem.fstoich, chem.T_prod(chem.fstoich)
+        Tamb = ambient.T
+        rhoair, rhof = ambient.rho, chem.rho_prod(chem.fstoich)
         Deff, rhoeff = orifice1.d, gas1.rho
 
         # Compute the flame Froude number
         Frf = (gas1.v * fs ** 1.5) / (((rhoeff / rhoair) ** 0.25) * np.sqrt(((Tad - Tamb) / Tamb) * const.g * Deff))
-        self.Frf = Frf
 
         # Compute visible flame length
         Lstar = ((13.5 * Frf ** 0.4) / (1 + 0.07 * Frf ** 2) ** 0.2) * (Frf < 5) + 23 * (Frf >= 5)
 
         dstar = Deff * (rhoeff / rhoair) ** 0.5
-        self.dstar = dstar
 
-        self.Lvis = Lstar * dstar / fs  # visible flame length [m]
-        self.Wf = 0.17 * self.Lvis
+        Lvis = Lstar * dstar / fs  # visible flame length [m]
+        Wf = 0.17 * Lvis
         # flame residence time [ms]
 
-        self.tauf = (const.pi / 12) * (rhof * (self.Wf ** 2) * self.Lvis * fs) / (orifice1.mdot(gas1)) * 1000
-        # self.Xrad = (0.08916*np.log10(self.tauf*self.af*Tad**4) - 1.2172) # comes from Molina et al.
-        self.Xrad = 9.45e-9 * (self.tauf * self.af * Tad ** 4) ** 0.47  # see Panda, Hecht, IJHE 2016
-        mdot = self.developing_flow.orifice_exp.mdot(self.developing_flow.fluid_exp)  # mass flow rate [kg/s]
-        self.Srad = self.Xrad * mdot * self.chem.DHc
-
-        return self.Lvis
+        mdot = orifice1.mdot(gas1)  # mass flow rate [kg/s]
+        tauf = (const.pi / 12) * (rhof * (Wf ** 2) * Lvis * fs) / mdot * 1000
+        # Xrad = (0.08916*np.log10(tauf*af*Tad**4) - 1.2172) # comes from Molina et al.
+        Xrad = 9.45e-9 * (tauf * af * Tad ** 4) ** 0.47  # see Panda, Hecht, IJHE 2016
+        Srad = Xrad * mdot * chem.DHc
+        return Frf, dstar, Lvis, Wf, tauf, Xrad, Srad
 
-    def Qrad_multi(self, x, y, z, RH, WaistLoc=0.75, N=50):
+    def _radiative_sources(self, WaistLoc=0.75, N=50):
         '''
-        MultiSource radiation model
-        follows Hankinson & Lowesmith, CNF 159, 2012: 1165-1177       
-        '''
-        obsOrg = np.array([x, y, z]).T
-
-        try:
-            Lvis = self.Lvis  # length of visible flame [m]
-        except:
-            Lvis = self.length()
-        T = self.ambient.T
+        weighted point sources along the flame centerline for the multisource radiation model
 
+        Returns
+        -------
+        weights : ndarray
+            fraction of the radiated power from each source (sums to 1)
+        sources : ndarray
+            (N, 3) array of source locations (m)
+        '''
         n = int(WaistLoc * N)
         w = np.arange(1, N + 1, dtype=float)
         w[n:] = (n - ((n - 1) / (N - (n + 1))) * (w[n:] - (n + 1)))
         w /= np.sum(w)
 
-        try:
-            S = np.linspace(self.S[0], min([self.S[-1], self.Lvis]), N)
-            X = interpolate.interp1d(self.S, self.x)(S)
-            Y = interpolate.interp1d(self.S, self.y)(S)
-        except:
-            warnings.warn('Running flame model with default parameters.', category=PhysicsWarning)
-            self.solve()
-            S = np.linspace(self.S[0], min([self.S[-1], self.Lvis]), N)
-            X = interpolate.interp1d(self.S, self.x)(S)
-            Y = interpolate.interp1d(self.S, self.y)(S)
-
-        sourceOrg = np.array([X, Y, np.zeros_like(X)]).T
-
-        Qrad = np.zeros(obsOrg.shape[:-1])
-
-        for j in range(len(w)):
-            v = sourceOrg[j] - obsOrg
-            if obsOrg.ndim > 1:
-                obsNorm = v / (np.linalg.norm(v, axis=1) + 1e-99)[:, np.newaxis]
-            else:
-                obsNorm = v / (np.linalg.norm(v) + 1e-99)
-
-            if obsOrg.ndim == 4:
-                len_v = np.linalg.norm(v, axis=3)
-                phi = np.arcsin(np.linalg.norm(np.cross(obsNorm, v), axis=3) / len_v)
-            elif obsOrg.ndim == 3:
-                len_v = np.linalg.norm(v, axis=2)
-                phi = np.arcsin(np.linalg.norm(np.cross(obsNorm, v), axis=2) / len_v)
-            elif obsOrg.ndim == 2:
-                len_v = np.linalg.norm(v, axis=1)
-                phi = np.arcsin(np.linalg.norm(np.cross(obsNorm, v), axis=1) / len_v)
-            elif obsOrg.ndim == 1:
-                len_v = np.linalg.norm(v)
-                phi = np.arcsin(np.linalg.norm(np.cross(obsNorm, v)) / len_v)
-            Qrad += w[j] / (4 * const.pi * len_v ** 2) * np.cos(phi) * self.Srad * calc_transmissivity(len_v, T, RH)
-
-        return Qrad.T
+        S = np.linspace(self.S[0], min([self.S[-1], self.length()]), N)
+        X, Y = self.streamline_index.interp_many(S, ['x', 'y'])
+        return w, np.array([X, Y, np.zeros_like(X)]).T
+
+    @staticmethod
+    def _merged_sources(weights, sources):
+        '''
+        hierarchy of merged sources: level k replaces each run of 2**k consecutive sources
+        with one source at their weighted centroid carrying their combined weight
+
+        Returns
+        -------
+        list of (weights, sources, radius) for each level, where radius is the largest distance
+        of an original source from the merged source representing it
+        '''
+        levels = []
+        k = 0
+        while True:
+            size = 2**k
+            groups = [slice(i, i + size) for i in range(0, len(weights), size)]
+            w = np.array([np.sum(weights[g]) for g in groups])
+            c = np.array([weights[g] @ sources[g] / np.sum(weights[g]) for g in groups])
+            radius = max(np.max(np.linalg.norm(sources[g] - ci, axis=1)) for g, ci in zip(groups, c))
+            levels.append((w, c, radius))
+            if len(groups) == 1:
+                return levels
+            k += 1
+
+    def Qrad_multi(self, x, y, z, RH, WaistLoc=0.75, N=50,
+                   chunk_size=10000, dtype=np.float64, n_workers=1, rtol=None):
+        '''
+        MultiSource radiation model
+        follows Hankinson & Lowesmith, CNF 159, 2012: 1165-1177
+
+        The flux from all sources to a chunk of observers is evaluated at once;
+        each observer is taken to face the source (cos(phi) = 1).
+
+        Parameters
+        ----------
+        x, y, z : float or ndarray
+            observer coordinates (m), broadcast against each other
+        RH : float
+            relative humidity
+        WaistLoc : float, optional
+            fraction of the flame length at which the source weights peak
+        N : int, optional
+            number of point sources
+        chunk_size : int, optional
+            number of observers evaluated at a time, limiting temporary memory
+        dtype : numpy dtype, optional
+            precision of the calculation (e.g., np.float32), default is np.float64
+        n_workers : int, optional
+            number of threads over which to evaluate the chunks
+        rtol : float or None, optional
+            if given, observers far from the flame use merged sources (see _merged_sources),
+            choosing for each observer the fewest sources for which the bound on the relative
+            error from merging, 3*(a/(D - a))**2 for merged-source radius a and distance D
+            to the nearest source, is below rtol; default is None: all sources for all observers
+
+        Returns
+        -------
+        heat flux (W/m^2) at each observer, same shape as the broadcast coordinates
+        '''
+        transmissivity = AtmosphericTransmissivity(self.ambient.T, RH)
+
+        def kernel(len_v2, source_power):
+            return (transmissivity.from_squared_length(len_v2) / len_v2) @ source_power
+
+        return self._multisource(x, y, z, kernel, (), WaistLoc, N, chunk_size, dtype, n_workers, rtol)
+
+    def Qrad_ensemble(self, x, y, z, RH, CO2=335, WaistLoc=0.75, N=50,
+                      chunk_size=10000, dtype=np.float64, n_workers=1, rtol=None):
+        '''
+        MultiSource radiation model (see Qrad_multi) for a set of ambient conditions, which
+        only change the atmospheric transmissivity.  The transmissivity is a quadratic in
+        log10(path length) (see AtmosphericTransmissivity), so the flux for any conditions
+        follows exactly from three sums over the sources, which are evaluated once.
+
+        Parameters
+        ----------
+        x, y, z : float or ndarray
+            observer coordinates (m), broadcast against each other
+        RH : float or 1-D array
+            relative humidity for each set of conditions
+        CO2 : float or 1-D array, optional
+            atmospheric CO2 concentration (ppm) for each set of conditions, default is 335 ppm
+        WaistLoc, N, chunk_size, dtype, n_workers, rtol : optional
+            as for Qrad_multi
+
+        Returns
+        -------
+        heat flux (W/m^2), with a first axis for the conditions (RH and CO2 broadcast
+        against each other) followed by the shape of the broadcast coordinates
+        '''
+        RH, CO2 = np.broadcast_arrays(np.atleast_1d(np.asarray(RH, dtype=float)),
+                                      np.atleast_1d(np.asarray(CO2, dtype=float)))
+        if RH.ndim != 1:
+            raise ValueError('RH and CO2 must be floats or 1-D arrays')
+        transmissivity = AtmosphericTransmissivity(self.ambient.T, RH, CO2)
+        coefficients = np.column_stack([transmissivity.c0, transmissivity.c1,
+                                        np.full(len(RH), transmissivity.c2)]).astype(dtype)
+
+        def kernel(len_v2, source_power):
+            log_length = 0.5 * np.log10(len_v2)
+            weighted = source_power / len_v2
+            moments = np.stack([weighted.sum(axis=1), (weighted * log_length).sum(axis=1),
+                                (weighted * log_length ** 2).sum(axis=1)])
+            return coefficients @ moments
+
+        return self._multisource(x, y, z, kernel, (len(RH),), WaistLoc, N, chunk_size, dtype, n_workers, rtol)
+
+    def _multisource(self, x, y, z, kernel, out_shape, WaistLoc, N, chunk_size, dtype, n_workers, rtol):
+        '''
+        evaluates kernel(squared distances, source powers) for chunks of observers and the
+        (possibly merged, see Qrad_multi) sources, returning an array of shape out_shape
+        followed by the shape of the broadcast coordinates
+        '''
+        x, y, z = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float),
+                                      np.asarray(z, dtype=float))
+        shape = x.shape
+        observers = np.column_stack([x.ravel(), y.ravel(), z.ravel()]).astype(dtype)
+
+        w, sources = self._radiative_sources(WaistLoc, N)
+        level = np.zeros(len(observers), dtype=int)
+        if rtol is None:
+            levels = [(w, sources, 0.)]
+        else:
+            levels = self._merged_sources(w, sources)
+            # lower bound on the distance from each observer to any source
+            center = w @ sources
+            D = (np.linalg.norm(observers - center.astype(dtype), axis=1)
+                 - np.max(np.linalg.norm(sources - center, axis=1)))
+            for k, (_, _, radius) in enumerate(levels[1:], start=1):
+                accurate = (D > radius) & (3*(radius/np.maximum(D - radius, 1e-99))**2 <= rtol)
+                level[accurate] = k
+        levels = [((wk * self.Srad / (4 * const.pi)).astype(dtype), sk.astype(dtype)) for wk, sk, _ in levels]
+
+        def chunk_flux(indices, k):
+            source_power, source_locations = levels[k]
+            v = source_locations[np.newaxis, :, :] - observers[indices, np.newaxis, :]
+            len_v2 = np.einsum('ijk,ijk->ij', v, v)
+            Qrad[..., indices] = kernel(len_v2, source_power)
+
+        Qrad = np.zeros(out_shape + (len(observers),), dtype=dtype)
+        tasks = []
+        for k in range(len(levels)):
+            indices = np.flatnonzero(level == k)
+            tasks += [(indices[start:start + chunk_size], k) for start in range(0, len(indices), chunk_size)]
+        if n_workers > 1 and len(tasks) > 1:
+            with ThreadPoolExecutor(max_workers=n_workers) as executor:
+                list(executor.map(lambda task: chunk_flux(*task), tasks))
+        else:
+            for task in tasks:
+                chunk_flux(*task)
+        return Qrad.reshape(out_shape + shape)
+
+    def heat_flux_field(self, grid, RH, WaistLoc=0.75, N=50,
+                        chunk_size=10000, dtype=np.float64, n_workers=1, rtol=None):
+        '''
+        Heat flux on a structured grid, evaluated in chunks (see Qrad_multi) without
+        forming the full arrays of grid coordinates
+
+        Parameters
+        ----------
+        grid : tuple of 3 (float or 1-D array)
+            x, y and z coordinates (m) of the grid lines; a float gives a slice of the field
+        RH : float
+            relative humidity
+        WaistLoc, N, dtype, rtol : optional
+            as for Qrad_multi
+        chunk_size : int, optional
+            number of grid points evaluated at a time
+        n_workers : int, optional
+            number of threads over which to evaluate the chunks
+
+        Returns
+        -------
+        HeatFluxField object, holding the heat flux (W/m^2) in an array with one
+        axis for each of x, y, and z (length 1 for a slice)
+        '''
+        axes = [np.atleast_1d(np.asarray(axis, dtype=float)) for axis in grid]
+        if len(axes) != 3 or any(axis.ndim != 1 for axis in axes):
+            raise ValueError('grid must be x, y, and z coordinates, each a float or 1-D array')
+        shape = tuple(len(axis) for axis in axes)
+        flux = np.zeros(shape, dtype=dtype)
+        flat_flux = flux.reshape(-1)
+
+        def chunk_flux(start):
+            index = np.unravel_index(np.arange(start, min(start + chunk_size, flux.size)), shape)
+            flat_flux[start:start + chunk_size] = self.Qrad_multi(*[axis[i] for axis, i in zip(axes, index)], RH,
+                                                                 WaistLoc, N, chunk_size, dtype, rtol=rtol)
+
+        starts = range(0, flux.size, chunk_size)
+        if n_workers > 1 and len(starts) > 1:
+            with ThreadPoolExecutor(max_workers=n_workers) as executor:
+                list(executor.map(chunk_flux, starts))
+        else:
+            for start in starts:
+                chunk_flux(start)
+        return HeatFluxField(*axes, flux)
 
     def _contourdata(self):
+        self._init_chemistry()
         iS = np.arange(len(self.S))
         r = np.append(
             np.append(-np.logspace(np.log10(10 * max(self.B)), -2), np.linspace(-10 ** -2.1, 10 ** -2.1, num=10)),
@@ -458,9 +762,7 @@ class Flame:
         if contours is None:
             contours = [1.577, 4.732, 25.237]
         Lvis = self.length()
-        flameCen = np.array([np.interp(Lvis*WaistLoc, self.S, self.x),
-                             np.interp(Lvis*WaistLoc, self.S, self.y),
-                             0])
+        flameCen = np.array(self.streamline_index.interp_many(Lvis*WaistLoc, ['x', 'y']) + [0])
         if xlims is None:
             dx = 4.5 * Lvis / nx
             x0 = slice(self.x[0] - 1.5 * Lvis, (self.x[0] + 3 * Lvis), dx)
@@ -482,7 +784,7 @@ class Flame:
             dz = (zlims[1] - zlims[0]) / nz
             z0 = slice(zlims[0], zlims[1], dz)
 
-        x, y, z = np.mgrid[x0, y0, z0]
+        x_axis, y_axis, z_axis = np.mgrid[x0], np.mgrid[y0], np.mgrid[z0]
         x_z, y_z = np.mgrid[x0, y0]
         x_y, z_y = np.mgrid[x0, z0]
         y_x, z_x = np.mgrid[y0, z0]
@@ -507,9 +809,9 @@ class Flame:
         ax_cb = grid[3].cax
         ax_cb.set_visible(True)
 
-        fxy = self.Qrad_multi(x_z, y_z, flameCen[2] * np.ones_like(x_z), RH)
-        fxz = self.Qrad_multi(x_y, flameCen[1] * np.ones_like(x_y), z_y, RH)
-        fzy = self.Qrad_multi(flameCen[0] * np.ones_like(z_x), y_x, z_x, RH)
+        fxy = self.heat_flux_field((x_axis, y_axis, flameCen[2]), RH).flux[:, :, 0]
+        fxz = self.heat_flux_field((x_axis, flameCen[1], z_axis), RH).flux[:, 0, :]
+        fzy = self.heat_flux_field((flameCen[0], y_axis, z_axis), RH).flux[0, :, :]
         fxy = fxy / 1000  # kW/m2 from W/m2
         fxz = fxz / 1000  # kW/m2 from W/m2
         fzy = fzy / 1000  # kW/m2 from W/m2
@@ -610,31 +912,464 @@ class Flame:
         returns : float 
             flame length from above
         '''
-        return np.interp(self.Lvis, self.S, self.x)
+        return self.streamline_index.interp(self.Lvis, fp='x')
 
-    def x_distance_to_heat_flux_val(self, heat_flux_level, RH = 0.89, WaistLoc=0.75, xmax = 500):
+    def x_distance_to_heat_flux_val(self, heat_flux_level, RH = 0.89, WaistLoc=0.75, xmax = 500,
+                                    xtol=1e-6, n_samples=64):
         '''
+        Distance along the horizontal line (z = 0) through the flame at WaistLoc to one or more
+        heat flux levels, beyond the peak heat flux on that line.  The heat flux is sampled along
+        the line to bracket the distance to each level, which is then found by (vectorized,
+        Illinois) regula falsi on the log of the heat flux.
+
         Parameters-
         ----------
-        heat flux level: float
-          heat flux level for which one wants to know the distance to (W/m^2)
+        heat flux level: float or list of floats
+          heat flux level(s) for which one wants to know the distance to (W/m^2)
         RH : float
             relative humidity
         WaistLoc: float  
           distance along flame at which to look for the x-distance
         xmax: float (optional)
           maximum distance to look for heat flux level
+        xtol: float (optional)
+          tolerance (m) on the distances
+        n_samples: int (optional)
+          number of points at which the heat flux is sampled to bracket the distances
         
         Returns
         -------
-        distance: float
-          x distance to heat_flux_level (m)
+        distance: float or ndarray
+          x distance to heat_flux_level (m), for each level if a list was given;
+          xmax for levels below the heat flux at xmax, and the location of the peak
+          for levels above the peak heat flux
         '''
-        ycen = np.interp(self.Lvis*WaistLoc, self.S, self.y)
-        xvals = np.linspace(xmax, 0, 10000)
-        Q = self.Qrad_multi(xvals, ycen*np.ones_like(xvals), np.zeros_like(xvals), RH = RH)
+        ycen = self.streamline_index.interp(self.length()*WaistLoc, fp='y')
+        levels = np.atleast_1d(np.asarray(heat_flux_level, dtype=float))
+
+        def flux(x):
+            return self.Qrad_multi(x, ycen, 0., RH=RH)
+
+        # uniform sampling across the flame, geometric beyond it
+        x_near = min(xmax, max(np.max(np.abs(self.x)), self.Lvis))
+        xvals = np.unique(np.append(np.linspace(0, x_near, n_samples // 2),
+                                    np.geomspace(max(x_near, xmax*1e-6), xmax, n_samples - n_samples // 2)))
+        Q = flux(xvals)
         imax = np.argmax(Q)
-        return np.interp(heat_flux_level, Q[:imax], xvals[:imax])
+        if 0 < imax < len(xvals) - 1:
+            peak = optimize.minimize_scalar(lambda x: -flux(x), bounds=(xvals[imax - 1], xvals[imax + 1]),
+                                            method='bounded', options={'xatol': xtol})
+            if -peak.fun > Q[imax]:
+                xvals[imax], Q[imax] = peak.x, -peak.fun
+        xvals, Q = xvals[imax:], Q[imax:]
+
+        distance = np.where(levels >= Q[0], xvals[0], xmax)
+        search = (levels < Q[0]) & (levels > Q[-1])
+        if np.any(search):
+            target = levels[search]
+            i = np.argmax(Q[np.newaxis, :] < target[:, np.newaxis], axis=1)  # first sample below each level
+            a, b = xvals[i - 1], xvals[i]
+            fa, fb = np.log(Q[i - 1] / target), np.log(Q[i] / target)  # fa >= 0 > fb
+            x = b.copy()
+            active = np.ones(len(target), dtype=bool)
+            for _ in range(100):
+                c = b[active] - fb[active] * (b[active] - a[active]) / (fb[active] - fa[active])
+                fc = np.log(flux(c) / target[active])
+                x[active] = c
+                idx = np.flatnonzero(active)
+                swap = fc * fb[idx] < 0
+                a[idx[swap]], fa[idx[swap]] = b[idx[swap]], fb[idx[swap]]
+                fa[idx[~swap]] /= 2
+                b[idx], fb[idx] = c, fc
+                active[idx] = (np.abs(b[idx] - a[idx]) > xtol) & (fc != 0)
+                if not np.any(active):
+                    break
+            distance[search] = x
+        if np.ndim(heat_flux_level) == 0:
+            return distance[0]
+        return distance
+
+
+class FlameBatch:
+    def __init__(self, fluid, orifice, ambient, theta0, mdot=None, x0=0., y0=0.,
+                 nn_conserve_momentum=True, nn_T='solve_energy',
+                 chem=None,
+                 lamf=1.24, lamv=1.24, betaA=3.42e-2, alpha_buoy=5.75e-4, af=0.23,
+                 T_establish_min=-1, verbose=False,
+                 Smax=np.inf, tol=1e-6, numB=5, n_pts_integral=100,
+                 wind_speed=0):
+        '''
+        Solves flames from one release at several release angles, as a single vectorized
+        system of ordinary differential equations.
+
+        The release angle only changes the direction of the developing flow and the buoyancy
+        terms of the governing equations, so the chemistry, developing flow and correlations
+        (visible length, radiant power) are calculated once and shared by all of the flames,
+        which are integrated over the same streamline distance (to the visible length).
+
+        Parameters
+        ----------
+        fluid, orifice, ambient, mdot, x0, y0 :
+            as for Flame
+        theta0 : list of floats
+            release angles (rad, 0 is horizontal)
+        Smax, tol, numB, n_pts_integral : optional
+            integration parameters, as for Flame
+        The remaining parameters are as for Flame.
+
+        Properties
+        ----------
+        flames : list of Flame objects
+            the solved flames, one for each angle, each identical in use to a Flame solved on its own
+        '''
+        self.theta0 = np.atleast_1d(np.asarray(theta0, dtype=float))
+        if self.theta0.ndim != 1:
+            raise ValueError('theta0 must be a float or 1-D array')
+        self.verbose = verbose
+        flame = Flame._unsolved(fluid, orifice, ambient, mdot, 0., x0, y0, nn_conserve_momentum, nn_T, chem,
+                                lamf, lamv, betaA, alpha_buoy, af, T_establish_min, verbose, wind_speed=wind_speed)
+        flame.length()
+        self.flames = [self._rotated(flame, theta) for theta in self.theta0]
+        self.timings = dict(flame.timings)
+        self.solve(Smax, tol, numB, n_pts_integral)
+
+    @staticmethod
+    def _rotated(flame, theta0):
+        '''
+        copy of an unsolved flame with its developing flow released at another angle
+        '''
+        rotated = copy.copy(flame)
+        developing_flow = rotated.developing_flow = copy.copy(flame.developing_flow)
+        x0, y0 = developing_flow.orifice_node.x, developing_flow.orifice_node.y
+        for name in ['orifice_node', 'expanded_plug_node', 'initial_node']:
+            node = copy.copy(getattr(developing_flow, name))
+            node.theta, node.x, node.y = theta0, x0 + node.S * np.cos(theta0), y0 + node.S * np.sin(theta0)
+            setattr(developing_flow, name, node)
+        rotated.initial_node = developing_flow.initial_node
+        rotated.timings = {'chemistry': 0., 'correlations': 0.}
+        rotated._grid = None
+        return rotated
+
+    def solve(self, Smax=np.inf, tol=1e-6, numB=5, n_pts_integral=100):
+        '''
+        solves (integrates) the flames together from their initial nodes out to the visible length
+        '''
+        if self.verbose:
+            print('solving for {} flames...'.format(len(self.flames)), end='')
+        start = time.perf_counter()
+        flame = self.flames[0]
+        Smax = min(Smax, flame.length())
+        Y_cl0 = flame.initial_node.Y_cl
+        f_cl0 = optimize.newton(lambda f: Y_cl0 - flame.chem._Yreac(f)[flame.chem.reac], Y_cl0)
+        initial = np.array([[f.initial_node.v_cl, f.initial_node.B, f.initial_node.theta, f_cl0,
+                             f.initial_node.x, f.initial_node.y] for f in self.flames])
+        sol = integrate.solve_ivp(self._govEqns, [flame.initial_node.S, Smax], initial.ravel(),
+                                  args=(numB, n_pts_integral), atol=tol, rtol=tol, method='LSODA')
+        Y = sol.y.reshape(len(self.flames), 6, len(sol.t))
+        self.timings['integration'] = time.perf_counter() - start
+        for f, values in zip(self.flames, Y):
+            f.S = sol.t
+            f.V_cl, f.B, f.theta, f.f_cl, f.x, f.y = values
+            f.timings['integration'] = self.timings['integration'] / len(self.flames)
+        if self.verbose:
+            print('done.')
+        return self
+
+    def _govEqns(self, S, ind_vars, numB=5, n_pts_integral=100):
+        '''
+        Governing equations for all of the flames (see Flame._derivatives), which share
+        all of their parameters but the release angle
+        '''
+        return self.flames[0]._derivatives(ind_vars.reshape(len(self.flames), 6), numB, n_pts_integral).ravel()
+
+    def heat_flux(self, x, y, z, RH, **kwargs):
+        '''
+        MultiSource radiation model (see Flame.Qrad_multi) for each of the flames
+
+        Parameters
+        ----------
+        x, y, z : float or ndarray
+            observer coordinates (m), broadcast against each other
+        RH : float
+            relative humidity
+        kwargs : optional
+            other keyword arguments for Flame.Qrad_multi (e.g., WaistLoc, N, rtol)
+
+        Returns
+        -------
+        heat flux (W/m^2), with a first axis for the release angles followed by the shape of
+        the broadcast coordinates
+        '''
+        return np.array([flame.Qrad_multi(x, y, z, RH, **kwargs) for flame in self.flames])
+
+
+class HeatFluxField:
+    '''
+    Heat flux on a structured grid (see Flame.heat_flux_field)
+    '''
+    def __init__(self, x, y, z, flux):
+        '''
+        Parameters
+        ----------
+        x, y, z : ndarray
+            coordinates (m) of the grid lines
+        flux : ndarray
+            heat flux (W/m^2), shape (len(x), len(y), len(z))
+        '''
+        self.x, self.y, self.z = x, y, z
+        self.flux = flux
+
+    def iso_surfaces(self, levels=(1.577, 4.732, 25.237)):
+        '''
+        Surfaces of constant heat flux, located by linear interpolation along the grid lines
+
+        Parameters
+        ----------
+        levels : list of floats, optional
+            heat flux levels (kW/m^2), default values are the 2012 International Fire Code (IFC)
+            exposure limits for property lines (1.577 kW/m2), employees (4.732 kW/m2),
+            and non-combustible equipment (25.237 kW/m2)
+
+        Returns
+        -------
+        list of dicts, one for each level, with
+            level : float
+                heat flux level (kW/m^2)
+            vertices : ndarray
+                (n, 3) array of the points (m) at which the grid lines cross the surface
+            extent : ndarray
+                (3, 2) array of the minimum and maximum x, y, and z (m) of the region
+                at or above the level (nan if there is none)
+            volume : float
+                volume (m^3) of the region at or above the level; area (m^2) or length (m)
+                for fields on a plane or line, as axes with a single grid line are left out
+        '''
+        axes = [self.x, self.y, self.z]
+        flux = self.flux / 1000  # kW/m2 from W/m2
+        cell_sizes = np.ones(1)
+        for axis in axes:
+            size = np.ones(1)
+            if len(axis) > 1:
+                size = np.zeros(len(axis))
+                size[1:] += np.diff(axis) / 2
+                size[:-1] += np.diff(axis) / 2
+            cell_sizes = np.multiply.outer(cell_sizes, size)
+        cell_sizes = cell_sizes.reshape(flux.shape)
+
+        surfaces = []
+        for level in np.atleast_1d(levels):
+            inside = flux >= level
+            vertices = []
+            for a, axis in enumerate(axes):
+                if len(axis) < 2:
+                    continue
+                f0 = np.take(flux, np.arange(len(axis) - 1), axis=a)
+                f1 = np.take(flux, np.arange(1, len(axis)), axis=a)
+                index = np.nonzero((f0 >= level) != (f1 >= level))
+                t = (level - f0[index]) / (f1[index] - f0[index])
+                coords = [axes[b][i] for b, i in enumerate(index)]
+                coords[a] = coords[a] + t * (axis[index[a] + 1] - axis[index[a]])
+                vertices.append(np.column_stack(coords))
+            vertices = np.concatenate(vertices) if vertices else np.zeros((0, 3))
+            points = np.concatenate([np.column_stack([axis[i] for axis, i in zip(axes, np.nonzero(inside))]),
+                                     vertices])
+            extent = np.full((3, 2), np.nan)
+            if len(points):
+                extent = np.column_stack([points.min(axis=0), points.max(axis=0)])
+            surfaces.append({'level': level, 'vertices': vertices, 'extent': extent,
+                             'volume': np.sum(cell_sizes[inside])})
+        return surfaces
+
+
+class TransientFlame:
+    '''
+    Jet fire fed by a finite inventory, with the mass flow rate falling as the source
+    empties (see Source.empty)
+
+    The visible length and radiated power come from the correlations (see Flame.length),
+    which are cheap, at every time step of the blowdown.  The trajectory, which needs the
+    integration, comes from a few flames solved at mass flow rates spanning the blowdown: the
+    radiative sources of each are normalized by its visible length and interpolated in
+    log(mass flow rate) between them.
+    '''
+    def __init__(self, source, orifice, ambient, num_flames=6, theta0=0., x0=0., y0=0.,
+                 WaistLoc=0.75, N=50, blowdown_kwargs=None, verbose=False, **flame_kwargs):
+        '''
+        Parameters
+        ----------
+        source : Source object
+            source (tank) that empties through the orifice
+        orifice : Orifice object
+            orifice through which fluid is being released
+        ambient : Fluid object
+            fluid into which release is occuring
+        num_flames : int, optional
+            number of flames solved, at mass flow rates evenly spaced in log(mass flow rate)
+            from the start to the end of the blowdown
+        theta0, x0, y0 : float, optional
+            angle of release (rad) and starting point (m), as for Flame
+        WaistLoc : float, optional
+            fraction of the flame length at which the source weights peak (see Flame.Qrad_multi)
+        N : int, optional
+            number of point sources
+        blowdown_kwargs : dict or None, optional
+            keyword arguments for Source.empty (e.g., heat_flux, m_empty)
+        verbose : bool, optional
+            If True, extra output will be printed (default False)
+        flame_kwargs : optional
+            other keyword arguments for the flames (e.g., nn_conserve_momentum, nn_T)
+        '''
+        mdot, fluids, times, _ = source.empty(orifice, ambient.P, **(blowdown_kwargs or {}))
+        if len(times) < 2:
+            raise ValueError('Blowdown of source must have at least 2 time steps')
+        self.times, self.mdot, self.fluids = np.array(times), np.array(mdot), fluids
+        self.ambient = ambient
+        self.origin = np.array([x0, y0, 0.])
+        self.WaistLoc, self.N = WaistLoc, N
+        flame_kwargs = dict(flame_kwargs, theta0=theta0, x0=x0, y0=y0, verbose=verbose)
+
+        # correlations at every time step, which need only the orifice flow and its expansion,
+        # sharing the chemistry and settings of a flame set up at the start of the blowdown
+        flame = Flame._unsolved(fluids[0], orifice, ambient, **flame_kwargs)
+        flame.length()
+        chem = flame.chem
+        Lvis, Srad = [], []
+        for fluid in fluids:
+            fluid_exp, orifice_exp = DevelopingFlow._expand(orifice.flow(fluid, ambient.P, suppressWarnings=False),
+                                                            orifice, ambient, flame.nn_T, flame.nn_conserve_momentum)
+            correlations = Flame._correlations(chem, ambient, fluid_exp, orifice_exp, flame.af)
+            Lvis.append(correlations[2])
+            Srad.append(correlations[6])
+        self.Lvis, self.Srad = np.array(Lvis), np.array(Srad)
+
+        targets = np.geomspace(self.mdot.max(), self.mdot.min(), num_flames)
+        indices = np.unique([np.argmin(np.abs(np.log(self.mdot / target))) for target in targets])
+        self.flames = []
+        for i in indices[np.argsort(self.mdot[indices])]:
+            if verbose:
+                print('solving flame at {:.3g} kg/s...'.format(self.mdot[i]))
+            self.flames.append(Flame(fluids[i], orifice, ambient, chem=chem, **flame_kwargs))
+
+        # tables in order of increasing mass flow rate
+        order = np.argsort(self.mdot)
+        self._log_mdot = np.log(self.mdot[order])
+        self._log_Lvis = np.log(self.Lvis[order])
+        self._Srad_per_mdot = (self.Srad / self.mdot)[order]
+        self._log_mdot_flames = np.log([flame.mass_flow_rate for flame in self.flames])
+        # the source weights depend only on WaistLoc and N, so are the same for every flame
+        self._weights = self.flames[0]._radiative_sources(WaistLoc, N)[0]
+        self._shapes = np.array([(flame._radiative_sources(WaistLoc, N)[1] - self.origin) / flame.Lvis
+                                 for flame in self.flames])
+
+    def mass_flow_rate(self, times):
+        '''
+        mass flow rate (kg/s) at the given times (s), interpolated log-linearly in time
+        between the blowdown time steps, and 0 after the end of the blowdown
+        '''
+        times = np.asarray(times, dtype=float)
+        mdot = np.exp(np.interp(times, self.times, np.log(self.mdot)))
+        return np.where(times > self.times[-1], 0., mdot)
+
+    def properties(self, mdot):
+        '''
+        Interpolated flame properties
+
+        Parameters
+        ----------
+        mdot : float or ndarray
+            mass flow rate (kg/s)
+
+        Returns
+        -------
+        Lvis : ndarray
+            visible flame length (m)
+        Srad : ndarray
+            total radiated power (W)
+        sources : ndarray
+            (..., N, 3) array of the radiative source locations (m)
+
+        Properties are held at those of the nearest mass flow rate outside the range of
+        the blowdown, except that Srad remains proportional to mdot.
+        '''
+        mdot = np.asarray(mdot, dtype=float)
+        log_mdot = np.log(np.maximum(mdot, 1e-300))
+        Lvis = np.exp(np.interp(log_mdot, self._log_mdot, self._log_Lvis))
+        Srad = mdot * np.interp(log_mdot, self._log_mdot, self._Srad_per_mdot)
+        position = np.interp(log_mdot, self._log_mdot_flames, np.arange(len(self.flames)))
+        lower = np.minimum(np.floor(position).astype(int), max(len(self.flames) - 2, 0))
+        upper = np.minimum(lower + 1, len(self.flames) - 1)
+        fraction = (position - lower)[..., np.newaxis, np.newaxis]
+        shape = (1 - fraction) * self._shapes[lower] + fraction * self._shapes[upper]
+        return Lvis, Srad, self.origin + shape * Lvis[..., np.newaxis, np.newaxis]
+
+    def heat_flux(self, x, y, z, RH, times=None, chunk_size=10000):
+        '''
+        MultiSource radiation model (see Flame.Qrad_multi) over the blowdown
+
+        Parameters
+        ----------
+        x, y, z : float or ndarray
+            observer coordinates (m), broadcast against each other
+        RH : float
+            relative humidity
+        times : float or 1-D array or None, optional
+            times (s) at which to evaluate the heat flux, default is the blowdown time steps
+        chunk_size : int, optional
+            number of observers times number of times evaluated at once,
+            limiting temporary memory
+
+        Returns
+        -------
+        heat flux (W/m^2), with a first axis for the times followed by the shape of the
+        broadcast coordinates
+        '''
+        times = self.times if times is None else np.atleast_1d(np.asarray(times, dtype=float))
+        if times.ndim != 1:
+            raise ValueError('times must be a float or 1-D array')
+        x, y, z = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float),
+                                      np.asarray(z, dtype=float))
+        shape = x.shape
+        observers = np.column_stack([x.ravel(), y.ravel(), z.ravel()])
+        transmissivity = AtmosphericTransmissivity(self.ambient.T, RH)
+
+        _, Srad, sources = self.properties(self.mass_flow_rate(times))
+        source_power = self._weights * Srad[:, np.newaxis] / (4 * const.pi)
+        Qrad = np.zeros((len(times), len(observers)))
+        step = max(chunk_size // max(len(times), 1), 1)
+        for start in range(0, len(observers), step):
+            v = sources[np.newaxis] - observers[start:start + step, np.newaxis, np.newaxis, :]
+            len_v2 = np.einsum('ijkl,ijkl->ijk', v, v)
+            Qrad[:, start:start + step] = np.sum(transmissivity.from_squared_length(len_v2) / len_v2
+                                                 * source_power, axis=-1).T
+        return Qrad.reshape((len(times),) + shape)
+
+    def thermal_dose(self, x, y, z, RH, exposure_time=None, num_times=200, chunk_size=10000):
+        '''
+        Thermal dose, the time integral of heat flux**(4/3) (see probits.calculate_thermal_dose),
+        from ignition at the start of the blowdown
+
+        Parameters
+        ----------
+        x, y, z : float or ndarray
+            observer coordinates (m), broadcast against each other
+        RH : float
+            relative humidity
+        exposure_time : float or None, optional
+            duration of exposure (s), default is None: the whole blowdown
+        num_times : int, optional
+            number of evenly spaced times at which the heat flux is evaluated, in addition to
+            the blowdown time steps, for the trapezoidal integration
+        chunk_size : int, optional
+            as for heat_flux
+
+        Returns
+        -------
+        thermal dose ((W/m^2)^4/3 s), same shape as the broadcast coordinates
+        '''
+        end = self.times[-1] if exposure_time is None else min(exposure_time, self.times[-1])
+        times = np.union1d(np.linspace(self.times[0], end, num_times), self.times[self.times <= end])
+        flux = self.heat_flux(x, y, z, RH, times, chunk_size)
+        return np.trapz(flux ** (4. / 3), times, axis=0)
 
 
 def calc_transmissivity(path_length, ambient_temperature, relative_humidity, atmospheric_CO2_ppm=335):
@@ -668,3 +1403,61 @@ def calc_transmissivity(path_length, ambient_temperature, relative_humidity, atm
     transmissivity = (1.006 - 0.01171 * np.log10(XH2O) - 0.02368 * np.log10(XH2O) ** 2
                        - 0.03188 * np.log10(XCO2) + 0.001164 * np.log10(XCO2) ** 2)
     return transmissivity
+
+
+class AtmosphericTransmissivity:
+    '''
+    Atmospheric transmissivity (Wayne, J. Loss Prev. Proc. Ind. 1991) for fixed ambient conditions
+
+    The correlation (see calc_transmissivity) is a quadratic in log10 of the water vapor and CO2
+    path lengths, each of which is the path length times a factor that depends only on the
+    ambient conditions, so it is a quadratic in log10(path length) whose coefficients are
+    calculated once.  Evaluation then takes one logarithm per path length, exactly reproducing
+    calc_transmissivity without the interpolation error of a table.
+    '''
+    def __init__(self, ambient_temperature, relative_humidity, atmospheric_CO2_ppm=335):
+        '''
+        Parameters
+        ----------
+        ambient_temperature : float
+            Ambient temperature (K)
+        relative_humidity : float
+            Fractional relative humidity (0-1)
+        atmospheric_CO2_ppm : float
+            Atmospheric CO2 concentration (ppm),
+            default is 335 ppm
+        '''
+        self.ambient_temperature = ambient_temperature
+        self.relative_humidity = relative_humidity
+        self.atmospheric_CO2_ppm = atmospheric_CO2_ppm
+        sat_water_vap_pressure_mmHg = np.exp(20.386 - 5132 / ambient_temperature)
+        a_H2O = np.log10(relative_humidity * sat_water_vap_pressure_mmHg * 2.88651e2 / ambient_temperature)
+        a_CO2 = np.log10(273. / ambient_temperature * atmospheric_CO2_ppm / 335.)
+        # tau = c0 + c1*log10(L) + c2*log10(L)**2
+        self.c0 = 1.006 - 0.01171 * a_H2O - 0.02368 * a_H2O ** 2 - 0.03188 * a_CO2 + 0.001164 * a_CO2 ** 2
+        self.c1 = -0.01171 - 2 * 0.02368 * a_H2O - 0.03188 + 2 * 0.001164 * a_CO2
+        self.c2 = -0.02368 + 0.001164
+
+    def _evaluate(self, log_length):
+        return self.c0 + log_length * (self.c1 + self.c2 * log_length)
+
+    def __call__(self, path_length):
+        '''
+        Parameters
+        ----------
+        path_length : float or ndarray
+            Path length (m) through which radiative light must travel
+
+        Returns
+        -------
+        transmissivity : float or ndarray
+            Atmospheric transmissivity
+        '''
+        return self._evaluate(np.log10(path_length))
+
+    def from_squared_length(self, path_length_squared):
+        '''
+        Transmissivity given the square of the path length (m^2), avoiding a square root
+        when squared distances are already available
+        '''
+        return self._evaluate(0.5 * np.log10(path_length_squared))
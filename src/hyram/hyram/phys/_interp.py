@@ -0,0 +1,131 @@
+"""
+Copyright 2015-2022 National Technology & Engineering Solutions of Sandia, LLC (NTESS).
+Under the terms of Contract DE-NA0003525 with NTESS, the U.S. Government retains certain rights in this software.
+
+You should have received a copy of the GNU General Public License along with HyRAM+.
+If not, see https://www.gnu.org/licenses/.
+"""
+
+from __future__ import print_function, absolute_import, division
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+
+class StreamlineIndex:
+    '''
+    Interpolation index for the centerline arrays of a solved jet or flame
+
+    Ascending (contiguous, reversed if necessary) copies of the abscissa arrays are
+    built on first use and cached, so repeated lookups - including inverse lookups
+    such as the streamline distance at which the centerline mole fraction reaches
+    a given value - are a binary search into existing arrays.
+    '''
+    def __init__(self, owner, names):
+        '''
+        Parameters
+        ----------
+        owner : object
+            solved jet or flame, holding the centerline arrays as attributes
+        names : list of str
+            names of the attributes to index (must include 'S'); the node index
+            itself is also available as the variable 'index'
+        '''
+        self._arrays = {name: getattr(owner, name) for name in names if hasattr(owner, name)}
+        self.S = self._arrays['S']
+        self._index = np.arange(len(self.S), dtype=float)
+        self._pairs = {}
+        self._tree = None
+
+    def is_current(self, owner):
+        '''
+        True if the index was built from the arrays currently held by owner
+        '''
+        return all(getattr(owner, name, None) is array for name, array in self._arrays.items())
+
+    def _variable(self, name):
+        return self._index if name == 'index' else self._arrays[name]
+
+    def _pair(self, xp, fp):
+        if (xp, fp) not in self._pairs:
+            xvals, fvals = self._variable(xp), self._variable(fp)
+            if xvals[-1] < xvals[0]:
+                xvals, fvals = xvals[::-1], fvals[::-1]
+            self._pairs[(xp, fp)] = (np.ascontiguousarray(xvals, dtype=float),
+                                     np.ascontiguousarray(fvals, dtype=float))
+        return self._pairs[(xp, fp)]
+
+    def interp(self, x, xp='S', fp='x'):
+        '''
+        Interpolates centerline variable fp at values x of centerline variable xp
+
+        Parameters
+        ----------
+        x : float or ndarray
+            values of xp at which to interpolate
+        xp : str, optional
+            name of the (monotonic) independent variable, default is 'S'
+        fp : str, optional
+            name of the dependent variable, default is 'x'
+
+        Returns
+        -------
+        interpolated values of fp, same shape as x
+        '''
+        xvals, fvals = self._pair(xp, fp)
+        return np.interp(x, xvals, fvals)
+
+    def interp_many(self, x, fps, xp='S'):
+        '''
+        Interpolates several centerline variables at the same points,
+        locating the points along xp only once
+
+        Parameters
+        ----------
+        x : float or ndarray
+            values of xp at which to interpolate
+        fps : list of str
+            names of the dependent variables
+        xp : str, optional
+            name of the (monotonic) independent variable, default is 'S'
+
+        Returns
+        -------
+        list of interpolated values, one for each of fps, each the same shape as x
+        '''
+        xvals, _ = self._pair(xp, fps[0])
+        x = np.asarray(x, dtype=float)
+        xc = np.clip(x, xvals[0], xvals[-1])
+        i = np.clip(np.searchsorted(xvals, xc, side='right') - 1, 0, max(len(xvals) - 2, 0))
+        if len(xvals) > 1:
+            dx = xvals[i + 1] - xvals[i]
+            t = np.divide(xc - xvals[i], dx, out=np.zeros_like(xc), where=dx > 0)
+        else:
+            t = np.zeros_like(xc)
+        values = []
+        for fp in fps:
+            fvals = self._pair(xp, fp)[1]
+            f0, f1 = fvals[i], fvals[np.minimum(i + 1, len(fvals) - 1)]
+            values.append(f0 + t * (f1 - f0))
+        return values
+
+    def nearest_node(self, points):
+        '''
+        Finds the centerline node nearest to each of a set of (x, y) points,
+        using a KD-tree over the nodes that is built on first use
+
+        Parameters
+        ----------
+        points : ndarray
+            (n, 2) array of x, y coordinates (m)
+
+        Returns
+        -------
+        distance : ndarray
+            distance (m) to the nearest node for each point
+        index : ndarray
+            index of the nearest node for each point
+        '''
+        if self._tree is None:
+            self._tree = cKDTree(np.column_stack([self._arrays['x'], self._arrays['y']]))
+        return self._tree.query(points)
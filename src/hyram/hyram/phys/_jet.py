@@ -17,6 +17,7 @@ from scipy import integrate, optimize
 import scipy.constants as const
 
 from ._fuel_props import Fuel_Properties
+from ._interp import StreamlineIndex
 from ._nn import NotionalNozzle
 from ..utilities.custom_warnings import PhysicsWarning
 
@@ -54,7 +55,8 @@ class DevelopingFlow:
                                      1, self.fluid_orifice.T, theta0, x0, y0, S0)
 
         # Underexpanded jet (if needed: gets fluid to atmospheric pressure)
-        self.fluid_exp, self.orifice_exp = self._expand(orifice, ambient, nn_T, nn_conserve_momentum)
+        self.fluid_exp, self.orifice_exp = self._expand(self.fluid_orifice, orifice, ambient, nn_T,
+                                                        nn_conserve_momentum, self.verbose)
  
         # Initial entrainment and heating (if needed: warms fluid to good T for thermodynamics)
         self.expanded_plug_node = self._dev_plug(self.fluid_exp, self.orifice_exp, ambient, Y0, theta0, x0, y0, S0, 
@@ -64,19 +66,20 @@ class DevelopingFlow:
 
         self.initial_node = self.expanded_plug_node.establish(ambient, self.fluid_exp, lam)
     
-    def _expand(self, orifice, ambient, nn_T, nn_conserve_momentum):
+    @staticmethod
+    def _expand(fluid_orifice, orifice, ambient, nn_T, nn_conserve_momentum, verbose=False):
         '''
         expands an underexpanded jet, if needed
         '''
-        if self.fluid_orifice.P > ambient.P: # use notional nozzle model
-            if self.verbose:
+        if fluid_orifice.P > ambient.P: # use notional nozzle model
+            if verbose:
                 print('solving for notional nozzle... ', end='')
-            nn = NotionalNozzle(self.fluid_orifice, orifice, ambient)
+            nn = NotionalNozzle(fluid_orifice, orifice, ambient)
             g, o = nn.calculate(nn_T, nn_conserve_momentum)
-            if self.verbose:
+            if verbose:
                 print('done.')
         else:
-            g, o = self.fluid_orifice, orifice
+            g, o = fluid_orifice, orifice
         return g, o
 
     def _dev_plug(self, fluid, orifice, ambient, Y0, theta0, x0, y0, S0, 
@@ -216,7 +219,133 @@ class GaussianNode:
         return E        
 
 
+def _plume_derivatives(ind_vars, params, alpha = 0.082, Yamb = 0., numB = 5, numpts = 500):
+    '''
+    Governing equations for one or more plumes, written in terms of d/dS of (V_cl, B, rho_cl, Y_cl, 
+    theta, x, and y).
+    
+    A matrix solution to the continuity, x-momentum, y-momentum, species, and energy 
+    equations solves for d/dS of the dependent variables V_cl, B, rho_cl, Y_cl,  and Theta.  
+    Numerically integrated to infinity = numB * B(S) using numpts discrete points.
+
+    Parameters
+    ----------
+    ind_vars : ndarray
+        rows of [V_cl, B, rho_cl, Y_cl, theta, x, y], one for each plume
+    params : dict of ndarrays
+        parameters of each plume (see Jet._setup): rho_amb, MW_air, MW_fluid, lam, Pamb,
+        Cp_fluid, Cp_air, h_amb0, Emom and alpha_buoy
+
+    Returns
+    -------
+    ndarray of d/dS of [V_cl, B, rho_cl, Y_cl, theta, x, y], one row for each plume
+    '''
+    V_cl, B, rho_cl, Y_cl, theta, x, y = np.asarray(ind_vars).T
+    rho_amb, MW_air, MW_fluid, lam = params['rho_amb'], params['MW_air'], params['MW_fluid'], params['lam']
+    Pamb, Cp_fluid, Cp_air, h_amb0 = params['Pamb'], params['Cp_fluid'], params['Cp_air'], params['h_amb0']
+    n = len(V_cl)
+
+    # entrainment (see GaussianNode.entrainment)
+    FrL = V_cl**2*rho_cl/(const.g*B*abs(rho_amb-rho_cl))
+    E = params['Emom'] + params['alpha_buoy']/FrL*(2*const.pi*V_cl*B)*np.sin(theta)
+    E = np.where(E/(2*const.pi*V_cl*B) > alpha, alpha*2*const.pi*B*V_cl, E)
+
+    # some stuff needed to integrate to infinity (numB*B), one row for each plume:
+    r = np.zeros((n, numpts + 1))
+    r[:, 1:] = 10**(-5 + np.outer(np.log10(numB*B) + 5, np.linspace(0, 1, numpts)))
+    V_cl_, B_, rho_cl_, Y_cl_ = V_cl[:, None], B[:, None], rho_cl[:, None], Y_cl[:, None]
+    rho_amb_, MW_air_, MW_fluid_, lam_ = rho_amb[:, None], MW_air[:, None], MW_fluid[:, None], lam[:, None]
+    zero = np.zeros_like(r)
+    r2 = r**2
+    exp_lam = np.exp(r2/(lam_*B_)**2)
+    # evaluated directly rather than as 1/exp_lam, which changes the solution by round-off
+    gauss_lam = np.exp(-r2/(lam_*B_)**2)
+    V = V_cl_*np.exp(-r2/(B_**2))
+    dVdS = np.array([V/V_cl_,                                                       #d/dS(V_cl)
+                     2*V*r2/B_**3,                                                  #d/dS(B)
+                     zero,                                                          #d/dS(rho_cl)
+                     zero,                                                          #d/dS(Y_cl)
+                     zero])                                                         #d/dS(theta)
+    rho = (rho_cl_ - rho_amb_)*gauss_lam+rho_amb_
+    Y = Y_cl_*rho_cl_/rho*gauss_lam
+    dYdS = np.array([zero,                                                          #d/dS(V_cl)
+                     (2*Y**2*rho_amb_*r2*exp_lam/
+                     (lam_**2*B_**3*Y_cl_*rho_cl_)),                                #d/dS(B)
+                     Y**2*rho_amb_*(exp_lam-1)/(Y_cl_*rho_cl_**2),                  #d/dS(rho_cl)
+                     Y/Y_cl_,                                                       #d/dS(Y_cl)
+                     zero])                                                         #d/dS(theta)
+    MW = MW_air_*MW_fluid_/(Y*(MW_air_ - MW_fluid_) + MW_fluid_)
+    dMWdS = (MW*(MW_air_ - MW_fluid_)/(MW_fluid_*(Y-1) - MW_air_*Y))*dYdS
+    Cp = Y*(Cp_fluid[:, None] - Cp_air[:, None]) + Cp_air[:, None]
+    dCpdS = (Cp_fluid[:, None] - Cp_air[:, None])*dYdS
+    rhoh = Pamb[:, None]/const.R*MW*Cp
+    drhohdS = Pamb[:, None]/const.R*(MW*dCpdS + Cp*dMWdS)
+    ##########################################################
+    # TODO: integrating the energy equation without involving Cp - not sure what the isssue is in the code below
+    # drhodS  = np.array([zero,                                                #d/dS(V_cl)
+                        # -2*r**2*(rho_amb - rho_cl)*np.exp(r**2/(lam*B)**2),  #d/dS(B)
+                        # lam**2*B**3*np.exp(r**2/(lam*B)**2),                 #d/dS(rho_cl)
+                        # zero,                                                #d/dS(Y_cl)
+                        # zero                                                 #d/dS(theta)
+                        # ])*1./(lam**2*B**3)
+    # # TODO: remove ideal gas assumption here (low priority)
+    # T = Pamb*MW/(const.R*rho)
+    # dTdS = Pamb/(const.R*rho)*dMWdS - Pamb*MW/(const.R*rho**2)*drhodS
+    # h_amb = self._h_amb(T) #self.ambient.therm.h(T = T, P = Pamb)
+    # d_h_amb_dT = self._dh_amb_dT(T)
+    # h_fluid = self._h_fluid(T)
+    # d_h_fluid_dT = self._dh_fluid_dT(T)
+    # h = Y*h_fluid - Y*h_amb + h_amb
+    # dhdS = (h_fluid - h_amb)*dYdS + Y*(d_h_fluid_dT - d_h_amb_dT)*dTdS + d_h_amb_dT*dTdS
+    
+    # rhoh = rho*h
+    # drhohdS = h*drhodS + rho*dhdS
+    # #########################################################
+
+    # governing equations, LHS[plume, equation, derivative]:
+    LHS = np.zeros((n, 5, 5))
+    # continuity
+    LHS[:, 0, :3] = np.array([(lam**2*rho_cl + rho_amb)*B**2,
+                              2*(lam**2*rho_cl + rho_amb)*B*V_cl,
+                              lam**2*B**2*V_cl]).T*(const.pi/(lam**2 + 1))[:, None]
+    # x- and y-momentum
+    mom = np.array([(2*lam**2*rho_cl+rho_amb)*B**2*V_cl,
+                    (2*lam**2*rho_cl+rho_amb)*B*V_cl**2,
+                    lam**2*B**2*V_cl**2]).T*(const.pi/(2*lam**2+1))[:, None]
+    mom_theta = const.pi/(2*lam**2+1)*(2*lam**2*rho_cl+rho_amb)*(B*V_cl)**2/2
+    LHS[:, 1, :3] = mom*np.cos(theta)[:, None]
+    LHS[:, 1, 4] = -mom_theta*np.sin(theta)
+    LHS[:, 2, :3] = mom*np.sin(theta)[:, None]
+    LHS[:, 2, 4] = mom_theta*np.cos(theta)
+    # species
+    LHS[:, 3, :4] = np.array([B*Y_cl*rho_cl,
+                              2*V_cl*Y_cl*rho_cl,
+                              B*V_cl*Y_cl,
+                              B*V_cl*rho_cl]).T*(const.pi*lam**2*B/(lam**2 + 1))[:, None]
+    # energy
+    LHS[:, 4, :] = 2*const.pi*integrate.trapz(V*drhohdS*r + rhoh*dVdS*r, r, axis = -1).T
+    LHS[:, 4, :3] += np.array([const.pi/(6*lam**2 + 2)*(3*lam**2*rho_cl+rho_amb)*B**2*V_cl**2,
+                               const.pi/(9*lam**2 + 3)*(3*lam**2*rho_cl+rho_amb)*V_cl**3*B,
+                               const.pi/(6*lam**2 + 2)*lam**2*B**2*V_cl**3]).T
+
+    RHScont = rho_amb*E
+    RHS = np.array([RHScont,                                                        #continuity
+                    np.zeros(n),                                                    #x-momentum
+                    -const.pi*lam**2*const.g*(rho_cl - rho_amb)*B**2,               #y-momentum
+                    Yamb*RHScont,                                                   #species
+                    h_amb0*RHScont]).T                                              #energy
+
+    dz = np.empty((n, 7))
+    dz[:, :5] = np.linalg.solve(LHS, RHS[:, :, None])[:, :, 0]
+    dz[:, 5] = np.cos(theta)
+    dz[:, 6] = np.sin(theta)
+    return dz
+
+
 class Jet:
+    _streamline_index = None
+    _solution_results = None
+
     def __init__(self, fluid, orifice, ambient, mdot=None,
                  theta0= 0, x0=0., y0=0.,
                  lam=1.16, betaA=0.28,
@@ -299,6 +428,17 @@ class Jet:
         S : ndarray of floats
             distance (m) along jet?
         '''
+        self._setup(fluid, orifice, ambient, mdot, theta0, x0, y0, lam, betaA,
+                    nn_conserve_momentum, nn_T, T_establish_min, suppressWarnings, verbose)
+
+        # Integrate in the zone of established flow
+        self.solve(Ymin, dS, Smax, max_steps, tol, alpha, Yamb, numB, numpts)
+
+    def _setup(self, fluid, orifice, ambient, mdot, theta0, x0, y0, lam, betaA,
+               nn_conserve_momentum, nn_T, T_establish_min, suppressWarnings, verbose):
+        '''
+        sets up the developing flow and entrainment parameters, everything needed before integration
+        '''
         self.verbose = verbose
                
         self.developing_flow = DevelopingFlow(fluid, orifice, ambient, mdot,
@@ -334,10 +474,12 @@ class Jet:
         # TODO: determine if _Cp_fluid should be at ambient T, or T_cl0
         self._Cp_fluid = self.fluid.therm.PropsSI('C', T = ambient.T, P = ambient.P)
         self._Cp_air, self._h_amb0 = ambient.therm.PropsSI(['C', 'H'], T = ambient.T, P = ambient.P)
-
-        
-        # Integrate in the zone of established flow
-        self.solve(Ymin, dS, Smax, max_steps, tol, alpha, Yamb, numB, numpts)
+        # parameters of the governing equations, as arrays for _plume_derivatives
+        self._plume_params = {'rho_amb': ambient.rho, 'MW_air': MW_air, 'MW_fluid': MW_fluid, 'lam': lam,
+                              'Pamb': ambient.P, 'Cp_fluid': self._Cp_fluid, 'Cp_air': self._Cp_air,
+                              'h_amb0': self._Cp_air * ambient.T, 'Emom': self._Emom,
+                              'alpha_buoy': self._alpha_buoy}
+        self._plume_params = {k: np.array([v], dtype=float) for k, v in self._plume_params.items()}
     
     def solve(self, Ymin = 7e-4, dS = None, Smax = np.inf, 
               max_steps = 5000, tol = 1e-8,
@@ -369,145 +511,46 @@ class Jet:
             r.integrate(r.t + dS)
             i += 1
             
-        Y = np.array(Y)
+        self._set_solution(T, Y)
+        
+        if self.verbose:
+            print('done.')
+
+        return self
+
+    def _set_solution(self, S, ind_vars):
+        '''
+        stores the integrated solution (S and rows of [V_cl, B, rho_cl, Y_cl, theta, x, y])
+        and calculates the centerline mole fraction and temperature
+        '''
+        Y = np.array(ind_vars)
         
         for key, val in zip(['V_cl', 'B', 'rho_cl', 'Y_cl', 'theta', 'x', 'y'], Y.T):
             self.__dict__[key] = val
-        self.__dict__['S'] = np.array(T)
+        self.__dict__['S'] = np.array(S)
 
         MW_fluid, MW_air = self.fluid.therm.MW, self.ambient.therm.MW
         MW_cl  = MW_air*MW_fluid/(self.Y_cl*(MW_air-MW_fluid) + MW_fluid)
         self.X_cl = self.Y_cl*MW_cl/MW_fluid
         self.T_cl = self.ambient.P*MW_cl/(const.R*self.rho_cl)
-        
-        if self.verbose:
-            print('done.')
-
-        return self
     
+    @property
+    def streamline_index(self):
+        '''
+        interpolation index of the centerline arrays, rebuilt only when the solution changes
+        '''
+        if self._streamline_index is None or not self._streamline_index.is_current(self):
+            self._streamline_index = StreamlineIndex(self, ['S', 'x', 'y', 'theta', 'B', 'V_cl',
+                                                            'rho_cl', 'Y_cl', 'X_cl', 'T_cl'])
+        return self._streamline_index
+
     def _govEqns(self, S, ind_vars, alpha = 0.082, Yamb = 0., numB = 5, numpts = 500):
         '''
         Governing equations for a plume, written in terms of d/dS of (V_cl, B, rho_cl, Y_cl, 
-        theta, x, and y).
-        
-        A matrix solution to the continuity, x-momentum, y-momentum, species, and energy 
-        equations solves for d/dS of the dependent variables V_cl, B, rho_cl, Y_cl,  and Theta.  
-        Numerically integrated to infinity = numB * B(S) using numpts discrete points.
+        theta, x, and y) (see _plume_derivatives).
         '''
-        # break independent variables out of ind_vars, then put them into node_in
-        [V_cl, B, rho_cl, Y_cl, theta, x, y] = ind_vars
-        node_in = GaussianNode(B, V_cl, rho_cl, Y_cl, theta, S = S)
-        
-        # pull some parameters out of objects so their definition isn't so long
-        rho_amb, MW_air, MW_fluid = self.ambient.rho, self.ambient.therm.MW, self.fluid.therm.MW
-        lam = self.lam
-        Pamb = self.ambient.P
-        h_amb0, Cp_fluid, Cp_air = self._h_amb0, self._Cp_fluid, self._Cp_air
-        h_amb0 = Cp_air * self.ambient.T
-        E = node_in.entrainment(self._Emom, rho_amb, self._alpha_buoy, alpha = alpha)
-        
-        # some stuff needed to integrate to infinity (numB*B):
-        r = np.append(np.array([0]), np.logspace(-5, np.log10(numB*B), numpts))
-        zero = np.zeros_like(r)
-        V       = V_cl*np.exp(-(r**2)/(B**2))
-        dVdS = np.array([V/V_cl,                                                 #d/dS(V_cl)
-                         2*V*r**2/B**3,                                          #d/dS(B)
-                         zero,                                                   #d/dS(rho_cl) 
-                         zero,                                                   #d/dS(Y_cl)
-                         zero])                                                  #d/dS(theta)
-        rho     = (rho_cl - rho_amb)*np.exp(-(r**2)/((lam*B)**2))+rho_amb
-        Y       = Y_cl*rho_cl/rho*np.exp(-r**2/(lam*B)**2)
-        dYdS = np.array([zero,                                                      #d/dS(V_cl)
-                         (2*Y**2*rho_amb*r**2*np.exp(r**2/(lam*B)**2)/
-                         (lam**2*B**3*Y_cl*rho_cl)),                                #d/dS(B)
-                         Y**2*rho_amb*(np.exp(r**2/(lam*B)**2)-1)/(Y_cl*rho_cl**2), #d/dS(rho_cl)
-                         Y/Y_cl,                                                    #d/dS(Y_cl)
-                         zero])                                                     #d/dS(theta)
-        MW      = MW_air*MW_fluid/(Y*(MW_air - MW_fluid) + MW_fluid)
-        dMWdS   = (MW*(MW_air - MW_fluid)/(MW_fluid*(Y-1) - MW_air*Y))*dYdS
-        Cp      = Y*(Cp_fluid - Cp_air) + Cp_air 
-        dCpdS   = (Cp_fluid - Cp_air)*dYdS
-        rhoh    = Pamb/const.R*MW*Cp
-        drhohdS = Pamb/const.R*(MW*dCpdS + Cp*dMWdS)
-        ##########################################################
-        # TODO: integrating the energy equation without involving Cp - not sure what the isssue is in the code below
-        # drhodS  = np.array([zero,                                                #d/dS(V_cl)
-                            # -2*r**2*(rho_amb - rho_cl)*np.exp(r**2/(lam*B)**2),  #d/dS(B)
-                            # lam**2*B**3*np.exp(r**2/(lam*B)**2),                 #d/dS(rho_cl)
-                            # zero,                                                #d/dS(Y_cl)
-                            # zero                                                 #d/dS(theta)
-                            # ])*1./(lam**2*B**3)
-        # # TODO: remove ideal gas assumption here (low priority)
-        # T = Pamb*MW/(const.R*rho)
-        # dTdS = Pamb/(const.R*rho)*dMWdS - Pamb*MW/(const.R*rho**2)*drhodS
-        # h_amb = self._h_amb(T) #self.ambient.therm.h(T = T, P = Pamb)
-        # d_h_amb_dT = self._dh_amb_dT(T)
-        # h_fluid = self._h_fluid(T)
-        # d_h_fluid_dT = self._dh_fluid_dT(T)
-        # h = Y*h_fluid - Y*h_amb + h_amb
-        # dhdS = (h_fluid - h_amb)*dYdS + Y*(d_h_fluid_dT - d_h_amb_dT)*dTdS + d_h_amb_dT*dTdS
-        
-        # rhoh = rho*h
-        # drhohdS = h*drhodS + rho*dhdS
-        # #########################################################
-        
-        
-        # governing equations:
-        LHScont = np.array([(lam**2*rho_cl + rho_amb)*B**2,                        #d/dS(V_cl)
-                            2*(lam**2*rho_cl + rho_amb)*B*V_cl,                    #d/dS(B)
-                            lam**2*B**2*V_cl,                                      #d/dS(rho_cl)
-                            0.,                                                    #d/dS(Y_cl)
-                            0.])*const.pi/(lam**2 + 1)                             #d/dS(theta)
-        RHScont = rho_amb*E
-        
-        LHSxmom = np.array([(2*lam**2*rho_cl+rho_amb)*B**2*V_cl*np.cos(theta),     #d/dS(V_cl)
-                            (2*lam**2*rho_cl+rho_amb)*B*V_cl**2*np.cos(theta),     #d/dS(B)
-                            lam**2*B**2*V_cl**2*np.cos(theta),                     #d/dS(rho_cl)
-                            0.,                                                    #d/dS(Y_cl)
-                            -(2*lam**2*rho_cl+rho_amb)*(B*V_cl)**2*np.sin(theta)/2 #d/dS(theta)
-                            ])*const.pi/(2*lam**2+1)        
-        RHSxmom = 0.
-        
-        LHSymom = np.array([(2*lam**2*rho_cl+rho_amb)*B**2*V_cl*np.sin(theta),     #d/dS(V_cl)
-                            (2*lam**2*rho_cl+rho_amb)*B*V_cl**2*np.sin(theta),     #d/dS(B)
-                            lam**2*B**2*V_cl**2*np.sin(theta),                     #d/dS(rho_cl)
-                            0.,                                                    #d/dS(Y_cl)
-                            (2*lam**2*rho_cl+rho_amb)*(B*V_cl)**2*np.cos(theta)/2  #d/dS(theta)
-                            ])*const.pi/(2*lam**2+1)                                 
-        RHSymom = -const.pi*lam**2*const.g*(rho_cl - rho_amb)*B**2
-        
-        LHSspec = np.array([B*Y_cl*rho_cl,                                         #d/dS(V_cl)
-                            2*V_cl*Y_cl*rho_cl,                                    #d/dS(B)
-                            B*V_cl*Y_cl,                                           #d/dS(rho_cl)
-                            B*V_cl*rho_cl,                                         #d/dS(Y_cl)
-                            0.,                                                    #d/dS(theta)
-                            ])*const.pi*lam**2*B/(lam**2 + 1)                
-        RHSspec = Yamb*RHScont
-        
-        LHSener = 2*const.pi*integrate.trapz(V*drhohdS*r + rhoh*dVdS*r, r)
-        LHSener += [const.pi/(6*lam**2 + 2)*(3*lam**2*rho_cl+rho_amb)*B**2*V_cl**2, #d/dS(V_cl)
-                    const.pi/(9*lam**2 + 3)*(3*lam**2*rho_cl+rho_amb)*V_cl**3*B,    #d/dS(B)
-                    const.pi/(6*lam**2 + 2)*lam**2*B**2*V_cl**3,                    #d/dS(rho_cl)
-                    0.,                                                             #d/dS(Y_cl)
-                    0.]                                                             #d/dS(theta)
-        
-        RHSener = h_amb0*RHScont
-        
-        LHS = np.array([LHScont,
-                        LHSxmom,
-                        LHSymom,
-                        LHSspec,
-                        LHSener
-                        ])
-        RHS = np.array([RHScont,
-                        RHSxmom,
-                        RHSymom,
-                        RHSspec,
-                        RHSener])
-        
-        dz = np.append(np.linalg.solve(LHS,RHS), np.array([np.cos(theta), np.sin(theta)]), axis = 0)
-        
-        return dz
+        return _plume_derivatives(np.asarray(ind_vars)[None, :], self._plume_params,
+                                 alpha, Yamb, numB, numpts)[0]
     
     def reshape(self, enclosure, showPlot = False):
         '''
@@ -555,15 +598,38 @@ class Jet:
         -------
         mass : float
             Flammable mass in plume, up to height H (kg)
+
+        The result is stored for each (X_lean, X_rich, Hmax), and reused until the solution changes.
         '''
-        MW_fluid = self.fluid.therm.MW
-        MW_air = self.ambient.therm.MW
         if X_lean is None:
             fuel_props = Fuel_Properties(self.fluid.species)
             X_lean = fuel_props.LFL
         if X_rich is None:
             fuel_props = Fuel_Properties(self.fluid.species)
             X_rich = fuel_props.UFL
+        key = (float(X_lean), float(X_rich), float(Hmax))
+        return self._cached('m_flammable', key, lambda: self._m_flammable(*key))
+
+    def _cached(self, name, key, calculate):
+        '''
+        result of calculate(), stored for each (name, key) and reused until the solution arrays
+        change, for quantities derived from the solution that several models need (e.g., the
+        flammable mass and the overpressure origin shared by the overpressure methods)
+        '''
+        arrays = tuple(getattr(self, array, None) for array in ('S', 'x', 'y', 'V_cl', 'B', 'rho_cl', 'Y_cl', 'theta'))
+        if self._solution_results is None or any(a is not b for a, b in zip(self._solution_results[0], arrays)):
+            self._solution_results = (arrays, {})
+        results = self._solution_results[1]
+        if (name, key) not in results:
+            results[(name, key)] = calculate()
+        return results[(name, key)]
+
+    def _m_flammable(self, X_lean, X_rich, Hmax):
+        '''
+        integrates the mass in the plume between the flammability limits, up to height Hmax (see m_flammable)
+        '''
+        MW_fluid = self.fluid.therm.MW
+        MW_air = self.ambient.therm.MW
         Ylean = X_lean * MW_fluid / (X_lean * MW_fluid + (1. - X_lean) * MW_air)
         Yrich = X_rich * MW_fluid / (X_rich * MW_fluid + (1. - X_rich) * MW_air)
 
@@ -593,10 +659,12 @@ class Jet:
         Y_cl, B, rho_cl, S = [np.append(np.append(np.interp(Srich, S, var), var[ivals]), np.interp(Slean, S, var)) for var in [Y_cl, B, rho_cl, S]]
         
         # radius of flammable concentration at each node:
-        r_lean = np.array([0 if Y_cl[i] <= Ylean else 
+        # (0 where the centerline is at or below the limit, which includes the interpolated end nodes,
+        # where the mass fraction at r = 0 may differ from the limit by round-off)
+        r_lean = np.array([0 if Y_cl[i] <= Ylean or rhoY(0, i)[1] - Ylean <= 0 else
                            optimize.brentq(lambda r: rhoY(r, i)[1] - Ylean, 0, 100*B[i])
                            for i in range(len(S))])
-        r_rich = np.array([0 if Y_cl[i] <= Yrich else 
+        r_rich = np.array([0 if Y_cl[i] <= Yrich or rhoY(0, i)[1] - Yrich <= 0 else
                            optimize.brentq(lambda r: rhoY(r, i)[1] - Yrich, 0, 100*B[i])
                            for i in range(len(S))])
         # integrate to find the mass/length at each node
@@ -605,6 +673,128 @@ class Jet:
         # integrate to find the total mass
         return integrate.trapz(mass_per_len, S)
     
+    _FIELD_NAMES = ('x', 'y', 'X', 'Y', 'v', 'T', 'rho', 'MW')
+
+    def iter_fields(self, fields=('x', 'y', 'X', 'Y', 'v', 'T'), nS=None, nr=50,
+                    dtype=np.float64, bbox=None, chunk_size=256):
+        """
+        Lazily samples plume fields over the (S, r) plane, one chunk of S rows at a time.
+
+        Only the requested fields (and whatever they depend on) are computed.
+
+        Parameters
+        ----------
+        fields : iterable of str
+            fields to compute, any of 'x', 'y' (positions, m), 'X' (mole fraction),
+            'Y' (mass fraction), 'v' (velocity, m/s), 'T' (temperature, K),
+            'rho' (density, kg/m^3) and 'MW' (molecular weight, g/mol)
+        nS : int or None, optional
+            number of streamwise points, evenly spaced between the first and last
+            solver nodes (default None: use the solver nodes themselves)
+        nr : int, optional
+            number of log-spaced radial points on each side of the centerline,
+            out to 3 times the maximum half-width (default 50: 101 points across)
+        dtype : numpy dtype, optional
+            dtype of the returned arrays (e.g. np.float32), default is np.float64
+        bbox : tuple or None, optional
+            (xmin, xmax, ymin, ymax) - only S rows whose cross-section may intersect
+            this box (plus one neighboring row on either side) are sampled
+        chunk_size : int, optional
+            number of S rows per yielded chunk
+
+        Yields
+        ------
+        chunk : dict
+            'S' (1D array of streamline distances for the chunk) and the requested
+            fields as 2D arrays of shape (rows in chunk, 2*nr + 1)
+        """
+        fields = tuple(fields)
+        for field in fields:
+            if field not in self._FIELD_NAMES:
+                raise ValueError('Unknown field {}, must be one of {}'.format(field, self._FIELD_NAMES))
+
+        if nS is None:
+            S, B, rho_cl, Y_cl, V_cl, theta, x_cl, y_cl = (self.S, self.B, self.rho_cl, self.Y_cl,
+                                                          self.V_cl, self.theta, self.x, self.y)
+        else:
+            S = np.linspace(self.S[0], self.S[-1], nS)
+            B, rho_cl, Y_cl, V_cl, theta, x_cl, y_cl = self.streamline_index.interp_many(
+                S, ['B', 'rho_cl', 'Y_cl', 'V_cl', 'theta', 'x', 'y'])
+
+        # Calculates logspaced points around 0 out to np.log10(3*np.max(self.B))
+        # poshalf[::-1] just notation for reversing a numpy array
+        poshalf = np.logspace(-5, np.log10(3*np.max(self.B)), nr)
+        r = np.concatenate((-1.0 * poshalf[::-1], [0], poshalf))
+
+        iS = np.arange(len(S))
+        if bbox is not None:
+            xmin, xmax, ymin, ymax = bbox
+            dx, dy = r[-1]*np.abs(np.sin(theta)), r[-1]*np.abs(np.cos(theta))
+            inside = ((x_cl + dx >= xmin) & (x_cl - dx <= xmax) &
+                      (y_cl + dy >= ymin) & (y_cl - dy <= ymax))
+            if not np.any(inside):
+                return
+            # keep a contiguous block of rows, padded by a neighbor so contours reach the box edges
+            i0 = max(np.argmax(inside) - 1, 0)
+            i1 = min(len(S) - np.argmax(inside[::-1]) + 1, len(S))
+            iS = iS[i0:i1]
+
+        rho_amb, Pamb = self.ambient.rho, self.ambient.P
+        MW_fluid, MW_air = self.fluid.therm.MW, self.ambient.therm.MW
+        need_Y = any(f in fields for f in ['Y', 'X', 'MW', 'T'])
+        need_rho = need_Y or 'rho' in fields
+        need_MW = any(f in fields for f in ['X', 'MW', 'T'])
+
+        for start in range(0, len(iS), chunk_size):
+            i = iS[start:start + chunk_size]
+            rr, ii = np.meshgrid(r, i)
+            chunk = {'S': S[i].astype(dtype)}
+            if need_rho:
+                rho = rho_amb + (rho_cl[ii] - rho_amb)*np.exp(-rr**2/self.lam**2/B[ii]**2)
+            if need_Y:
+                Y = Y_cl[ii]*rho_cl[ii]*np.exp(-(rr**2)/((self.lam*B[ii])**2))/rho
+            if need_MW:
+                MW = MW_air*MW_fluid/(Y*(MW_air-MW_fluid) + MW_fluid)
+            for field in fields:
+                if field == 'x':
+                    value = x_cl[ii] + rr*np.sin(theta[ii])
+                elif field == 'y':
+                    value = y_cl[ii] - rr*np.cos(theta[ii])
+                elif field == 'X':
+                    value = Y*MW/MW_fluid
+                elif field == 'Y':
+                    value = Y
+                elif field == 'v':
+                    value = V_cl[ii]*np.exp(-(rr**2)/(B[ii]**2))
+                elif field == 'T':
+                    value = Pamb*MW/(const.R*rho)
+                elif field == 'rho':
+                    value = rho
+                else:
+                    value = MW
+                chunk[field] = value.astype(dtype, copy=False)
+            yield chunk
+
+    def sample_fields(self, fields=('x', 'y', 'X', 'Y', 'v', 'T'), nS=None, nr=50,
+                      dtype=np.float64, bbox=None, chunk_size=256):
+        """
+        Samples plume fields over the (S, r) plane, assembling the chunks from `iter_fields`.
+
+        Parameters are the same as for `iter_fields`.
+
+        Returns
+        -------
+        data : dict
+            'S' (1D array of streamline distances) and the requested fields as
+            2D arrays of shape (len(S), 2*nr + 1); arrays are empty if no part of
+            the plume is within bbox
+        """
+        chunks = list(self.iter_fields(fields, nS, nr, dtype, bbox, chunk_size))
+        keys = ['S'] + list(fields)
+        if not chunks:
+            return {key: np.empty((0,) if key == 'S' else (0, 2*nr + 1), dtype=dtype) for key in keys}
+        return {key: np.concatenate([chunk[key] for chunk in chunks]) for key in keys}
+
     @property
     def _contourdata(self):
         """
@@ -624,33 +814,7 @@ class Jet:
         T : ndarray
             temperatures
         """
-        iS = np.arange(len(self.S))
-        
-        # Calculates logspaced points around 0 out to np.log10(3*np.max(self.B))
-        # poshalf[::-1] just notation for reversing a numpy array
-        poshalf = np.logspace(-5, np.log10(3*np.max(self.B)))
-        r = np.concatenate((-1.0 * poshalf[::-1], [0], poshalf))
-        
-        r, iS = np.meshgrid(r, iS)
-        B = self.B[iS]
-        rho_cl = self.rho_cl[iS]
-        Y_cl = self.Y_cl[iS]
-        V_cl = self.V_cl[iS]                    
-        
-        rho_amb, Tamb, Pamb = self.ambient.rho, self.ambient.T, self.ambient.P
-        MW_fluid, MW_air = self.fluid.therm.MW, self.ambient.therm.MW
-        
-        rho = rho_amb + (rho_cl - rho_amb)*np.exp(-r**2/self.lam**2/B**2)
-        Y   = Y_cl*rho_cl*np.exp(-(r**2)/((self.lam*B)**2))/rho
-        MW  = MW_air*MW_fluid/(Y*(MW_air-MW_fluid) + MW_fluid)
-        
-        X = Y*MW/MW_fluid
-        v = V_cl*np.exp(-(r**2)/(B**2))
-        T = Pamb*MW/(const.R*rho)
-        
-        x = self.x[iS] + r*np.sin(self.theta[iS])
-        y = self.y[iS] - r*np.cos(self.theta[iS])
-        return x, y, X, Y, v, T
+        return self.get_contour_data()
     
     def _radial_profile(self, distance, ind_var = 'Y', nB = 3):
         '''
@@ -668,10 +832,7 @@ class Jet:
         -------
         [r, ind_var]: radial profile of independent variable from -nB*B to nB*B
         '''
-        B = np.interp(distance, self.S, self.B)
-        rho_cl = np.interp(distance, self.S, self.rho_cl)
-        Y_cl = np.interp(distance, self.S, self.Y_cl)
-        V_cl = np.interp(distance, self.S, self.V_cl)
+        B, rho_cl, Y_cl, V_cl = self.streamline_index.interp_many(distance, ['B', 'rho_cl', 'Y_cl', 'V_cl'])
 
         r = np.logspace(-5, np.log10(nB*B))
         r = np.concatenate((-1*r[::-1], [0], r))
@@ -695,8 +856,17 @@ class Jet:
         if ind_var == 'T':
             return [r, T]
 
-    def get_contour_data(self):
-        return self._contourdata
+    def get_contour_data(self, nS=None, nr=50, dtype=np.float64, bbox=None):
+        """
+        Returns positions, mole and mass fractions, velocities and temperatures
+        over the plume (see `sample_fields` for a description of the parameters)
+
+        Returns
+        -------
+        x, y, X, Y, v, T : ndarrays
+        """
+        data = self.sample_fields(('x', 'y', 'X', 'Y', 'v', 'T'), nS, nr, dtype, bbox)
+        return data['x'], data['y'], data['X'], data['Y'], data['v'], data['T']
 
     def plot_moleFrac_Contour(self, mark=None, mcolors = 'w', xlims = None,
                               ylims = None, xlab = 'x (m)', ylab = 'y (m)', 
@@ -748,7 +918,8 @@ class Jet:
         ax.set_facecolor(plt.cm.get_cmap()(0)) #old matplotlib: ax.set_axis_bgcolor
         
         # Get contour data to plot
-        x, y, X, __, __, __ = self._contourdata
+        data = self.sample_fields(('x', 'y', 'X'))
+        x, y, X = data['x'], data['y'], data['X']
         
         # Plot contour data
         if np.amax(X) > vmax and np.amin(X) < vmin:
@@ -851,7 +1022,8 @@ class Jet:
             plt.subplots_adjust(**subplots_params)
 
         ax.set_facecolor(plt.cm.get_cmap()(0))
-        x, y, __, Y, __, __ = self._contourdata
+        data = self.sample_fields(('x', 'y', 'Y'))
+        x, y, Y = data['x'], data['y'], data['Y']
         cp = ax.contourf(x, y, Y, levels, vmin = vmin, vmax = vmax)
         if mark is not None:
             ax.contour(x, y, Y, levels = mark, colors = mcolors, linewidths = 1.5)
@@ -914,7 +1086,8 @@ class Jet:
             fig, ax = plt.subplots(**fig_params)
             plt.subplots_adjust(**subplots_params)
         ax.set_facecolor(plt.cm.get_cmap()(0))
-        x, y, __, __, v, __ = self._contourdata
+        data = self.sample_fields(('x', 'y', 'v'))
+        x, y, v = data['x'], data['y'], data['v']
         cp = ax.contourf(x, y, v, levels, **kwargs)
         if mark is not None:
             cp2 = ax.contour(x, y, v, levels = mark, colors = mcolors, lw = 1.5, **kwargs)
@@ -933,18 +1106,345 @@ class Jet:
             ax.set_aspect(aspect)
         return plt.gcf()
     
+    def concentration_at(self, x, y, z = 0, chunk_size = 1000000):
+        '''
+        returns the mole fraction at arbitrary locations
+
+        Each point is projected onto the centerline segments on either side of the nearest
+        centerline node (found with a KD-tree), and the Gaussian profile is evaluated at that
+        streamline distance, at a radius combining the in-plane distance and z.
+
+        Parameters
+        ----------
+        x, y, z : float or ndarray
+            coordinates of the points (m), broadcast against each other; the jet is in the
+            x-y plane, z is the horizontal distance out of that plane
+        chunk_size : int, optional
+            number of points to evaluate at a time, limiting temporary memory
+
+        Returns
+        -------
+        mole fraction at each point, same shape as the broadcast coordinates
+        (0 for points that project beyond either end of the jet)
+        '''
+        x, y, z = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float),
+                                      np.asarray(z, dtype=float))
+        shape = x.shape
+        points = np.column_stack([x.ravel(), y.ravel()])
+        z = z.ravel()
+        X = np.zeros(len(points))
+
+        index = self.streamline_index
+        nodes = np.column_stack([self.x, self.y])
+        S = self.S
+        num_segments = len(S) - 1
+        rho_amb = self.ambient.rho
+        MW_fluid, MW_air = self.fluid.therm.MW, self.ambient.therm.MW
+        for start in range(0, len(points), chunk_size):
+            p = points[start:start + chunk_size]
+            _, i = index.nearest_node(p)
+            dist2 = np.full(len(p), np.inf)
+            S_p = np.zeros(len(p))
+            outside = np.zeros(len(p), dtype=bool)
+            for i0 in [np.clip(i - 1, 0, num_segments - 1), np.clip(i, 0, num_segments - 1)]:
+                a, ab = nodes[i0], nodes[i0 + 1] - nodes[i0]
+                length2 = np.sum(ab**2, axis = 1)
+                t = np.divide(np.sum((p - a)*ab, axis = 1), length2,
+                              out = np.zeros(len(p)), where = length2 > 0)
+                t_seg = np.clip(t, 0, 1)
+                d2 = np.sum((p - a - t_seg[:, None]*ab)**2, axis = 1)
+                closer = d2 < dist2
+                dist2[closer] = d2[closer]
+                S_p[closer] = (S[i0] + t_seg*(S[i0 + 1] - S[i0]))[closer]
+                outside[closer] = (((i0 == 0) & (t < 0)) | ((i0 == num_segments - 1) & (t > 1)))[closer]
+            B, rho_cl, Y_cl = index.interp_many(S_p, ['B', 'rho_cl', 'Y_cl'])
+            r2 = dist2 + z[start:start + chunk_size]**2
+            rho = rho_amb + (rho_cl - rho_amb)*np.exp(-r2/self.lam**2/B**2)
+            Y = Y_cl*rho_cl*np.exp(-r2/((self.lam*B)**2))/rho
+            MW = MW_air*MW_fluid/(Y*(MW_air-MW_fluid) + MW_fluid)
+            X[start:start + chunk_size] = np.where(outside, 0, Y*MW/MW_fluid)
+        return X.reshape(shape)
+
+    def _radius_to_mole_fraction(self, X):
+        '''
+        radius (m) at which the mole fraction equals each of X at every node, from the
+        closed-form inversion of the Gaussian profile (0 where the centerline is leaner)
+
+        Returns
+        -------
+        ndarray of shape (len(X), len(self.S))
+        '''
+        X = np.atleast_1d(np.asarray(X, dtype=float))[:, None]
+        MW_fluid, MW_air = self.fluid.therm.MW, self.ambient.therm.MW
+        Yt = X*MW_fluid/(X*MW_fluid + (1 - X)*MW_air)
+        rho_amb = self.ambient.rho
+        # Y(r) = Yt where exp(-r**2/(lam*B)**2) = Yt*rho_amb/(Y_cl*rho_cl - Yt*(rho_cl - rho_amb))
+        denominator = self.Y_cl*self.rho_cl - Yt*(self.rho_cl - rho_amb)
+        inside = (self.Y_cl > Yt) & (denominator > 0)
+        e = np.divide(Yt*rho_amb, denominator, out = np.ones(inside.shape), where = inside)
+        return self.lam*self.B*np.sqrt(-np.log(np.clip(e, 0, 1)))
+
+    def concentration_envelope(self, mole_fractions):
+        '''
+        returns the iso-concentration envelopes of the plume, found analytically from the
+        Gaussian profile at each node, without any contouring
+
+        Parameters
+        ----------
+        mole_fractions : float or list of floats
+            mole fractions of the envelopes (e.g., the LFL and UFL)
+
+        Returns
+        -------
+        envelopes : list of dict, one for each mole fraction, each containing
+            mole_fraction : float
+            vertices : ndarray
+                (n, 2) array of x, y polygon vertices (m) in the plane of the jet,
+                from the start of the jet out one side to the tip and back along the other side
+            x_extent : tuple
+                (minimum, maximum) horizontal position (m) of the envelope
+            y_extent : tuple
+                (minimum, maximum) vertical position (m) of the envelope
+            streamline_distance : float
+                streamline distance (m) to the tip of the envelope
+            volume : float
+                volume (m^3) within the envelope (assuming an axisymmetric plume)
+        '''
+        mole_fractions = np.atleast_1d(np.asarray(mole_fractions, dtype=float))
+        radii = self._radius_to_mole_fraction(mole_fractions)
+        S_tips = np.atleast_1d(self.streamline_index.interp(mole_fractions, xp='X_cl', fp='S'))
+        sin, cos = np.sin(self.theta), np.cos(self.theta)
+        envelopes = []
+        for X, r, S_tip in zip(mole_fractions, radii, S_tips):
+            # the envelope continues from the first node to the first node where the centerline is leaner
+            n = len(r) if np.all(r > 0) else np.argmax(r <= 0)
+            if n == 0:
+                envelopes.append({'mole_fraction': X, 'vertices': np.empty((0, 2)),
+                                  'x_extent': (np.nan, np.nan), 'y_extent': (np.nan, np.nan),
+                                  'streamline_distance': 0., 'volume': 0.})
+                continue
+            S = self.S[:n]
+            x, y, r = self.x[:n], self.y[:n], r[:n]
+            side1 = np.column_stack([x + r*sin[:n], y - r*cos[:n]])
+            side2 = np.column_stack([x - r*sin[:n], y + r*cos[:n]])
+            if n < len(self.S):
+                tip = np.column_stack(self.streamline_index.interp_many(S_tip, ['x', 'y']))
+                S, r = np.append(S, S_tip), np.append(r, 0)
+            else:
+                tip = np.empty((0, 2))
+                S_tip = self.S[-1]
+            vertices = np.concatenate([side1, tip, side2[::-1]])
+            envelopes.append({'mole_fraction': X, 'vertices': vertices,
+                              'x_extent': (vertices[:, 0].min(), vertices[:, 0].max()),
+                              'y_extent': (vertices[:, 1].min(), vertices[:, 1].max()),
+                              'streamline_distance': S_tip,
+                              'volume': integrate.trapz(const.pi*r**2, S)})
+        return envelopes
+
     def streamline_distance_to_mole_fraction(self, X = 0.08):
         '''
         returns the streamline distance to a given mole fraction
         
         Parameters
         ----------
-        X: float
-          mole fraction
+        X: float or ndarray
+          mole fraction(s)
 
         Returns
         -------
         streamline distance to X_cl = X
         '''
-        return np.interp(X, self.X_cl[::-1], self.S[::-1])
+        return self.streamline_index.interp(X, xp='X_cl', fp='S')
+
+    def hazard_distances(self, mole_fractions):
+        '''
+        returns the centerline location and half-width at which the centerline
+        mole fraction falls to each of several levels
+
+        Parameters
+        ----------
+        mole_fractions : float or list of floats
+            centerline mole fractions
+
+        Returns
+        -------
+        ndarray of shape (len(mole_fractions), 4), where each row is
+        [streamline distance (m), x (m), y (m), half-width B (m)] at X_cl = mole fraction
+        (limited to the ends of the jet, as for streamline_distance_to_mole_fraction)
+        '''
+        S = self.streamline_distance_to_mole_fraction(np.atleast_1d(np.asarray(mole_fractions, dtype=float)))
+        return np.column_stack([S] + self.streamline_index.interp_many(S, ['x', 'y', 'B']))
     
+
+
+def hazard_distances(jets, mole_fractions):
+    '''
+    Centerline hazard distances for several jets and mole fractions at once
+
+    Parameters
+    ----------
+    jets : list of Jet objects
+        solved jets
+    mole_fractions : float or list of floats
+        centerline mole fractions
+
+    Returns
+    -------
+    ndarray of shape (len(jets), len(mole_fractions), 4), where the last axis is
+    [streamline distance (m), x (m), y (m), half-width B (m)] (see Jet.hazard_distances)
+    '''
+    num_levels = len(np.atleast_1d(mole_fractions))
+    if len(jets) == 0:
+        return np.empty((0, num_levels, 4))
+    return np.stack([jet.hazard_distances(mole_fractions) for jet in jets])
+
+
+class JetBatch:
+    def __init__(self, fluids, orifices, ambient, mdot=None,
+                 theta0=0, x0=0., y0=0.,
+                 lam=1.16, betaA=0.28,
+                 nn_conserve_momentum=True, nn_T='solve_energy',
+                 T_establish_min=-1,
+                 Ymin=7e-4, Smax=np.inf, max_steps=5000, tol=1e-8,
+                 alpha=0.082, Yamb=0., numB=5, numpts=500,
+                 suppressWarnings=False, verbose=False, jet_class=Jet):
+        '''
+        Solves several jets together, stacked into a single vectorized system of
+        ordinary differential equations (e.g., one jet for each leak size).
+
+        Each jet is integrated in its own normalized streamline coordinate,
+        s = (S - S0)/d, where d is the diameter of its expanded plug node, so that
+        jets of very different sizes share integrator steps efficiently. A jet stops
+        being integrated (and recorded) at the end of the first block of 500 diameters
+        at which its centerline mass fraction is below Ymin, as for a single Jet.  If Smax
+        is finite, s = (S - S0)/Smax instead, and all of the jets are integrated out to
+        a streamline length of Smax from their initial nodes.
+        Jets that are still being integrated if the stacked integration fails are
+        solved again on their own.
+
+        Parameters
+        ----------
+        fluids: fluid object or list of fluid objects
+            the fluid(s) being released
+        orifices: orifice object or list of orifice objects
+            the release(s)
+        ambient: fluid object
+            the fluid into which the releases occur
+        mdot, theta0, x0, y0: float or list of floats, optional
+            mass flow rate, release angle and starting location, as for Jet
+        Ymin, Smax, max_steps, tol, alpha, Yamb, numB, numpts: optional
+            integration parameters, as for Jet
+        jet_class: class, optional
+            Jet or a subclass of Jet (e.g., LayeringJet) of which the jets are created
+        The remaining parameters are as for Jet and apply to all jets.
+        Any list parameters must all be the same length, the number of jets.
+
+        Properties
+        ----------
+        jets : list of Jet objects
+            the solved jets, each identical in use to a Jet solved on its own
+        '''
+        self.verbose = verbose
+        per_jet = {'fluid': fluids, 'orifice': orifices, 'mdot': mdot,
+                   'theta0': theta0, 'x0': x0, 'y0': y0}
+        lengths = set(len(v) for v in per_jet.values() if isinstance(v, (list, tuple, np.ndarray)))
+        if len(lengths) > 1:
+            raise ValueError('All per-jet parameter lists must be the same length')
+        num_jets = lengths.pop() if lengths else 1
+        per_jet = {k: list(v) if isinstance(v, (list, tuple, np.ndarray)) else num_jets*[v]
+                   for k, v in per_jet.items()}
+
+        self.jets = []
+        for i in range(num_jets):
+            jet = jet_class.__new__(jet_class)
+            jet._setup(per_jet['fluid'][i], per_jet['orifice'][i], ambient, per_jet['mdot'][i],
+                       per_jet['theta0'][i], per_jet['x0'][i], per_jet['y0'][i], lam, betaA,
+                       nn_conserve_momentum, nn_T, T_establish_min, suppressWarnings, verbose)
+            self.jets.append(jet)
+
+        self.solve(Ymin, Smax, max_steps, tol, alpha, Yamb, numB, numpts)
+
+    def hazard_distances(self, mole_fractions):
+        '''
+        Centerline hazard distances for all of the jets (see hazard_distances)
+
+        Returns
+        -------
+        ndarray of shape (number of jets, len(mole_fractions), 4)
+        '''
+        return hazard_distances(self.jets, mole_fractions)
+
+    def solve(self, Ymin = 7e-4, Smax = np.inf, max_steps = 5000, tol = 1e-8,
+              alpha = 0.082, Yamb = 0., numB = 5, numpts = 500):
+        '''
+        solves (integrates) the model equations for all of the jets from their initial nodes out to Ymin
+        (or, if Smax is finite, out to a streamline length of Smax)
+        '''
+        if self.verbose:
+            print('integrating {} jets... '.format(len(self.jets)), end='')
+        jets = self.jets
+        num_jets = len(jets)
+        if num_jets == 0:
+            return self
+        # length scale of the normalized streamline coordinate of each jet
+        if Smax == np.inf:
+            self._length = np.array([jet.developing_flow.expanded_plug_node.d for jet in jets])
+        else:
+            self._length = np.full(num_jets, float(Smax))
+        self._params = {k: np.concatenate([jet._plume_params[k] for jet in jets]) for k in jets[0]._plume_params}
+        y0 = np.array([jet.initial_node.conditions for jet in jets])
+        self._active = y0[:, 3] > Ymin
+
+        r = integrate.ode(self._govEqns).set_f_params(alpha, Yamb, numB, numpts)
+        r.set_integrator('dopri5', atol = tol, rtol = tol)
+
+        T, Y = [], []
+        def solout(t, y):
+            T.append(t)
+            Y.append(np.array(y))
+        r.set_solout(solout)
+        r.set_initial_value(y0.ravel(), 0)
+
+        num_nodes = np.zeros(num_jets, dtype=int)
+        if Smax == np.inf:
+            i = 0
+            while r.successful() and np.any(self._active) and i < max_steps:
+                r.integrate(r.t + 500)
+                i += 1
+                done = self._active & (r.y.reshape(num_jets, 7)[:, 3] <= Ymin)
+                num_nodes[done] = len(T)
+                self._active[done] = False
+        elif np.any(self._active):
+            # as for a single Jet, integrate to Smax in one step, so max_steps does not apply
+            r.integrate(1)
+        failed = self._active & (not r.successful())
+        num_nodes[self._active] = len(T)
+
+        T = np.array(T)
+        Y = np.array(Y).reshape(len(T), num_jets, 7)
+        for k, jet in enumerate(jets):
+            if failed[k]:
+                jet.solve(Ymin = Ymin, Smax = Smax, max_steps = max_steps, tol = tol,
+                          alpha = alpha, Yamb = Yamb, numB = numB, numpts = numpts)
+            else:
+                n = num_nodes[k]
+                jet._set_solution(jet.initial_node.S + T[:n]*self._length[k], Y[:n, k, :])
+
+        if self.verbose:
+            print('done.')
+        return self
+
+    def _govEqns(self, s, ind_vars, alpha = 0.082, Yamb = 0., numB = 5, numpts = 500):
+        '''
+        Governing equations for all of the jets (see _plume_derivatives), written in terms of d/ds,
+        where s is the normalized streamline coordinate of each jet.
+        Jets that have finished integrating are held constant.
+        '''
+        num_jets = len(self.jets)
+        dz = np.zeros((num_jets, 7))
+        active = self._active
+        if np.any(active):
+            params = {k: v[active] for k, v in self._params.items()}
+            dz[active] = _plume_derivatives(ind_vars.reshape(num_jets, 7)[active], params,
+                                           alpha, Yamb, numB, numpts)
+        return (dz*self._length[:, None]).ravel()
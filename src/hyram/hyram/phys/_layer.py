@@ -83,7 +83,7 @@ class LayeringJet(Jet):
         H_vent  = H_layer - (enclosure.H - enclosure.ceiling_vent.H) # amount of layer height being exhausted by ceiling vent
         y_layer = enclosure.H - H_layer  # y-coordinate of bottom of flammable layer
 
-        B, v = np.interp(y_layer, self.y, self.B), np.interp(y_layer, self.y, self.V_cl)
+        B, v = self.streamline_index.interp_many(y_layer, ['B', 'V_cl'], xp='y')
 
         Qj      = const.pi * B**2 * v  # volumetric flow rate of jet into layer (m**3/s)
         Qs       = self.Q_jet # this is set in the IndoorRelease class - volumetric flow of jet into enclosure
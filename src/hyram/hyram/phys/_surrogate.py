@@ -0,0 +1,497 @@
+"""
+Copyright 2015-2022 National Technology & Engineering Solutions of Sandia, LLC (NTESS).
+Under the terms of Contract DE-NA0003525 with NTESS, the U.S. Government retains certain rights in this software.
+
+You should have received a copy of the GNU General Public License along with HyRAM+.
+If not, see https://www.gnu.org/licenses/.
+"""
+
+from __future__ import print_function, absolute_import, division
+
+import itertools
+
+import numpy as np
+
+from ._comps import Orifice
+from ._flame import Flame
+from ._jet import Jet, JetBatch
+
+
+class _Surrogate:
+    '''
+    Library of normalized centerline solutions, blended with inverse-distance weights in a
+    space of similarity parameters; common to JetSurrogate and FlameSurrogate
+
+    Subclasses supply the similarity parameters of a solution (_features, with the release
+    angle last), its normalized form (_normalize: a length parameter, and values sampled at
+    fixed fractions of the length with the fraction of the turn to vertical last) and the
+    streamline distances of the samples for a length parameter (_streamline).
+    '''
+    def __init__(self, solutions, power):
+        self.power = power
+        self.features = np.array([self._features(solution) for solution in solutions])
+        self._scale = np.ptp(self.features, axis=0)
+        self._scale[self._scale == 0] = 1
+        normalized = [self._normalize(solution) for solution in solutions]
+        self.lengths = np.array([n[0] for n in normalized])
+        self.library = np.array([n[1] for n in normalized])
+
+    def _weights(self, features, exclude=None):
+        dist = np.sqrt(np.sum(((self.features - features)/self._scale)**2, axis=1))
+        if exclude is not None:
+            dist[exclude] = np.inf
+        if np.any(dist == 0):
+            return (dist == 0)/np.sum(dist == 0)
+        w = dist**-self.power
+        return w/np.sum(w)
+
+    def _blended(self, weights):
+        '''
+        length parameter and library values blended with weights
+        '''
+        return np.sum(weights*self.lengths), np.tensordot(weights, self.library, axes=1)
+
+    @staticmethod
+    def _turn(theta0):
+        '''
+        inverse of the angle (rad) between the release direction and vertical (0 if vertical)
+        '''
+        turn = np.pi/2 - theta0
+        return 0 if abs(turn) < 1e-9 else 1/turn
+
+    def _blend(self, length, values, theta0):
+        '''
+        normalized solution from (blended) library values: the values other than the turn,
+        followed by the angle and trajectory, which is integrated from the deflection angle,
+        as blending positions directly is much less accurate
+        '''
+        s = self._streamline(length)
+        theta = theta0 + values[-1]*(np.pi/2 - theta0)
+        ds = np.diff(s)
+        x = np.append(0, np.cumsum(ds*(np.cos(theta[1:]) + np.cos(theta[:-1]))/2))
+        y = np.append(0, np.cumsum(ds*(np.sin(theta[1:]) + np.sin(theta[:-1]))/2))
+        return s, np.concatenate([values[:-1], [theta, x, y]])
+
+    @staticmethod
+    def _centerline_errors(predicted, reference):
+        '''
+        relative errors between two centerline solutions, each given as (S, x, y, B)
+        '''
+        S_p, x_p, y_p, B_p = predicted
+        S_r, x_r, y_r, B_r = reference
+        # compare the centerlines over the length of both solutions
+        overlap = S_r <= S_p[-1]
+        x, y, B = [np.interp(S_r[overlap], S_p, v) for v in [x_p, y_p, B_p]]
+        return {'trajectory': np.max(np.hypot(x - x_r[overlap], y - y_r[overlap]))/(S_r[-1] - S_r[0]),
+                'half_width': np.max(np.abs(B/B_r[overlap] - 1))}
+
+    def _validate(self, errors):
+        '''
+        Leave-one-out validation: predicts each library solution from the others
+
+        Parameters
+        ----------
+        errors : function
+            errors(i, predicted, reference) returns a dict of errors for library solution i,
+            given its prediction and its library values, each as (s, values) from _blend
+
+        Returns
+        -------
+        dict of the maximum absolute value of each error over the library
+        '''
+        results = []
+        for i in range(len(self.library)):
+            theta0 = self.features[i, -1]
+            predicted = self._blend(*self._blended(self._weights(self.features[i], exclude=i)), theta0)
+            reference = self._blend(self.lengths[i], self.library[i], theta0)
+            results.append(errors(i, predicted, reference))
+        return {key: np.max(np.abs([result[key] for result in results])) for key in results[0]}
+
+
+class JetSurrogate(_Surrogate):
+    '''
+    Screening-speed surrogate for the Jet model
+
+    A library of solved jets is stored in normalized (similarity) form: streamline distance and
+    half-width are normalized by the expanded (notional nozzle) diameter, velocity by the initial
+    centerline velocity, density by the ambient density and the angle is stored as the fraction
+    of the turn from the release angle towards vertical (the trajectory is integrated from the
+    angle).  Each normalized
+    solution is parametrized by eta = log(1 + s)/log(1 + s_end), where s is the normalized
+    streamline distance and s_end its value at the end of the jet (where Y_cl reaches Ymin).
+
+    A new jet is predicted by calculating its developing flow (orifice flow, notional nozzle and
+    flow establishment) exactly, then blending the library solutions with inverse-distance
+    weights in (log Froude number, log density ratio, release angle).
+    '''
+    def __init__(self, jets, num_eta=200, power=2, jet_kwargs=None):
+        '''
+        Parameters
+        ----------
+        jets : list of Jet objects
+            solved jets making up the library
+        num_eta : int, optional
+            number of points at which each normalized solution is stored
+        power : float, optional
+            exponent of the inverse-distance weighting
+        jet_kwargs : dict or None, optional
+            keyword arguments (e.g., lam, nn_conserve_momentum, nn_T) used to set up
+            predicted jets, which should match those used to solve the library jets
+        '''
+        if len(jets) < 2:
+            raise ValueError('JetSurrogate library must contain at least 2 jets')
+        self.jet_kwargs = {} if jet_kwargs is None else dict(jet_kwargs)
+        self.eta = np.linspace(0, 1, num_eta)
+        self._MW = np.array([[jet.fluid.therm.MW, jet.ambient.therm.MW] for jet in jets])
+        # lengths: log(1 + s_end) of each jet
+        # library: (jets, [V_cl, B, rho_cl, Y_cl, fraction of turn to vertical], eta)
+        super().__init__(jets, power)
+
+    @classmethod
+    def from_conditions(cls, fluids, diameters, ambient, angles=(0,), num_eta=200, power=2,
+                        Ymin=7e-4, **jet_kwargs):
+        '''
+        Builds a library from every combination of release fluid, orifice diameter and
+        release angle, solving the jets together (see JetBatch)
+
+        Parameters
+        ----------
+        fluids : list of fluid objects
+            release fluids (e.g., at several pressures and temperatures)
+        diameters : list of floats
+            orifice diameters (m)
+        ambient : fluid object
+            the fluid into which the releases occur
+        angles : list of floats, optional
+            release angles (rad, 0 is horizontal, pi/2 is vertical)
+        num_eta, power : optional
+            as for JetSurrogate
+        Ymin : float, optional
+            minimum mass fraction to integrate to
+        jet_kwargs : optional
+            other keyword arguments for the jets (e.g., lam, nn_conserve_momentum, nn_T)
+
+        Returns
+        -------
+        JetSurrogate object
+        '''
+        combinations = list(itertools.product(fluids, diameters, angles))
+        batch = JetBatch([c[0] for c in combinations], [Orifice(c[1]) for c in combinations], ambient,
+                         theta0=[c[2] for c in combinations], Ymin=Ymin, **jet_kwargs)
+        return cls(batch.jets, num_eta, power, jet_kwargs)
+
+    @staticmethod
+    def _features(jet):
+        '''
+        similarity parameters: log Froude number, log density ratio and release angle
+        '''
+        plug = jet.developing_flow.expanded_plug_node
+        return np.array([np.log(jet.Fr), np.log(plug.rho/jet.ambient.rho), jet.initial_node.theta])
+
+    def _normalize(self, jet):
+        d = jet.developing_flow.expanded_plug_node.d
+        node = jet.initial_node
+        s = (jet.S - node.S)/d
+        log_s_end = np.log1p(s[-1])
+        eta = np.log1p(s)/log_s_end
+        values = [jet.V_cl/node.v_cl, jet.B/d, jet.rho_cl/jet.ambient.rho, jet.Y_cl,
+                  self._turn(node.theta)*(jet.theta - node.theta)]
+        return log_s_end, np.array([np.interp(self.eta, eta, v) for v in values])
+
+    def _streamline(self, log_s_end):
+        return np.expm1(self.eta*log_s_end)
+
+    def _reconstruct(self, jet, weights):
+        d = jet.developing_flow.expanded_plug_node.d
+        node = jet.initial_node
+        s, (V_cl, B, rho_cl, Y_cl, theta, x, y) = self._blend(*self._blended(weights), node.theta)
+        jet._set_solution(node.S + s*d, np.array([V_cl*node.v_cl, B*d, rho_cl*jet.ambient.rho, Y_cl,
+                                                  theta, node.x + x*d, node.y + y*d]).T)
+        jet.surrogate_weights = weights
+        return jet
+
+    def predict(self, fluid, orifice, ambient, mdot=None, theta0=0, x0=0., y0=0.):
+        '''
+        Predicts a jet from the library
+
+        Parameters
+        ----------
+        fluid, orifice, ambient, mdot, theta0, x0, y0 :
+            as for Jet
+
+        Returns
+        -------
+        Jet object, with the centerline solution from the surrogate rather than integration
+        '''
+        kwargs = dict(lam=1.16, betaA=0.28, nn_conserve_momentum=True, nn_T='solve_energy',
+                      T_establish_min=-1, suppressWarnings=False, verbose=False)
+        kwargs.update({k: v for k, v in self.jet_kwargs.items() if k in kwargs})
+        jet = Jet.__new__(Jet)
+        jet._setup(fluid, orifice, ambient, mdot, theta0, x0, y0, kwargs['lam'], kwargs['betaA'],
+                   kwargs['nn_conserve_momentum'], kwargs['nn_T'], kwargs['T_establish_min'],
+                   kwargs['suppressWarnings'], kwargs['verbose'])
+        return self._reconstruct(jet, self._weights(self._features(jet)))
+
+    def _errors(self, predicted, reference, mass_fractions):
+        '''
+        relative errors between two centerline solutions, each given as (S, Y_cl, x, y, B)
+        '''
+        S_p, Y_p = predicted[:2]
+        S_r, Y_r = reference[:2]
+        errors = self._centerline_errors([S_p] + list(predicted[2:]), [S_r] + list(reference[2:]))
+        errors['streamline_distance'] = (np.interp(mass_fractions, Y_p[::-1], S_p[::-1])/
+                                         np.interp(mass_fractions, Y_r[::-1], S_r[::-1]) - 1)
+        return errors
+
+    def compare(self, surrogate_jet, jet, mole_fractions=(0.04, 0.08, 0.3)):
+        '''
+        Compares a surrogate prediction to a full solution of the same jet
+
+        Parameters
+        ----------
+        surrogate_jet : Jet object
+            jet predicted by the surrogate
+        jet : Jet object
+            fully solved jet
+        mole_fractions : list of floats, optional
+            centerline mole fractions at which to compare distances
+
+        Returns
+        -------
+        errors : dict
+            streamline_distance : ndarray
+                relative error in streamline distance to each mole fraction
+            trajectory : float
+                maximum distance between the predicted and solved centerlines
+                (where both exist), relative to the length of the solved jet
+            half_width : float
+                maximum relative error in half-width (where both solutions exist)
+        '''
+        MW_fluid, MW_air = jet.fluid.therm.MW, jet.ambient.therm.MW
+        X = np.asarray(mole_fractions, dtype=float)
+        mass_fractions = X*MW_fluid/(X*MW_fluid + (1 - X)*MW_air)
+        return self._errors([surrogate_jet.S, surrogate_jet.Y_cl, surrogate_jet.x, surrogate_jet.y, surrogate_jet.B],
+                            [jet.S, jet.Y_cl, jet.x, jet.y, jet.B], mass_fractions)
+
+    def validate(self, mole_fractions=(0.04, 0.08, 0.3)):
+        '''
+        Leave-one-out validation: predicts each library jet from the others
+
+        Parameters
+        ----------
+        mole_fractions : list of floats, optional
+            centerline mole fractions at which to compare distances
+
+        Returns
+        -------
+        errors : dict
+            streamline_distance, trajectory and half_width as for compare,
+            each the maximum absolute error over the library
+        '''
+        X = np.asarray(mole_fractions, dtype=float)
+        def errors(i, predicted, reference):
+            MW_fluid, MW_air = self._MW[i]
+            mass_fractions = X*MW_fluid/(X*MW_fluid + (1 - X)*MW_air)
+            # blended values are [V_cl, B, rho_cl, Y_cl, theta, x, y]
+            curves = [[s, values[3], values[5], values[6], values[1]] for s, values in [predicted, reference]]
+            return self._errors(*curves, mass_fractions)
+        return self._validate(errors)
+
+
+class FlameSurrogate(_Surrogate):
+    '''
+    Screening-speed surrogate for the Flame model, for one release species and ambient
+
+    The developing flow and the correlations (see Flame.length), which give the visible
+    length, radiant fraction and radiated power, are cheap and are calculated exactly for each
+    prediction; only the integration of the centerline is replaced.  A library of solved flames
+    is stored in normalized form: streamline distance from the initial node as a fraction of the
+    integrated length, velocity normalized by the initial centerline velocity, half-width by the
+    visible length, and the angle as the fraction of the turn from the release angle towards
+    vertical (the trajectory is integrated from the angle).
+
+    A new flame is predicted by blending the library solutions with inverse-distance weights in
+    (log flame Froude number, log density ratio of the expanded jet to ambient, release angle).
+    Flames outside the library (beyond the range of any of these, or with another species or
+    ambient) are solved in full instead.
+    '''
+    def __init__(self, flames, num_points=100, power=2, flame_kwargs=None):
+        '''
+        Parameters
+        ----------
+        flames : list of Flame objects
+            solved flames making up the library, with the same release species and ambient
+        num_points : int, optional
+            number of points at which each normalized solution is stored
+        power : float, optional
+            exponent of the inverse-distance weighting
+        flame_kwargs : dict or None, optional
+            keyword arguments (e.g., nn_conserve_momentum, nn_T, af) used to set up
+            predicted flames, which should match those used to solve the library flames
+        '''
+        if len(flames) < 2:
+            raise ValueError('FlameSurrogate library must contain at least 2 flames')
+        self.species, self.ambient = flames[0].fluid.species, flames[0].ambient
+        if not all(self._same_conditions(flame.fluid, flame.ambient) for flame in flames):
+            raise ValueError('FlameSurrogate library flames must have the same release species and ambient')
+        self.chem = flames[0].chem
+        self.flame_kwargs = {} if flame_kwargs is None else dict(flame_kwargs)
+        self.sigma = np.linspace(0, 1, num_points)
+        # lengths: integrated streamline length of each flame as a fraction of the visible length
+        # library: (flames, [V_cl, B, f_cl, fraction of turn to vertical], sigma)
+        super().__init__(flames, power)
+        self._bounds = np.array([self.features.min(axis=0), self.features.max(axis=0)])
+
+    @classmethod
+    def from_conditions(cls, fluids, diameters, ambient, angles=(0,), num_points=100, power=2,
+                        **flame_kwargs):
+        '''
+        Builds a library from every combination of release fluid, orifice diameter and
+        release angle, sharing one chemistry
+
+        Parameters
+        ----------
+        fluids : list of fluid objects
+            release fluids (e.g., at several pressures and temperatures), of one species
+        diameters : list of floats
+            orifice diameters (m)
+        ambient : fluid object
+            the fluid into which the releases occur
+        angles : list of floats, optional
+            release angles (rad, 0 is horizontal, pi/2 is vertical)
+        num_points, power : optional
+            as for FlameSurrogate
+        flame_kwargs : optional
+            other keyword arguments for the flames (e.g., nn_conserve_momentum, nn_T, af)
+
+        Returns
+        -------
+        FlameSurrogate object
+        '''
+        flames, chem = [], None
+        for fluid, diameter, angle in itertools.product(fluids, diameters, angles):
+            flame = Flame(fluid, Orifice(diameter), ambient, theta0=angle, chem=chem, **flame_kwargs)
+            chem = flame.chem
+            flames.append(flame)
+        return cls(flames, num_points, power, flame_kwargs)
+
+    def _same_conditions(self, fluid, ambient):
+        return (fluid.species == self.species and ambient.species == self.ambient.species and
+                np.isclose(ambient.T, self.ambient.T, rtol=1e-9) and np.isclose(ambient.P, self.ambient.P, rtol=1e-9))
+
+    @staticmethod
+    def _features(flame):
+        '''
+        similarity parameters: log flame Froude number, log density ratio and release angle
+        '''
+        flame.length()
+        plug = flame.developing_flow.fluid_exp
+        return np.array([np.log(flame.Frf), np.log(plug.rho/flame.ambient.rho), flame.initial_node.theta])
+
+    def _normalize(self, flame):
+        node = flame.initial_node
+        length = flame.S[-1] - node.S
+        sigma = (flame.S - node.S)/length
+        values = [flame.V_cl/node.v_cl, flame.B/flame.Lvis, flame.f_cl,
+                  self._turn(node.theta)*(flame.theta - node.theta)]
+        return length/flame.Lvis, np.array([np.interp(self.sigma, sigma, v) for v in values])
+
+    def in_domain(self, features):
+        '''
+        whether similarity parameters (see _features) are within the range of the library
+        '''
+        tol = 1e-9*np.maximum(1, np.abs(self._bounds))
+        return bool(np.all((features >= self._bounds[0] - tol[0]) & (features <= self._bounds[1] + tol[1])))
+
+    def _streamline(self, length_fraction):
+        return self.sigma*length_fraction
+
+    def _reconstruct(self, flame, weights):
+        node, Lvis = flame.initial_node, flame.Lvis
+        s, (V_cl, B, f_cl, theta, x, y) = self._blend(*self._blended(weights), node.theta)
+        flame.S = node.S + s*Lvis
+        flame.V_cl, flame.B, flame.theta, flame.f_cl = V_cl*node.v_cl, B*Lvis, theta, f_cl
+        flame.x, flame.y = node.x + x*Lvis, node.y + y*Lvis
+        flame.surrogate_weights = weights
+        return flame
+
+    def predict(self, fluid, orifice, ambient, mdot=None, theta0=0., x0=0., y0=0., fallback=True):
+        '''
+        Predicts a flame from the library
+
+        Parameters
+        ----------
+        fluid, orifice, ambient, mdot, theta0, x0, y0 :
+            as for Flame
+        fallback : bool, optional
+            whether to solve flames outside the library in full (default), otherwise
+            a ValueError is raised
+
+        Returns
+        -------
+        Flame object, with the centerline solution from the surrogate rather than integration,
+        and surrogate_weights set to the weights of the library flames (None if solved in full)
+        '''
+        kwargs = dict(self.flame_kwargs, mdot=mdot, theta0=theta0, x0=x0, y0=y0)
+        if self._same_conditions(fluid, ambient):
+            flame = Flame._unsolved(fluid, orifice, ambient, chem=self.chem, **kwargs)
+            features = self._features(flame)
+            if self.in_domain(features):
+                return self._reconstruct(flame, self._weights(features))
+        if not fallback:
+            raise ValueError('Flame is outside of the FlameSurrogate library')
+        flame = Flame(fluid, orifice, ambient, chem=self.chem if self._same_conditions(fluid, ambient) else None,
+                      **kwargs)
+        flame.surrogate_weights = None
+        return flame
+
+    def compare(self, surrogate_flame, flame, RH=0.89, observers=None):
+        '''
+        Compares a surrogate prediction to a full solution of the same flame
+
+        Parameters
+        ----------
+        surrogate_flame : Flame object
+            flame predicted by the surrogate
+        flame : Flame object
+            fully solved flame
+        RH : float, optional
+            relative humidity for the heat flux
+        observers : tuple of (x, y, z) or None, optional
+            observer coordinates (m) at which to compare heat flux, default is None: points
+            half of the visible length to the side of the solved centerline, at a quarter,
+            half, three quarters and all of the visible length
+
+        Returns
+        -------
+        errors : dict
+            trajectory : float
+                maximum distance between the predicted and solved centerlines
+                (where both exist), relative to the length of the solved flame
+            half_width : float
+                maximum relative error in half-width (where both solutions exist)
+            heat_flux : ndarray
+                relative error in heat flux at each observer
+        '''
+        if observers is None:
+            S = flame.S[0] + np.array([0.25, 0.5, 0.75, 1])*(flame.S[-1] - flame.S[0])
+            observers = (np.interp(S, flame.S, flame.x), np.interp(S, flame.S, flame.y), 0.5*flame.Lvis)
+        errors = self._centerline_errors([surrogate_flame.S, surrogate_flame.x, surrogate_flame.y, surrogate_flame.B],
+                                         [flame.S, flame.x, flame.y, flame.B])
+        errors['heat_flux'] = surrogate_flame.Qrad_multi(*observers, RH)/flame.Qrad_multi(*observers, RH) - 1
+        return errors
+
+    def validate(self):
+        '''
+        Leave-one-out validation: predicts each library flame from the others
+
+        Returns
+        -------
+        errors : dict
+            trajectory and half_width as for compare, each the maximum error over the library
+        '''
+        def errors(i, predicted, reference):
+            # blended values are [V_cl, B, f_cl, theta, x, y]
+            curves = [[s, values[4], values[5], values[1]] for s, values in [predicted, reference]]
+            return self._centerline_errors(*curves)
+        return self._validate(errors)
@@ -424,6 +424,10 @@ class Combustion:
                                                           np.gradient(MWvals[ifstoich:], fvals[ifstoich:])) - 
                                                           np.append(np.gradient(T[:ifstoich], fvals[:ifstoich]),
                                                           np.gradient(T[ifstoich:], fvals[ifstoich:]))/T*MWvals))
+        # tables for fast lookups of product density and its derivative (see rho_and_drhodf);
+        # T and 1/MW of the products are both piecewise linear in f, with a node at stoichiometric
+        self._f_table = fvals
+        self._prod_table = np.array([T, 1/MWvals, self.drhodf.y])
 
         
         self.X_reac_stoich = self._Yreac(self.fstoich)[self.reac]*self._MWmix(self._Yreac(self.fstoich))/self.MW[self.reac]
@@ -434,6 +438,26 @@ class Combustion:
         if verbose:
             print('done.')
 
+    def rho_and_drhodf(self, f):
+        '''
+        density of products (kg/m^3) and its derivative with respect to mixture fraction,
+        looked up in tables built at initialization (same values as rho_prod and drhodf)
+
+        Parameters
+        ----------
+        f : float or ndarray
+            mixture fraction (0-1)
+
+        Returns
+        -------
+        rho : float or ndarray
+            density of products (kg/m^3)
+        drhodf : float or ndarray
+            derivative of the density of products with respect to mixture fraction (kg/m^3)
+        '''
+        T, invMW, drhodf = [np.interp(f, self._f_table, values) for values in self._prod_table]
+        return self.P/(const.R*T*invMW), drhodf
+
     def reinitilize(self, fluid, numpoints = 100):
         '''
         Reinitilizes class to new temperature, pressure, etc.  Can be used rather 
@@ -26,6 +26,7 @@ class Generic_overpressure_method:
     unconfined overpressure sub-classes
     """
     data_dir = os.path.join(os.path.dirname(__file__), 'data')
+    max_distance = 500  # m, furthest x-location searched for a given overpressure
 
     def __init__(self, jet_object, heat_of_combustion=None, flammability_limits=None, origin_at_orifice=False):
         self.jet_object = jet_object
@@ -69,121 +70,168 @@ class Generic_overpressure_method:
         if origin_at_orifice:
             self.origin = (0.0, 0.0, 0.0)
         else:
-            # Overpressure-origin is the point at which the concentration
-            # is mid-way between the lower and upper flamability limits
+            # stored on the jet, and shared by all of the methods using the same flammability limits
             LFL = self.molar_lower_flammability_limit
             UFL = self.molar_upper_flammability_limit
-            mid_flammability = LFL + (UFL - LFL) / 2
+            self.origin = self.jet_object._cached('overpressure_origin', (LFL, UFL), self.calc_overpressure_origin)
 
-            # Get jet streamline coordinate based on centerline concentration
-            s_coord = np.interp(mid_flammability,
-                                self.jet_object.X_cl[::-1],
-                                self.jet_object.S[::-1])
+    def calc_overpressure_origin(self):
+        # Overpressure-origin is the point at which the concentration
+        # is mid-way between the lower and upper flamability limits
+        LFL = self.molar_lower_flammability_limit
+        UFL = self.molar_upper_flammability_limit
+        mid_flammability = LFL + (UFL - LFL) / 2
 
-            # Get x and y coordinates from jet based on streamline coordinate
-            jet_x = np.interp(s_coord, self.jet_object.S, self.jet_object.x)
-            jet_y = np.interp(s_coord, self.jet_object.S, self.jet_object.y)
+        # Get jet streamline coordinate based on centerline concentration
+        streamline_index = self.jet_object.streamline_index
+        s_coord = streamline_index.interp(mid_flammability, xp='X_cl', fp='S')
 
-            self.origin = (jet_x, jet_y, 0.0)
+        # Get x and y coordinates from jet based on streamline coordinate
+        jet_x, jet_y = streamline_index.interp_many(s_coord, ['x', 'y'])
+
+        return (jet_x, jet_y, 0.0)
 
     @staticmethod
     def calc_distance(locations:list, origin) -> list:
         '''
-        locations : list of locations
+        locations : list of locations or array
             List of locations of interest,
             each location is a tuple of 3 coordinates (in meters):
-            [(x1, y1, z1), (x2, y2, z2), ...]
+            [(x1, y1, z1), (x2, y2, z2), ...],
+            or array of locations of shape (..., 3)
         origin : tuple or list
             origin location (x, y, z) of the overpressure event, in meters
         '''
         locations = np.array(locations)
         origin = np.array(origin)
         if len(locations) > 0:
-            distance = np.linalg.norm(locations - origin, axis=1)
+            distance = np.linalg.norm(locations - origin, axis=-1)
         else:
             distance = []
         return distance
 
-    def calc_overpressure(self, locations:list) -> list:
+    def calc_overpressure(self, locations:list, chunk_size=100000) -> list:
         """
         Calculate overpressure
 
         Parameters
         ----------
-        locations : list of locations
+        locations : list of locations or array
             List of locations at which to determine overpressure,
             each location is a tuple of 3 coordinates (in meters):
-            [(x1, y1, z1), (x2, y2, z2), ...]
+            [(x1, y1, z1), (x2, y2, z2), ...],
+            or array of locations of shape (..., 3)
+        chunk_size : int, optional
+            Maximum number of locations evaluated at once
 
         Returns
         -------
-        overpressure, float
-            Overpressure in Pa
+        overpressure, ndarray
+            Overpressure in Pa, of shape (...) for locations of shape (..., 3)
         """
-        distance = self.calc_distance(locations=locations, origin=self.origin)
-        scaled_distance = self.calc_scaled_distance(distance=distance)
+        return self._evaluate(locations, [self._overpressure_at_scaled_distance], chunk_size)[0]
+
+    def calc_overpressure_and_impulse(self, locations:list, chunk_size=100000):
+        """
+        Calculate overpressure and impulse, from one calculation of the distances
+
+        Parameters
+        ----------
+        locations : list of locations or array
+            List of locations at which to determine overpressure and impulse,
+            each location is a tuple of 3 coordinates (in meters):
+            [(x1, y1, z1), (x2, y2, z2), ...],
+            or array of locations of shape (..., 3)
+        chunk_size : int, optional
+            Maximum number of locations evaluated at once
+
+        Returns
+        -------
+        overpressure, ndarray
+            Overpressure in Pa, of shape (...) for locations of shape (..., 3)
+        impulse, ndarray
+            Impulse in Pa*s, the same shape as overpressure
+        """
+        return tuple(self._evaluate(locations, [self._overpressure_at_scaled_distance,
+                                                self._impulse_at_scaled_distance], chunk_size))
+
+    def _overpressure_at_scaled_distance(self, scaled_distance):
         scaled_overpressure = self.get_scaled_overpressure(scaled_distance=scaled_distance)
-        overpressure = self.calc_unscaled_overpressure(scaled_overpressure=scaled_overpressure)  # Pa
-        return overpressure
+        return self.calc_unscaled_overpressure(scaled_overpressure=scaled_overpressure)  # Pa
+
+    def _impulse_at_scaled_distance(self, scaled_distance):
+        scaled_impulse = self.get_scaled_impulse(scaled_distance=scaled_distance)
+        return self.calc_unscaled_impulse(scaled_impulse=scaled_impulse)  # Pa*s
+
+    def _evaluate(self, locations, functions, chunk_size):
+        '''
+        Evaluates each function of the scaled distance at the locations, chunk_size locations at a time
+        '''
+        locations = np.asarray(locations, dtype=float)
+        if locations.size == 0:
+            locations = locations.reshape(0, 3)
+        if locations.shape[-1] != 3:
+            raise ValueError('Locations must have 3 coordinates (x, y, z)')
+        flat_locations = locations.reshape(-1, 3)
+        results = [np.empty(len(flat_locations)) for _ in functions]
+        for start in range(0, len(flat_locations), chunk_size):
+            chunk = slice(start, start + chunk_size)
+            distance = self.calc_distance(locations=flat_locations[chunk], origin=self.origin)
+            scaled_distance = self.calc_scaled_distance(distance=distance)
+            for result, function in zip(results, functions):
+                result[chunk] = function(scaled_distance)
+        return [result.reshape(locations.shape[:-1]) for result in results]
 
     def calc_scaled_distance(self, distance):
         # Placeholder method; this will be over-written by each sub-class below
-        scaled_distance = np.empty(len(distance))
-        scaled_distance.fill(np.nan)
+        scaled_distance = np.full(np.shape(distance), np.nan)
         return scaled_distance
 
     def get_scaled_overpressure(self, scaled_distance):
         # Placeholder method; this will be over-written by each sub-class below
-        scaled_overpressure = np.empty(len(scaled_distance))
-        scaled_overpressure.fill(np.nan)
+        scaled_overpressure = np.full(np.shape(scaled_distance), np.nan)
         return scaled_overpressure
 
     def calc_unscaled_overpressure(self, scaled_overpressure):
         unscaled_overpressure = scaled_overpressure * self.ambient_pressure  # Pa
         return unscaled_overpressure
 
-    def calc_impulse(self, locations:list) -> list:
+    def calc_impulse(self, locations:list, chunk_size=100000) -> list:
         """
         Calculate impulse
 
         Parameters
         ----------
-        locations : list of locations
+        locations : list of locations or array
             List of locations at which to determine impulse,
             each location is a tuple of 3 coordinates (in meters):
-            [(x1, y1, z1), (x2, y2, z2), ...]
+            [(x1, y1, z1), (x2, y2, z2), ...],
+            or array of locations of shape (..., 3)
+        chunk_size : int, optional
+            Maximum number of locations evaluated at once
 
         Returns
         -------
-        impulse, float
-            Impulse in Pa*s
+        impulse, ndarray
+            Impulse in Pa*s, of shape (...) for locations of shape (..., 3)
         """
-        distance = self.calc_distance(locations=locations, origin=self.origin)
-        scaled_distance = self.calc_scaled_distance(distance=distance)
-        scaled_impulse = self.get_scaled_impulse(scaled_distance=scaled_distance)
-        impulse = self.calc_unscaled_impulse(scaled_impulse=scaled_impulse)
-        return impulse
+        return self._evaluate(locations, [self._impulse_at_scaled_distance], chunk_size)[0]
 
     def get_scaled_impulse(self, scaled_distance):
         # Placeholder method; this will be over-written by each sub-class below
-        scaled_impulse = np.empty(len(scaled_distance))
-        scaled_impulse.fill(np.nan)
+        scaled_impulse = np.full(np.shape(scaled_distance), np.nan)
         return scaled_impulse
 
     def calc_unscaled_impulse(self, scaled_impulse):
         # Placeholder method; this will be over-written by each sub-class below
-        unscaled_impulse = np.empty(len(scaled_impulse))
-        unscaled_impulse.fill(np.nan)
+        unscaled_impulse = np.full(np.shape(scaled_impulse), np.nan)
         return unscaled_impulse
 
     def calculate_overpressure_for_list_of_locations(self, x:np.array, y:np.array, z:np.array) -> np.array:
-        evaluation_locations = []
-        x_y_shape = x.shape
-        for x_value, y_value, z_location in zip(x.reshape(-1), y.reshape(-1), z.reshape(-1)):
-            evaluation_locations += [np.array([x_value, y_value, z_location])]
-        overpressures = self.calc_overpressure(evaluation_locations)
-        overpressures = overpressures.reshape(x_y_shape)
-        return overpressures
+        '''
+        Overpressure (Pa) at the locations given by broadcasting the x, y, and z coordinates (m) together
+        '''
+        return self.calc_overpressure(np.stack(np.broadcast_arrays(x, y, z), axis=-1))
 
     def calc_distance_to_overpressure(self, overpressure):
         """
@@ -209,14 +257,26 @@ class Generic_overpressure_method:
         return scaled_overpressure
 
     def get_scaled_distance_from_scaled_overpressure(self, scaled_overpressure):
-        # Solver by interpolation; may be re-written by sub-classes below
-        maxguess = 500
-        xvals = np.linspace(maxguess, self.origin[0], 10000)
-        overpressures = self.calculate_overpressure_for_list_of_locations(xvals,
-                                                                          self.origin[1]*np.ones_like(xvals),
-                                                                          self.origin[2]*np.ones_like(xvals))
-        scaled_overpressures = self.calc_scaled_overpressure(overpressures)
-        distance = np.interp(scaled_overpressure, scaled_overpressures, xvals)
+        # Solver by bisection in the x-direction between the origin and max_distance, for all overpressures
+        # at once; may be re-written by sub-classes below
+        max_bisections = 50  # interval of (max_distance - origin)/2**50 m
+        tolerance = 1e-9  # m, stops bisecting once all intervals are smaller
+        scaled_overpressure = np.asarray(scaled_overpressure, dtype=float)
+        lower = np.full(scaled_overpressure.size, float(self.origin[0]))
+        upper = np.full(scaled_overpressure.size, float(self.max_distance))
+        locations = np.tile(np.asarray(self.origin, dtype=float), (scaled_overpressure.size, 1))
+        for _ in range(max_bisections):
+            if np.all(upper - lower < tolerance):
+                break
+            middle = (lower + upper) / 2
+            locations[:, 0] = middle
+            with np.errstate(divide='ignore'):
+                above = self.calc_scaled_overpressure(self.calc_overpressure(locations)) > scaled_overpressure.ravel()
+            lower = np.where(above, middle, lower)
+            upper = np.where(above, upper, middle)
+        distance = ((lower + upper) / 2).reshape(scaled_overpressure.shape)
+        if distance.ndim == 0:
+            return float(distance)
         return distance
 
     def calc_unscaled_distance(self, scaled_distance):
@@ -321,7 +381,6 @@ class Generic_overpressure_method:
             dz = (zlims[1] - zlims[0]) / nz
             z0 = slice(zlims[0], zlims[1], dz)
 
-        x, y, z = np.mgrid[x0, y0, z0]
         x_z, y_z = np.mgrid[x0, y0]
         x_y, z_y = np.mgrid[x0, z0]
         y_x, z_x = np.mgrid[y0, z0]
@@ -348,9 +407,9 @@ class Generic_overpressure_method:
         ax_cb = grid[3].cax
         ax_cb.set_visible(True)
 
-        fxy = self.calculate_overpressure_for_list_of_locations(x_z, y_z, overpressure_center[2] * np.ones_like(x_z))
-        fxz = self.calculate_overpressure_for_list_of_locations(x_y, overpressure_center[1] * np.ones_like(x_y), z_y)
-        fzy = self.calculate_overpressure_for_list_of_locations(overpressure_center[0] * np.ones_like(z_x), y_x, z_x)
+        fxy = self.calculate_overpressure_for_list_of_locations(x_z, y_z, overpressure_center[2])
+        fxz = self.calculate_overpressure_for_list_of_locations(x_y, overpressure_center[1], z_y)
+        fzy = self.calculate_overpressure_for_list_of_locations(overpressure_center[0], y_x, z_x)
 
         ClrMap = copy.copy(plt.cm.get_cmap('RdYlGn_r'))
         ClrMap.set_under('white')
@@ -436,6 +495,171 @@ class Generic_overpressure_method:
         return values_dict
 
 
+class BlastCurves:
+    """
+    Blast-wave curves from one data file, as read-only NumPy arrays shared by all
+    overpressure method instances
+
+    Each file is parsed once (see load) into one contiguous array per column,
+    with reversed views kept for the inverse (distance from overpressure or impulse) lookups.
+    Columns are accessed by name, as for the dictionary from read_blast_wave_csv.
+    """
+    _registry = {}
+
+    def __init__(self, columns):
+        """
+        Parameters
+        ----------
+        columns : dict
+            Each column header is a key, each column of values is a list or array of floats
+        """
+        self.columns = {}
+        for name, values in columns.items():
+            values = np.ascontiguousarray(values, dtype=float)
+            values.setflags(write=False)
+            self.columns[name] = values
+        self._reversed = {name: values[::-1] for name, values in self.columns.items()}
+        self._stacked = {}
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    def keys(self):
+        return self.columns.keys()
+
+    def reversed(self, name):
+        """
+        Column values in reverse order (a read-only view)
+        """
+        return self._reversed[name]
+
+    def stacked(self, x_names, y_names):
+        """
+        Several curves tabulated on the union of their abscissae, as 2-D arrays
+
+        On each interval of the union the curves are linear, so evaluating a value and slope
+        from the tables (see interp_curves) is the same as interpolating each curve on its own.
+
+        Parameters
+        ----------
+        x_names : list of strings
+            Column headers of the abscissae of each curve (non-decreasing values)
+        y_names : list of strings
+            Column headers of the ordinates of each curve
+
+        Returns
+        -------
+        grid : ndarray
+            Sorted union of the abscissae of all of the curves
+        values : ndarray
+            Value of each curve at each grid point, of shape (number of curves, len(grid)),
+            taken from the right where a curve has a step
+        slopes : ndarray
+            Slope of each curve on the interval starting at each grid point
+            (zero after the last grid point), the same shape as values
+        """
+        names = (tuple(x_names), tuple(y_names))
+        if names not in self._stacked:
+            grid = np.unique(np.concatenate([self.columns[name] for name in x_names]))
+            values = np.empty((len(x_names), len(grid)))
+            left_values = np.empty_like(values)
+            for i, (x_name, y_name) in enumerate(zip(x_names, y_names)):
+                xp, fp = self.columns[x_name], self.columns[y_name]
+                # np.interp takes the last of repeated abscissae, i.e. the value from the right
+                values[i] = np.interp(grid, xp, fp)
+                first = np.minimum(np.searchsorted(xp, grid, side='left'), len(xp) - 1)
+                left_values[i] = np.where(xp[first] == grid, fp[first], values[i])
+            slopes = np.zeros_like(values)
+            slopes[:, :-1] = (left_values[:, 1:] - values[:, :-1]) / np.diff(grid)
+            for array in (grid, values, slopes):
+                array.setflags(write=False)
+            self._stacked[names] = (grid, values, slopes)
+        return self._stacked[names]
+
+    def interp_curves(self, x, x_names, y_names):
+        """
+        Piecewise-linear interpolation (as np.interp) of several curves at the same points
+
+        A single search of the points in the tabulated curves (see stacked) gives
+        the intervals for all of the curves, so the interpolation is vectorized over
+        (curve, point) rather than repeated for each curve.
+
+        Parameters
+        ----------
+        x : array-like
+            Values at which to interpolate
+        x_names : list of strings
+            Column headers of the abscissae of each curve
+        y_names : list of strings
+            Column headers of the ordinates of each curve
+
+        Returns
+        -------
+        values : ndarray
+            Interpolated values, of shape (number of curves,) + np.shape(x)
+        """
+        grid, values, slopes = self.stacked(x_names, y_names)
+        x = np.clip(np.asarray(x, dtype=float), grid[0], grid[-1])
+        k = np.clip(np.searchsorted(grid, x, side='right') - 1, 0, len(grid) - 1)
+        return values[:, k] + slopes[:, k] * (x - grid[k])
+
+    @staticmethod
+    def _paths(filename, data_dir):
+        if data_dir is None:
+            data_dir = Generic_overpressure_method.data_dir
+        filepath = os.path.join(data_dir, filename)
+        return filepath, os.path.splitext(filepath)[0] + '.npz'
+
+    @classmethod
+    def load(cls, filename, data_dir=None):
+        """
+        Blast-wave curves from a csv file, parsed on the first call and shared afterwards
+
+        If a compiled .npz file (see compile) with the same name is present and no older
+        than the csv file, the curves are loaded from it instead of parsing the csv file.
+
+        Parameters
+        ----------
+        filename : string
+            Name of the csv file (e.g., 'BST_OverpressureCurves.csv')
+        data_dir : string or None
+            Directory of the file, default is None: the package data directory
+
+        Returns
+        -------
+        BlastCurves object
+        """
+        filepath, compiled_path = cls._paths(filename, data_dir)
+        curves = cls._registry.get(filepath)
+        if curves is None:
+            if (os.path.exists(compiled_path) and
+                    os.path.getmtime(compiled_path) >= os.path.getmtime(filepath)):
+                with np.load(compiled_path) as compiled:
+                    curves = cls({name: compiled[name] for name in compiled.files})
+            else:
+                curves = cls(Generic_overpressure_method.read_blast_wave_csv(filepath))
+            curves = cls._registry.setdefault(filepath, curves)
+        return curves
+
+    @classmethod
+    def compile(cls, filename, data_dir=None):
+        """
+        Writes the curves from a csv file to a .npz file next to it, which load then uses
+
+        Returns
+        -------
+        compiled_path : string
+            Full filepath of the .npz file
+        """
+        curves = cls.load(filename, data_dir)
+        compiled_path = cls._paths(filename, data_dir)[1]
+        np.savez(compiled_path, **curves.columns)
+        return compiled_path
+
+
 class BST_method(Generic_overpressure_method):
     """
     Vapor Cloud Explosions using BST Method
@@ -465,16 +689,15 @@ class BST_method(Generic_overpressure_method):
         John Wiley & Sons, Inc.,2010
     """
     speed_of_sound = 340  # m/s
+    mach_flame_speeds = (0.2, 0.35, 0.7, 1.0, 1.4, 2.0, 3.0, 4.0, 5.2)
 
     def __init__(self, jet_object, mach_flame_speed,
                  heat_of_combustion=None, flammability_limits=None, origin_at_orifice=False):
         Generic_overpressure_method.__init__(self, jet_object, heat_of_combustion,
                                              flammability_limits, origin_at_orifice)
         self.set_mach_flame_speed(mach_flame_speed)
-        overpressure_data_file = os.path.join(self.data_dir, 'BST_OverpressureCurves.csv')
-        self.scaled_peak_overpressure_data = self.read_blast_wave_csv(overpressure_data_file)
-        impulse_data_file = os.path.join(self.data_dir, 'BST_ImpulseCurves.csv')
-        self.all_scaled_impulse_data = self.read_blast_wave_csv(impulse_data_file)
+        self.scaled_peak_overpressure_data = BlastCurves.load('BST_OverpressureCurves.csv')
+        self.all_scaled_impulse_data = BlastCurves.load('BST_ImpulseCurves.csv')
         self.energy = self.calc_energy()
 
     def set_mach_flame_speed(self, mach_flame_speed):
@@ -518,12 +741,52 @@ class BST_method(Generic_overpressure_method):
         unscaled_impulse = scaled_impulse * self.energy ** (1/3) * self.ambient_pressure ** (2/3) / self.speed_of_sound # Pa*s
         return unscaled_impulse
 
+    def calc_all_curves(self, locations, mach_flame_speeds=None):
+        """
+        Calculate overpressure and impulse for several Mach flame speed curves at once
+
+        The distance to each location is calculated once, and the curves are
+        interpolated together (see BlastCurves.interp_curves).
+
+        Parameters
+        ----------
+        locations : list of locations
+            List of locations at which to determine overpressure and impulse,
+            each location is a tuple of 3 coordinates (in meters):
+            [(x1, y1, z1), (x2, y2, z2), ...]
+        mach_flame_speeds : list of floats or None
+            Mach flame speeds of the curves, from 0.2, 0.35, 0.7, 1.0, 1.4, 2.0, 3.0, 4.0, 5.2
+            Default is None: all curves
+
+        Returns
+        -------
+        overpressure : ndarray
+            Overpressure in Pa, of shape (number of Mach flame speeds, number of locations)
+        impulse : ndarray
+            Impulse in Pa*s, of shape (number of Mach flame speeds, number of locations)
+        """
+        if mach_flame_speeds is None:
+            mach_flame_speeds = self.mach_flame_speeds
+        suffixes = ['_Mf' + str(float(mach_flame_speed)) for mach_flame_speed in mach_flame_speeds]
+        for mach_flame_speed, suffix in zip(mach_flame_speeds, suffixes):
+            if 'scaled_distance' + suffix not in self.scaled_peak_overpressure_data:
+                raise ValueError(f'Invalid Mach flame speed: {mach_flame_speed}')
+        distance = np.asarray(self.calc_distance(locations=locations, origin=self.origin), dtype=float)
+        scaled_distance = self.calc_scaled_distance(distance=distance)
+
+        scaled_overpressure = self.scaled_peak_overpressure_data.interp_curves(
+            scaled_distance, ['scaled_distance' + s for s in suffixes], ['scaled_overpressure' + s for s in suffixes])
+        scaled_impulse = self.all_scaled_impulse_data.interp_curves(
+            scaled_distance, ['scaled_distance' + s for s in suffixes], ['scaled_impulse' + s for s in suffixes])
+        overpressure = self.calc_unscaled_overpressure(scaled_overpressure=scaled_overpressure)  # Pa
+        impulse = self.calc_unscaled_impulse(scaled_impulse=scaled_impulse)  # Pa*s
+        return overpressure, impulse
+
     def get_scaled_distance_from_scaled_overpressure(self, scaled_overpressure):
-        scaled_distance_data = self.scaled_peak_overpressure_data['scaled_distance_Mf' + str(self.mach_flame_speed)]
-        scaled_overpressure_data = self.scaled_peak_overpressure_data['scaled_overpressure_Mf' + str(self.mach_flame_speed)]
+        curves = self.scaled_peak_overpressure_data
         scaled_distance = np.interp(x=scaled_overpressure,
-                                    xp=scaled_overpressure_data[::-1],
-                                    fp=scaled_distance_data[::-1])
+                                    xp=curves.reversed('scaled_overpressure_Mf' + str(self.mach_flame_speed)),
+                                    fp=curves.reversed('scaled_distance_Mf' + str(self.mach_flame_speed)))
         return scaled_distance
 
     def calc_unscaled_distance(self, scaled_distance):
@@ -536,11 +799,10 @@ class BST_method(Generic_overpressure_method):
         return scaled_impulse
 
     def get_scaled_distance_from_scaled_impulse(self, scaled_impulse):
-        scaled_distance_data = self.all_scaled_impulse_data['scaled_distance_Mf' + str(self.mach_flame_speed)]
-        scaled_impulse_data = self.all_scaled_impulse_data['scaled_impulse_Mf' + str(self.mach_flame_speed)]
+        curves = self.all_scaled_impulse_data
         scaled_distance = np.interp(x=scaled_impulse,
-                                    xp=scaled_impulse_data[::-1],
-                                    fp=scaled_distance_data[::-1])
+                                    xp=curves.reversed('scaled_impulse_Mf' + str(self.mach_flame_speed)),
+                                    fp=curves.reversed('scaled_distance_Mf' + str(self.mach_flame_speed)))
         return scaled_distance
 
 
@@ -580,10 +842,8 @@ class TNT_method(Generic_overpressure_method):
                                              flammability_limits, origin_at_orifice)
         self.equivalence_factor = equivalence_factor  # unitless
         self.equiv_TNT_mass = self.calc_TNT_equiv_mass()  # kg
-        overpressure_data_file = os.path.join(self.data_dir, 'TNT_scaled_peak_overpressure.csv')
-        self.scaled_peak_overP_data = self.read_blast_wave_csv(overpressure_data_file)
-        impulse_data_file = os.path.join(self.data_dir, 'TNT_scaled_impulse.csv')
-        self.scaled_impulse_data = self.read_blast_wave_csv(impulse_data_file)
+        self.scaled_peak_overP_data = BlastCurves.load('TNT_scaled_peak_overpressure.csv')
+        self.scaled_impulse_data = BlastCurves.load('TNT_scaled_impulse.csv')
 
     def calc_TNT_equiv_mass(self):
         blast_energy_TNT = 4.68e6  # J/kg
@@ -615,8 +875,8 @@ class TNT_method(Generic_overpressure_method):
     def get_scaled_distance_from_scaled_overpressure(self, scaled_overpressure):
         scaled_peak_overP_data = self.scaled_peak_overP_data
         scaled_distance = np.interp(x=scaled_overpressure,  # unitless
-                                    xp=scaled_peak_overP_data['scaled_overpressure'][::-1],
-                                    fp=scaled_peak_overP_data['scaled_distance'][::-1])
+                                    xp=scaled_peak_overP_data.reversed('scaled_overpressure'),
+                                    fp=scaled_peak_overP_data.reversed('scaled_distance'))
         return scaled_distance
 
     def calc_unscaled_distance(self, scaled_distance):
@@ -631,8 +891,8 @@ class TNT_method(Generic_overpressure_method):
     def get_scaled_distance_from_scaled_impulse(self, scaled_impulse):
         scaled_impulse_data = self.scaled_impulse_data
         scaled_distance = np.interp(x=scaled_impulse,
-                                    xp=scaled_impulse_data['scaled_impulse'][::-1],
-                                    fp=scaled_impulse_data['scaled_distance'][::-1])
+                                    xp=scaled_impulse_data.reversed('scaled_impulse'),
+                                    fp=scaled_impulse_data.reversed('scaled_distance'))
         return scaled_distance
 
 
@@ -672,24 +932,80 @@ class Bauwens_method(Generic_overpressure_method):
         Default is False: will calculate location of origin,
         the point at which the concentration in the unignited jet
         is mid-way between the default lower and upper flamability limits
+    block_size : int
+        Number of streamline points evaluated at once
+        (default=256)
     """
     def __init__(self, jet_object, heat_of_combustion=None, min_streamline_divisions=50, number_radial_divisions=50,
-                 max_cell_gradient=0.1, minimum_number_detonable_cell=5, origin_at_orifice=False):
+                 max_cell_gradient=0.1, minimum_number_detonable_cell=5, origin_at_orifice=False, block_size=256):
         self.jet_object = jet_object
         self.heat_of_combustion = heat_of_combustion  # J/kg
         self.set_ambient_pressure()  # Pa
         self.set_fuel_properties()
         self.set_overpressure_origin(origin_at_orifice)
 
-        streamline_points, streamline_point_indices, streamline_point_interpolated_indices = self.calc_streamline_discretization(min_streamline_divisions)
-        radial_coordinate_values, streamline_indice_values = self.calc_radial_and_streamline_meshgrid(number_radial_divisions, streamline_point_interpolated_indices)
-        x_coordinate_values, y_coordinate_values = self.calc_spatial_discretization(radial_coordinate_values, streamline_indice_values, streamline_point_indices)
+        # the streamline discretization and detonable mass depend only on the jet and these parameters,
+        # so are stored on the jet and shared by Bauwens methods built on it
+        def detonable_mass():
+            streamline_points, streamline_point_indices, streamline_point_interpolated_indices = self.calc_streamline_discretization(min_streamline_divisions)
+            return self.calc_streamed_detonable_mass(streamline_points, streamline_point_indices,
+                                                     streamline_point_interpolated_indices,
+                                                     number_radial_divisions, max_cell_gradient,
+                                                     minimum_number_detonable_cell, block_size)
+        key = (self.molar_lower_flammability_limit, self.molar_upper_flammability_limit, min_streamline_divisions,
+               number_radial_divisions, max_cell_gradient, minimum_number_detonable_cell, block_size)
+        self.detonable_mass = self.jet_object._cached('bauwens_detonable_mass', key, detonable_mass)  # kg
+        self.energy = self.calc_energy()
+
+    def calc_streamed_detonable_mass(self, streamline_points, streamline_point_indices,
+                                     streamline_point_interpolated_indices, number_radial_divisions,
+                                     max_cell_gradient, minimum_number_detonable_cell, block_size=256):
+        '''
+        Detonable mass (kg), evaluated on the (streamline x radial) mesh one block of streamline points at a time
+
+        Only the streamline points at which the centerline mole fraction is above the lower flammability limit
+        (the largest mole fraction across the plume) can hold detonable fuel, so the mesh is only evaluated there,
+        along with one neighbouring point on either side for the cell size gradient.  The detonable mass per
+        unit length is zero at the other points.  The result is the same, to round-off, as evaluating
+        the whole mesh at once (see calc_detonable_mass).
+        '''
+        radial_values = self.calc_radial_values(number_radial_divisions)
+        # y-coordinates across the first streamline point, which set the radial spacing of the cell size gradient
+        y_cl, theta = self.interp_centerline(streamline_point_interpolated_indices[:1], ['y', 'theta'])
+        y_spacing = y_cl - radial_values*np.cos(theta)
+
+        centerline_mole_fraction = self.get_plume_mixture_properties(
+            streamline_point_indices, streamline_point_interpolated_indices[:, None], np.zeros((1, 1)))[0][:, 0]
+        detonable = np.flatnonzero(centerline_mole_fraction > self.molar_lower_flammability_limit)
+        detonable_mass_per_length = np.zeros(len(streamline_points))
+        # contiguous runs of streamline points that may hold detonable fuel, split into blocks
+        runs = np.split(detonable, np.flatnonzero(np.diff(detonable) > 1) + 1) if len(detonable) else []
+        for run in runs:
+            for start in range(run[0], run[-1] + 1, block_size):
+                stop = min(start + block_size, run[-1] + 1)
+                first, last = max(start - 1, 0), min(stop + 1, len(streamline_points))
+                block_mass_per_length = self.calc_block_detonable_mass_per_length(
+                    streamline_point_indices, streamline_point_interpolated_indices[first:last], radial_values,
+                    y_spacing, max_cell_gradient, minimum_number_detonable_cell)
+                detonable_mass_per_length[start:stop] = block_mass_per_length[start - first:stop - first]
+        return sp.integrate.simpson(detonable_mass_per_length, streamline_points)
+
+    def calc_block_detonable_mass_per_length(self, streamline_point_indices, streamline_point_interpolated_indices,
+                                             radial_values, y_spacing, max_cell_gradient,
+                                             minimum_number_detonable_cell):
+        '''
+        Detonable mass per unit length (kg/m) at a block of consecutive streamline points
+        '''
+        radial_coordinate_values, streamline_indice_values = np.meshgrid(radial_values, streamline_point_interpolated_indices)
+        x_coordinate_values, _ = self.calc_spatial_discretization(radial_coordinate_values, streamline_indice_values, streamline_point_indices)
         moleFractionField, massFractionField, densityField = self.get_plume_mixture_properties(streamline_point_indices, streamline_indice_values, radial_coordinate_values)
         detonable_cell_size = self.calc_detonable_cell_size(moleFractionField)
-        gradient_cell_size = self.calc_cell_size_gradient(x_coordinate_values, y_coordinate_values, detonable_cell_size)
+        gradient_cell_size = np.linalg.norm(np.gradient(detonable_cell_size, x_coordinate_values.T[0], y_spacing), axis=0)
         number_detonable_cells = self.calc_number_detonable_cells(moleFractionField, radial_coordinate_values, gradient_cell_size, detonable_cell_size, max_cell_gradient)
-        self.detonable_mass = self.calc_detonable_mass(massFractionField, number_detonable_cells, minimum_number_detonable_cell, densityField, radial_coordinate_values, streamline_points)  # UNITS ? kg ?
-        self.energy = self.calc_energy()
+        massFractionField_det = np.where((number_detonable_cells <= minimum_number_detonable_cell) | (radial_coordinate_values < 0),
+                                         0., massFractionField)
+        detonableFuelField = densityField*massFractionField_det*2.*np.pi*radial_coordinate_values
+        return sp.integrate.simpson(detonableFuelField, radial_coordinate_values)
 
     def calc_streamline_discretization(self, min_streamline_divisions):
         if min_streamline_divisions > len(np.unique(self.jet_object.S)):
@@ -697,21 +1013,34 @@ class Bauwens_method(Generic_overpressure_method):
         else:
             streamline_points = np.unique(self.jet_object.S)
         streamline_point_indices = np.arange(len(self.jet_object.S))
-        streamline_point_interpolated_indices = np.interp(streamline_points, self.jet_object.S, streamline_point_indices)
+        streamline_point_interpolated_indices = self.jet_object.streamline_index.interp(streamline_points, fp='index')
         return streamline_points, streamline_point_indices, streamline_point_interpolated_indices
 
+    def interp_centerline(self, streamline_coordinate_values, names):
+        '''
+        Interpolates jet centerline variables at (fractional) node indices,
+        once per streamline point when given a (streamline x radial) meshgrid
+        '''
+        streamline_coordinate_values = np.asarray(streamline_coordinate_values)
+        if streamline_coordinate_values.ndim == 2:
+            values = self.jet_object.streamline_index.interp_many(streamline_coordinate_values[:, 0], names, xp='index')
+            return [np.broadcast_to(value[:, None], streamline_coordinate_values.shape) for value in values]
+        return self.jet_object.streamline_index.interp_many(streamline_coordinate_values, names, xp='index')
+
     def calc_spatial_discretization(self, radial_coordinate_values, streamline_indice_values, streamline_point_indices):
-        x_coordinate_values = np.interp(streamline_indice_values, streamline_point_indices, self.jet_object.x) + \
-            radial_coordinate_values*np.sin(np.interp(streamline_indice_values, streamline_point_indices, self.jet_object.theta))
-        y_coordinate_values = np.interp(streamline_indice_values, streamline_point_indices, self.jet_object.y) - \
-            radial_coordinate_values*np.cos(np.interp(streamline_indice_values, streamline_point_indices, self.jet_object.theta))
+        x_cl, y_cl, theta = self.interp_centerline(streamline_indice_values, ['x', 'y', 'theta'])
+        x_coordinate_values = x_cl + radial_coordinate_values*np.sin(theta)
+        y_coordinate_values = y_cl - radial_coordinate_values*np.cos(theta)
         return x_coordinate_values, y_coordinate_values
 
-    def calc_radial_and_streamline_meshgrid(self, number_radial_divisions, streamline_point_interpolated_indices):
+    def calc_radial_values(self, number_radial_divisions):
         # Calculates logspaced points around 0 out to np.log10(3*np.max(self.B))
         # poshalf[::-1] just notation for reversing a numpy array
         poshalf = np.logspace(-5, np.log10(3*np.max(self.jet_object.B)), number_radial_divisions)
-        radial_values = np.concatenate((-1.0 * poshalf[::-1], [0], poshalf))
+        return np.concatenate((-1.0 * poshalf[::-1], [0], poshalf))
+
+    def calc_radial_and_streamline_meshgrid(self, number_radial_divisions, streamline_point_interpolated_indices):
+        radial_values = self.calc_radial_values(number_radial_divisions)
         radial_coordinate_values, streamline_indice_values = np.meshgrid(radial_values, streamline_point_interpolated_indices)
         return radial_coordinate_values, streamline_indice_values
 
@@ -728,13 +1057,13 @@ class Bauwens_method(Generic_overpressure_method):
         return moleFractionField, massFractionField, densityField
 
     def get_plume_halfwidth(self, streamline_coordinate_values, streamline_point_indices):
-        return np.interp(streamline_coordinate_values, streamline_point_indices, self.jet_object.B)
+        return self.interp_centerline(streamline_coordinate_values, ['B'])[0]
 
     def get_centerline_density(self, streamline_coordinate_values, streamline_point_indices):
-        return np.interp(streamline_coordinate_values, streamline_point_indices, self.jet_object.rho_cl)
+        return self.interp_centerline(streamline_coordinate_values, ['rho_cl'])[0]
 
     def get_centerline_massfraction(self, streamline_coordinate_values, streamline_point_indices):
-        return np.interp(streamline_coordinate_values, streamline_point_indices, self.jet_object.Y_cl)
+        return self.interp_centerline(streamline_coordinate_values, ['Y_cl'])[0]
 
     def calc_number_detonable_cells(self, moleFractionField, radial_coordinate_values, grad_cell_size,
                                     detonable_cell_size, max_cell_gradient):
@@ -796,6 +1125,32 @@ class Bauwens_method(Generic_overpressure_method):
                                + 0.0033 / scaled_distance ** 3)
         return scaled_overpressure
 
+    def get_scaled_distance_from_scaled_overpressure(self, scaled_overpressure):
+        # The scaled overpressure is a polynomial in t = scaled_distance**(-1/3) with positive coefficients,
+        # so it is increasing and convex for t > 0 and Newton's method from above the root converges monotonically
+        scaled_overpressure = np.asarray(scaled_overpressure, dtype=float)
+        coefficients, powers = np.array([0.34, 0.062, 0.0033]), np.array([4., 6., 9.])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = np.max((scaled_overpressure[..., None] / coefficients) ** (1 / powers), axis=-1)
+            for _ in range(100):
+                terms = coefficients * t[..., None] ** powers
+                step = (np.sum(terms, axis=-1) - scaled_overpressure) / np.sum(powers * terms, axis=-1) * t
+                step = np.where(np.isfinite(step), step, 0)
+                t = t - step
+                if np.all(step <= 1e-15 * t):
+                    break
+            scaled_distance = t ** -3.
+        if np.ndim(scaled_distance) == 0:
+            return float(scaled_distance)
+        return scaled_distance
+
+    def calc_unscaled_distance(self, scaled_distance):
+        unscaled_distance = scaled_distance * (self.energy / self.ambient_pressure) ** (1./3.)  # m
+        distance = unscaled_distance + self.origin[0]  # account for x-location of origin
+        # limited to the same x-locations as the generic solver
+        distance = np.minimum(distance, self.max_distance)
+        return distance
+
     def calc_detonable_cell_size(self, moleFractionField):
         equivalence_ratio = moleFractionField/(1. - moleFractionField)/self.fuel_to_air_stoich_ratio
         molar_flammability_limits = np.array([self.molar_lower_flammability_limit, self.molar_upper_flammability_limit])
@@ -803,12 +1158,12 @@ class Bauwens_method(Generic_overpressure_method):
          equivalence_ratio_rich_limit) = (molar_flammability_limits /
                                          (1.-molar_flammability_limits)/self.fuel_to_air_stoich_ratio)
         # check if equiv_ratio is outside of ER region or within it
-        condition_list = self.create_cell_size_condition_list(equivalence_ratio, equivalence_ratio_lean_limit, equivalence_ratio_rich_limit)
-        # evaluate piecewise function for equiv_ratio where if it is outside of ER range it is set to 1e99 otherwise it
+        nonflammable_mixture, flammable_mixture = self.create_cell_size_condition_list(equivalence_ratio, equivalence_ratio_lean_limit, equivalence_ratio_rich_limit)
+        # if equiv_ratio is outside of ER range the cell size is set to 1e99, otherwise it is evaluated from the fit
         # Note: if np.inf is used rather than 1e99 - leads to RuntimeWarning in gradient
-        detonable_cell_size = np.piecewise(equivalence_ratio,
-                                           condition_list,
-                                           [1e99, lambda equiv_ratio: self.detonation_cell_size(equiv_ratio)])
+        detonable_cell_size = np.zeros_like(equivalence_ratio)
+        detonable_cell_size[nonflammable_mixture] = 1e99
+        detonable_cell_size[flammable_mixture] = self.detonation_cell_size(equivalence_ratio[flammable_mixture])
         return detonable_cell_size
 
     @staticmethod
@@ -847,11 +1202,8 @@ class Bauwens_method(Generic_overpressure_method):
         }
         a, b, c, d, e = dcl_fitted_params[self.species]
         log_equiv_ratio = np.log(equiv_ratio)
-        log_cell_size = (a
-                         + b * log_equiv_ratio
-                         + c * log_equiv_ratio ** 2
-                         + d * log_equiv_ratio ** 3
-                         + e * log_equiv_ratio ** 4)
+        # a + b*log(ER) + c*log(ER)**2 + d*log(ER)**3 + e*log(ER)**4, by Horner's rule
+        log_cell_size = a + log_equiv_ratio * (b + log_equiv_ratio * (c + log_equiv_ratio * (d + log_equiv_ratio * e)))
         cell_size_mm = np.exp(log_cell_size)
         cell_size = cell_size_mm * sp.constants.milli
         return cell_size
@@ -905,7 +1257,6 @@ class JallaisOverpressureH2(BST_method):
 
     @staticmethod
     def get_mach_flame_speed_curve(mach_flame_speed):
-        valid_mach_flame_speeds = [0.2, 0.35, 0.7, 1.0, 1.4, 2.0, 3.0, 4.0, 5.2]
         # Get Mach flame speed from valid list that is closest to calculated value
-        mach_flame_speed_curve = min(valid_mach_flame_speeds, key=lambda x: abs(x - mach_flame_speed))
+        mach_flame_speed_curve = min(BST_method.mach_flame_speeds, key=lambda x: abs(x - mach_flame_speed))
         return mach_flame_speed_curve
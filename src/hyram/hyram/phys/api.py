@@ -288,7 +288,8 @@ def analyze_jet_plume(amb_fluid, rel_fluid, orif_diam,
                       rel_angle=0., dis_coeff=1., nozzle_model='yuce',
                       create_plot=True, contour=None, contour_min=0., contour_max=0.1,
                       xmin=-2.5, xmax=2.5, ymin=0., ymax=10., plot_title="Mole Fraction of Leak",
-                      filename=None, output_dir=None, verbose=False):
+                      filename=None, output_dir=None, verbose=False, fields=None, dtype=np.float64,
+                      cache=None):
     """
     Simulate jet plume for leak and generate plume positional data, including mass and mole fractions, plume plot.
 
@@ -348,6 +349,18 @@ def analyze_jet_plume(amb_fluid, rel_fluid, orif_diam,
 
     verbose : bool, False
 
+    fields : list of str or None
+        Positional data arrays to include in the results, any of
+        'xs', 'ys', 'mole_fracs', 'mass_fracs', 'vs' and 'temps'.
+        Default is None: all are included. Only the requested arrays are computed.
+
+    dtype : numpy dtype
+        dtype of the positional data arrays (e.g. np.float32), default is np.float64
+
+    cache : _cache.ResultCache or None
+        If given, the jet is loaded from the cache if it has been solved before, and stored otherwise.
+        Default is None: the jet is always solved.
+
     Returns
     -------
     result_dict : dict
@@ -380,11 +393,18 @@ def analyze_jet_plume(amb_fluid, rel_fluid, orif_diam,
     nozzle_cons_momentum, nozzle_t_param = misc_utils.convert_nozzle_model_to_params(nozzle_model, rel_fluid)
 
     log.info('Creating jet')
-    jet_obj = _jet.Jet(rel_fluid, orifice, amb_fluid, theta0=rel_angle,
-                       nn_conserve_momentum=nozzle_cons_momentum,
-                       nn_T=nozzle_t_param, verbose=verbose)
-
-    xs, ys, mole_fracs, mass_fracs, vs, temps = jet_obj.get_contour_data()
+    jet_obj = (_jet.Jet if cache is None else cache.jet)(rel_fluid, orifice, amb_fluid, theta0=rel_angle,
+                                                         nn_conserve_momentum=nozzle_cons_momentum,
+                                                         nn_T=nozzle_t_param, verbose=verbose)
+
+    field_names = {'xs': 'x', 'ys': 'y', 'mole_fracs': 'X', 'mass_fracs': 'Y', 'vs': 'v', 'temps': 'T'}
+    if fields is None:
+        fields = list(field_names)
+    for field in fields:
+        if field not in field_names:
+            raise ValueError('Unknown jet plume field {}, must be one of {}'.format(field, list(field_names)))
+    if fields:
+        field_data = jet_obj.sample_fields([field_names[field] for field in fields], dtype=dtype)
     mass_flow_rate = jet_obj.mass_flow_rate
 
     if create_plot:
@@ -422,14 +442,9 @@ def analyze_jet_plume(amb_fluid, rel_fluid, orif_diam,
     else:
         plot_filepath = ''
 
-    result_dict = {'xs': xs,
-                   'ys': ys,
-                   'mole_fracs': mole_fracs,
-                   'mass_fracs': mass_fracs,
-                   'vs': vs,
-                   'temps': temps,
-                   'plot': plot_filepath,
-                   'mass_flow_rate': mass_flow_rate}
+    result_dict = {field: field_data[field_names[field]] for field in fields}
+    result_dict['plot'] = plot_filepath
+    result_dict['mass_flow_rate'] = mass_flow_rate
     return result_dict
 
 
@@ -654,7 +669,7 @@ def jet_flame_analysis(amb_fluid, rel_fluid, orif_diam,
                        temp_plot_filename=None,
                        heatflux_plot_filename=None,
                        flux_coordinates=None,
-                       output_dir=None, verbose=False):
+                       output_dir=None, verbose=False, cache=None):
     """
     Assess jet flame behavior and flux data and create corresponding plots.
 
@@ -710,6 +725,10 @@ def jet_flame_analysis(amb_fluid, rel_fluid, orif_diam,
     verbose : bool
         Verbosity of logging and print statements
 
+    cache : _cache.ResultCache or None
+        If given, the flame is loaded from the cache if it has been solved before, and stored otherwise.
+        Default is None: the flame is always solved.
+
     Returns
     -------
     temp_plot_filepath : str or None
@@ -742,10 +761,11 @@ def jet_flame_analysis(amb_fluid, rel_fluid, orif_diam,
     orifice = _comps.Orifice(orif_diam, Cd=dis_coeff)
 
     conserve_momentum, notional_nozzle_t = misc_utils.convert_nozzle_model_to_params(nozzle_key, rel_fluid)
-    flame_obj = _flame.Flame(rel_fluid, orifice, amb_fluid,
-                             theta0=rel_angle, y0=0,
-                             nn_conserve_momentum=conserve_momentum, nn_T=notional_nozzle_t,
-                             verbose=verbose)
+    flame_obj = (_flame.Flame if cache is None else cache.flame)(rel_fluid, orifice, amb_fluid,
+                                                                 theta0=rel_angle, y0=0,
+                                                                 nn_conserve_momentum=conserve_momentum,
+                                                                 nn_T=notional_nozzle_t,
+                                                                 verbose=verbose)
 
     mass_flow = flame_obj.mass_flow_rate
     srad = flame_obj.get_srad()
@@ -790,7 +810,8 @@ def compute_overpressure(method: str, locations,
                          create_overpressure_plot: bool = True,
                          overpressure_plot_filename=None,
                          output_dir=None, contours=None, verbose=False,
-                         xmin=None, xmax=None, ymin=None, ymax=None, zmin=None, zmax=None):
+                         xmin=None, xmax=None, ymin=None, ymax=None, zmin=None, zmax=None,
+                         cache=None):
     """
     Calculate the overpressure and impulse at a specified locations
 
@@ -870,6 +891,10 @@ def compute_overpressure(method: str, locations,
     zmax : float, None
         Plot z maximum.
 
+    cache : _cache.ResultCache or None
+        If given, the jet is loaded from the cache if it has been solved before, and stored otherwise.
+        Default is None: the jet is always solved.
+
     Returns
     -------
     dict
@@ -890,8 +915,10 @@ def compute_overpressure(method: str, locations,
     orifice = _comps.Orifice(orifice_diameter, discharge_coefficient)
     nozzle_cons_momentum, nozzle_t_param = misc_utils.convert_nozzle_model_to_params(nozzle_model, release_fluid)
     log.info('Creating jet')
-    jet_object = _jet.Jet(release_fluid, orifice, ambient_fluid, theta0=release_angle,
-                          nn_conserve_momentum=nozzle_cons_momentum, nn_T=nozzle_t_param, verbose=verbose)
+    jet_object = (_jet.Jet if cache is None else cache.jet)(release_fluid, orifice, ambient_fluid,
+                                                            theta0=release_angle,
+                                                            nn_conserve_momentum=nozzle_cons_momentum,
+                                                            nn_T=nozzle_t_param, verbose=verbose)
 
     method = method.lower()
     if method == 'bst':
@@ -910,8 +937,7 @@ def compute_overpressure(method: str, locations,
                                                                       origin_at_orifice=origin_at_orifice)
     else:
         raise exceptions.InputError(function="Overpressure analysis", message='Invalid method name')
-    overpressure = over_pressure_model.calc_overpressure(locations)
-    impulse = over_pressure_model.calc_impulse(locations)
+    overpressure, impulse = over_pressure_model.calc_overpressure_and_impulse(locations)
 
     if create_overpressure_plot:
         log.info("Creating overpressure plot")
@@ -940,3 +966,96 @@ def compute_overpressure(method: str, locations,
         'mass_flow_rate': jet_object.mass_flow_rate,
     }
     return results
+
+
+def compare_overpressure_models(jet_object, locations, mach_flame_speeds=None, TNT_equivalence_factor=0.03,
+                                heat_of_combustion=None, origin_at_orifice=False):
+    """
+    Calculate the overpressure and impulse at specified locations with every unconfined overpressure
+    method for a single jet
+
+    The flammable mass and the overpressure origin are calculated once for each set of flammability
+    limits and shared by the methods (see Jet._cached), as is the Bauwens detonable mass for other
+    Bauwens calculations on the same jet.  The Jallais method is only included for hydrogen jets within its range of mass
+    flow rates.
+
+    Parameters
+    ----------
+    jet_object : _jet.Jet
+        Solved jet
+
+    locations : list of locations
+        List of locations at which to determine overpressure,
+        each location is a tuple of 3 coordinates (m):
+        [(x1, y1, z1), (x2, y2, z2), ...]
+
+    mach_flame_speeds : list of floats or None
+        BST mach flame speeds to evaluate.
+        Default is None: all available mach flame speeds 0.2, 0.35, 0.7, 1.0, 1.4, 2.0, 3.0, 4.0, 5.2
+
+    TNT_equivalence_factor : float, optional
+        TNT equivalency, unitless
+
+    heat_of_combustion : float, optional
+        heat of combustion of fuel in J/kg
+
+    origin_at_orifice : boolean, optional, default to False
+        specify if the origin should be at the orifice or calculated
+
+    Returns
+    -------
+    dict of ndarrays, with one row for each method and location
+        method : str
+            'bst', 'tnt', 'bauwens' or 'jallais'
+        mach_flame_speed : float
+            mach flame speed of the BST curve (NaN for the TNT and Bauwens methods)
+        location : int
+            index of the location
+        x, y, z : float
+            coordinates of the location (m)
+        overpressure : float
+            overpressure in Pa
+        impulse : float
+            impulse in Pa*s (NaN for the Bauwens method)
+    """
+    log.info("Unconfined overpressure model comparison requested")
+    if mach_flame_speeds is None:
+        mach_flame_speeds = _unconfined_overpressure.BST_method.mach_flame_speeds
+    locations = np.array(locations, dtype=float).reshape(-1, 3)
+
+    bst = _unconfined_overpressure.BST_method(jet_object, mach_flame_speeds[0], heat_of_combustion,
+                                              origin_at_orifice=origin_at_orifice)
+    bst_overpressure, bst_impulse = bst.calc_all_curves(locations, mach_flame_speeds)
+    results = [('bst', mach_flame_speed, overpressure, impulse)
+               for mach_flame_speed, overpressure, impulse in zip(mach_flame_speeds, bst_overpressure, bst_impulse)]
+    models = [('tnt', np.nan,
+               _unconfined_overpressure.TNT_method(jet_object, TNT_equivalence_factor, heat_of_combustion,
+                                                   origin_at_orifice=origin_at_orifice)),
+              ('bauwens', np.nan,
+               _unconfined_overpressure.Bauwens_method(jet_object, heat_of_combustion,
+                                                       origin_at_orifice=origin_at_orifice))]
+    try:
+        jallais = _unconfined_overpressure.JallaisOverpressureH2(jet_object, origin_at_orifice=origin_at_orifice)
+    except ValueError as err:
+        log.info("Skipping Jallais method: {}".format(err))
+    else:
+        models.append(('jallais', jallais.mach_flame_speed, jallais))
+
+    for method, mach_flame_speed, model in models:
+        results.append((method, mach_flame_speed) + model.calc_overpressure_and_impulse(locations))
+
+    num_locations = len(locations)
+    table = {'method': [], 'mach_flame_speed': [], 'location': [], 'x': [], 'y': [], 'z': [],
+             'overpressure': [], 'impulse': []}
+    for method, mach_flame_speed, overpressure, impulse in results:
+        table['method'] += [method]*num_locations
+        table['mach_flame_speed'].append(np.full(num_locations, mach_flame_speed))
+        table['location'].append(np.arange(num_locations))
+        for i, name in enumerate(['x', 'y', 'z']):
+            table[name].append(locations[:, i])
+        table['overpressure'].append(overpressure)
+        table['impulse'].append(impulse)
+    table = {name: np.array(values) if name == 'method' else np.concatenate(values)
+             for name, values in table.items()}
+    log.info("Unconfined overpressure model comparison complete")
+    return table
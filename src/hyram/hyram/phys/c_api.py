@@ -292,7 +292,7 @@ def analyze_jet_plume(amb_temp, amb_pres,
                                               rel_angle=rel_angle, dis_coeff=dis_coeff, nozzle_model=nozzle_model,
                                               create_plot=True, contour=contour,
                                               xmin=xmin, xmax=xmax, ymin=ymin, ymax=ymax, plot_title=plot_title,
-                                              output_dir=output_dir, verbose=verbose)
+                                              output_dir=output_dir, verbose=verbose, fields=[])
 
             log.info("results: {}".format(data_dict))
             results["data"] = data_dict
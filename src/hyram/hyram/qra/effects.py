@@ -234,8 +234,7 @@ def calc_overp_effects(orifices, notional_nozzle_model,
         else:
             raise ValueError('Invalid overpressure method name')
 
-        overpressures = over_pressure_model.calc_overpressure(locations)
-        impulses = over_pressure_model.calc_impulse(locations)
+        overpressures, impulses = over_pressure_model.calc_overpressure_and_impulse(locations)
         all_overpressures[i, :] = overpressures
         all_impulses[i, :] = impulses
 
@@ -19,7 +19,8 @@ from tests import (test_c_api_etk, test_c_api_phys, test_c_api_jet_plume,
                    test_qra_analysis, test_qra_effects, test_qra_fatalities,
                    test_qra_ignition_probs, test_qra_pipe_size,
                    test_qra_positions, test_qra_probits, test_qra_risk,
-                   test_phys_api, test_phys_flame, test_phys_overpressure)
+                   test_phys_api, test_phys_flame, test_phys_jet,
+                   test_phys_overpressure, test_phys_surrogate, test_phys_cache)
 
 
 def suite():
@@ -85,11 +86,23 @@ def suite():
     if do_test_phys:
         suite.addTest(unittest.makeSuite(test_phys_flame.TestAtmosphericTransmissivity))
         suite.addTest(unittest.makeSuite(test_phys_flame.TestFlameObject))
+        suite.addTest(unittest.makeSuite(test_phys_flame.TestRadiativeHeatFlux))
+        suite.addTest(unittest.makeSuite(test_phys_flame.TestFlameBatch))
+        suite.addTest(unittest.makeSuite(test_phys_flame.TestTransientFlame))
+        suite.addTest(unittest.makeSuite(test_phys_jet.TestJetFieldSampling))
+        suite.addTest(unittest.makeSuite(test_phys_jet.TestStreamlineIndex))
+        suite.addTest(unittest.makeSuite(test_phys_jet.TestConcentrationAt))
+        suite.addTest(unittest.makeSuite(test_phys_jet.TestConcentrationEnvelope))
+        suite.addTest(unittest.makeSuite(test_phys_jet.TestJetBatch))
         suite.addTest(unittest.makeSuite(test_phys_overpressure.GenericMethodTestCase))
         suite.addTest(unittest.makeSuite(test_phys_overpressure.BstMethodTestCase))
         suite.addTest(unittest.makeSuite(test_phys_overpressure.TntMethodTestCase))
         suite.addTest(unittest.makeSuite(test_phys_overpressure.BauwensMethodTestCase))
         suite.addTest(unittest.makeSuite(test_phys_overpressure.TestJallaisOverpressureH2))
+        suite.addTest(unittest.makeSuite(test_phys_overpressure.TestBlastCurves))
+        suite.addTest(unittest.makeSuite(test_phys_surrogate.TestJetSurrogate))
+        suite.addTest(unittest.makeSuite(test_phys_surrogate.TestFlameSurrogate))
+        suite.addTest(unittest.makeSuite(test_phys_cache.TestResultCache))
 
     return suite
 
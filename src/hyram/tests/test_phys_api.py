@@ -11,7 +11,9 @@ import unittest
 import logging
 from math import isnan
 
-from hyram.phys import api, Fluid
+import numpy as np
+
+from hyram.phys import api, Fluid, Orifice, Jet, BST_method, TNT_method
 from hyram.utilities import misc_utils, exceptions
 
 """
@@ -287,6 +289,26 @@ class OverpressureTestCase(unittest.TestCase):
         self.assertTrue(isnan(impulse[0]))
         self.assertTrue(os.path.exists(figure_path))
 
+    def test_compare_overpressure_models(self):
+        self.log.info("TESTING overpressure model comparison")
+        orifice = Orifice(self.orifice_diameter)
+        jet_object = Jet(self.release_fluid, orifice, self.ambient_fluid)
+        locations = [(1, 1, 0), (2, 0, 0), (5, 1, 1)]
+        table = api.compare_overpressure_models(jet_object, locations)
+        methods = ['bst']*9 + ['tnt', 'bauwens', 'jallais']
+        self.assertEqual(list(table['method']), [method for method in methods for _ in locations])
+        for values in table.values():
+            self.assertEqual(len(values), len(methods)*len(locations))
+        rows = (table['method'] == 'bst') & (table['mach_flame_speed'] == 0.35)
+        bst = BST_method(jet_object, 0.35)
+        self.assertTrue(np.allclose(table['overpressure'][rows], bst.calc_overpressure(locations)))
+        self.assertTrue(np.allclose(table['impulse'][rows], bst.calc_impulse(locations)))
+        rows = table['method'] == 'tnt'
+        tnt = TNT_method(jet_object, 0.03)
+        self.assertTrue(np.allclose(table['overpressure'][rows], tnt.calc_overpressure(locations)))
+        self.assertTrue(np.all(np.isnan(table['impulse'][table['method'] == 'bauwens'])))
+        self.assertEqual(list(table['location'][rows]), [0, 1, 2])
+
 
 
 if __name__ == "__main__":
@@ -0,0 +1,111 @@
+"""
+Copyright 2015-2022 National Technology & Engineering Solutions of Sandia, LLC (NTESS).
+Under the terms of Contract DE-NA0003525 with NTESS, the U.S. Government retains certain rights in this software.
+
+You should have received a copy of the GNU General Public License along with HyRAM+.
+If not, see https://www.gnu.org/licenses/.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from hyram.phys import _cache
+import hyram.phys.api as phys_api
+import hyram.phys._comps as phys_comps
+import hyram.phys._therm as phys_therm
+
+
+class TestResultCache(unittest.TestCase):
+    """
+    Tests of the on-disk cache of solved jets and flames
+    """
+    def setUp(self):
+        self.release_fluid = phys_api.create_fluid('H2', temp=288, pres=35e6)
+        self.ambient_fluid = phys_api.create_fluid('AIR', temp=288, pres=101325)
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = _cache.ResultCache(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _entries(self):
+        return sorted(name for name in os.listdir(self.directory.name) if name.endswith('.npz'))
+
+    def test_restored_jet(self):
+        jet = self.cache.jet(self.release_fluid, phys_comps.Orifice(0.003), self.ambient_fluid, theta0=0.3)
+        restored = self.cache.jet(self.release_fluid, phys_comps.Orifice(0.003), self.ambient_fluid, theta0=0.3)
+        self.assertEqual(len(self._entries()), 1)
+        for name in ['S', 'X_cl', 'x', 'y', 'B', 'T_cl']:
+            self.assertTrue(np.array_equal(getattr(jet, name), getattr(restored, name)))
+        self.assertEqual(restored.streamline_distance_to_mole_fraction(0.04),
+                         jet.streamline_distance_to_mole_fraction(0.04))
+
+    def test_restored_flame(self):
+        flame = self.cache.flame(self.release_fluid, phys_comps.Orifice(0.003), self.ambient_fluid)
+        restored = self.cache.flame(self.release_fluid, phys_comps.Orifice(0.003), self.ambient_fluid)
+        self.assertIsNone(restored.chem)
+        self.assertEqual(restored.Lvis, flame.Lvis)
+        self.assertEqual(restored.Srad, flame.Srad)
+        self.assertEqual(restored.Qrad_multi(1, 1, 1, 0.5), flame.Qrad_multi(1, 1, 1, 0.5))
+        self.assertEqual(restored.length(), flame.Lvis)
+        self.assertIsNone(restored.chem)
+
+    def test_flame_with_chemistry_not_stored(self):
+        chem = phys_therm.Combustion(self.release_fluid)
+        flame = self.cache.flame(self.release_fluid, phys_comps.Orifice(0.003), self.ambient_fluid, chem=chem)
+        self.assertIs(flame.chem, chem)
+        self.assertEqual(self._entries(), [])
+
+    def test_distinct_inputs(self):
+        self.cache.jet(self.release_fluid, phys_comps.Orifice(0.003), self.ambient_fluid)
+        self.cache.jet(self.release_fluid, phys_comps.Orifice(0.003), self.ambient_fluid, theta0=0.1)
+        self.assertEqual(len(self._entries()), 2)
+        self.assertEqual(self.cache.key('Jet', {'theta0': 0}), self.cache.key('Jet', {'theta0': 0.}))
+        self.assertNotEqual(self.cache.key('Jet', {'theta0': 0}), self.cache.key('Flame', {'theta0': 0}))
+        with self.assertRaises(TypeError):
+            self.cache.key('Jet', {'theta0': object()})
+
+    def test_corrupted_entry_recalculated(self):
+        jet = self.cache.jet(self.release_fluid, phys_comps.Orifice(0.003), self.ambient_fluid)
+        path = os.path.join(self.directory.name, self._entries()[0])
+        with open(path, 'r+b') as data_file:
+            data_file.seek(-20, os.SEEK_END)
+            data_file.write(b'corrupted')
+        key = self._entries()[0][:-len('.npz')]
+        self.assertIsNone(self.cache.load(key))
+        self.assertEqual(self._entries(), [])
+        restored = self.cache.jet(self.release_fluid, phys_comps.Orifice(0.003), self.ambient_fluid)
+        self.assertTrue(np.array_equal(restored.X_cl, jet.X_cl))
+        self.assertIsNotNone(self.cache.load(key))
+
+    def test_least_recently_used_evicted(self):
+        keys = ['a', 'b', 'c']
+        for i, key in enumerate(keys):
+            self.cache.store(key, {'values': np.zeros(1000)})
+            os.utime(os.path.join(self.directory.name, key + '.json'), (i, i))
+        self.cache.load('a')
+        self.cache.max_size = 2.5*sum(os.path.getsize(os.path.join(self.directory.name, name))
+                                      for name in ['a.json', 'a.npz'])
+        self.cache.store('d', {'values': np.ones(1000)})
+        self.assertEqual(self._entries(), ['a.npz', 'd.npz'])
+        self.cache.clear()
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+    def test_eviction_skips_removed_entries(self):
+        self.cache.store('a', {'values': np.zeros(1000)})
+        self.cache.store('b', {'values': np.zeros(1000)})
+        listed = os.listdir(self.directory.name)
+        self.cache.clear()  # e.g., by another process, after the listing
+        self.cache.store('c', {'values': np.zeros(1000)})
+        self.cache.max_size = 0
+        with mock.patch('os.listdir', return_value=listed + ['c.json', 'c.npz']):
+            self.cache._evict()
+        self.assertEqual(self._entries(), ['c.npz'])
+        self.cache._remove('a')
+
+if __name__ == "__main__":
+    unittest.main()
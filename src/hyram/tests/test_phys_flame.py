@@ -8,6 +8,8 @@ If not, see https://www.gnu.org/licenses/.
 
 import unittest
 
+import numpy as np
+
 from hyram.phys import _flame
 import hyram.phys.api as phys_api
 import hyram.phys._comps as phys_comps
@@ -16,6 +18,17 @@ import hyram.phys._comps as phys_comps
 VERBOSE = False
 
 
+def setUpModule():
+    """
+    Solves the flame shared (and not modified) by the tests in this module
+    """
+    global RELEASE_FLUID, AMBIENT_FLUID, ORIFICE, FLAME
+    RELEASE_FLUID = phys_api.create_fluid('H2', temp=288, pres=35e6)
+    AMBIENT_FLUID = phys_api.create_fluid('AIR', temp=288, pres=101325)
+    ORIFICE = phys_comps.Orifice(0.003)
+    FLAME = _flame.Flame(RELEASE_FLUID, ORIFICE, AMBIENT_FLUID, verbose=VERBOSE)
+
+
 class TestAtmosphericTransmissivity(unittest.TestCase):
     """
     Test calculation of atmospheric transmissivity
@@ -55,6 +68,14 @@ class TestAtmosphericTransmissivity(unittest.TestCase):
             tau_diff_pct = (calc_tau - paper_tau) / paper_tau * 100
             self.assertLessEqual(tau_diff_pct, 0.6)
 
+    def test_evaluator_matches_correlation(self):
+        path_lengths = np.logspace(-1, 4, 200)
+        for amb_temp, rel_humid, co2 in [(253, 0.5, 335), (303, 0.9, 335), (288, 0.2, 420)]:
+            transmissivity = _flame.AtmosphericTransmissivity(amb_temp, rel_humid, co2)
+            taus = _flame.calc_transmissivity(path_lengths, amb_temp, rel_humid, co2)
+            self.assertTrue(np.allclose(transmissivity(path_lengths), taus, rtol=1e-12))
+            self.assertTrue(np.allclose(transmissivity.from_squared_length(path_lengths**2), taus, rtol=1e-12))
+
 
 class TestFlameObject(unittest.TestCase):
     """
@@ -82,6 +103,184 @@ class TestFlameObject(unittest.TestCase):
         fluxes = self.flame.generate_positional_flux(locations, rel_humid)
         self.assertEqual(len(fluxes), 0)
 
+    def test_stages_computed_once(self):
+        self.assertEqual(set(self.flame.timings), {'chemistry', 'correlations', 'integration'})
+        timings = dict(self.flame.timings)
+        Lvis = self.flame.length()
+        self.flame.Qrad_multi(1, 1, 1, 0.5)
+        self.assertEqual(self.flame.length(), Lvis)
+        self.assertEqual(self.flame.timings, timings)
+
+    def test_shared_chemistry(self):
+        flame = _flame.Flame(self.flame.fluid, phys_comps.Orifice(0.001), self.flame.ambient,
+                             chem=self.flame.chem, verbose=VERBOSE)
+        self.assertIs(flame.chem, self.flame.chem)
+        self.assertEqual(flame.timings['chemistry'], 0)
+
+    def test_tabulated_product_density(self):
+        chem = self.flame.chem
+        f = np.linspace(0, 1, 1001)
+        rho, drhodf = chem.rho_and_drhodf(f)
+        self.assertTrue(np.allclose(rho, chem.rho_prod(f), rtol=1e-8))
+        self.assertTrue(np.allclose(drhodf, chem.drhodf(f)))
+
+
+class TestRadiativeHeatFlux(unittest.TestCase):
+    """
+    Tests of the multisource radiative heat flux
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.flame = FLAME
+        cls.x, cls.y = np.meshgrid(np.linspace(-2, 5, 30), np.linspace(0, 3, 20))
+        cls.z = 0.5
+
+    def test_same_result_for_all_shapes(self):
+        flux = self.flame.Qrad_multi(self.x, self.y, self.z, 0.89)
+        self.assertEqual(flux.shape, self.x.shape)
+        flux_flat = self.flame.Qrad_multi(self.x.ravel(), self.y.ravel(), self.z, 0.89)
+        self.assertTrue(np.allclose(flux.ravel(), flux_flat))
+        flux_point = self.flame.Qrad_multi(self.x[3, 4], self.y[3, 4], self.z, 0.89)
+        self.assertAlmostEqual(float(flux_point), flux[3, 4])
+
+    def test_chunks_and_threads(self):
+        flux = self.flame.Qrad_multi(self.x, self.y, self.z, 0.89)
+        flux_chunked = self.flame.Qrad_multi(self.x, self.y, self.z, 0.89, chunk_size=7, n_workers=3)
+        self.assertTrue(np.allclose(flux, flux_chunked))
+
+    def test_single_precision(self):
+        flux = self.flame.Qrad_multi(self.x, self.y, self.z, 0.89)
+        flux_32 = self.flame.Qrad_multi(self.x, self.y, self.z, 0.89, dtype=np.float32)
+        self.assertEqual(flux_32.dtype, np.float32)
+        self.assertTrue(np.allclose(flux, flux_32, rtol=1e-4))
+
+    def test_far_field_tolerance(self):
+        x, z = np.meshgrid(np.linspace(-40, 40, 41), np.linspace(-40, 40, 41))
+        flux = self.flame.Qrad_multi(x, 1, z, 0.89)
+        for rtol in [1e-2, 1e-3]:
+            flux_far = self.flame.Qrad_multi(x, 1, z, 0.89, rtol=rtol, chunk_size=50)
+            self.assertLess(np.max(np.abs(flux_far / flux - 1)), rtol)
+
+    def test_field_matches_point_evaluation(self):
+        axes = (np.linspace(-2, 5, 15), np.linspace(0, 3, 7), np.linspace(-1, 1, 5))
+        field = self.flame.heat_flux_field(axes, 0.89, chunk_size=40, n_workers=2)
+        self.assertEqual(field.flux.shape, (15, 7, 5))
+        x, y, z = np.meshgrid(*axes, indexing='ij')
+        self.assertTrue(np.allclose(field.flux, self.flame.Qrad_multi(x, y, z, 0.89)))
+        plane = self.flame.heat_flux_field((axes[0], 1., axes[2]), 0.89)
+        self.assertEqual(plane.flux.shape, (15, 1, 5))
+        self.assertTrue(np.allclose(plane.flux[:, 0, :], self.flame.Qrad_multi(x[:, 0, :], 1., z[:, 0, :], 0.89)))
+        with self.assertRaises(ValueError):
+            self.flame.heat_flux_field((axes[0], axes[1]), 0.89)
+
+    def test_iso_surfaces(self):
+        field = self.flame.heat_flux_field((np.linspace(-4, 12, 65), np.linspace(0, 6, 25),
+                                            np.linspace(-6, 6, 49)), 0.89)
+        lower, upper, missing = field.iso_surfaces([1.577, 4.732, 1e6])
+        for surface in [lower, upper]:
+            vertices = surface['vertices']
+            flux = self.flame.Qrad_multi(vertices[:, 0], vertices[:, 1], vertices[:, 2], 0.89) / 1000
+            self.assertTrue(np.allclose(flux, surface['level'], rtol=0.02))
+        self.assertGreater(lower['volume'], upper['volume'])
+        self.assertTrue(np.all(lower['extent'][:, 1] >= upper['extent'][:, 1]))
+        self.assertEqual(len(missing['vertices']), 0)
+        self.assertEqual(missing['volume'], 0)
+        self.assertTrue(np.all(np.isnan(missing['extent'])))
+
+    def test_distances_to_heat_flux_levels(self):
+        levels = [1577, 4732, 25237]
+        distances = self.flame.x_distance_to_heat_flux_val(levels)
+        self.assertEqual(distances.shape, (3,))
+        self.assertTrue(np.all(np.diff(distances) < 0))
+        ycen = self.flame.streamline_index.interp(self.flame.Lvis * 0.75, fp='y')
+        flux = self.flame.Qrad_multi(distances, ycen, 0, 0.89)
+        self.assertTrue(np.allclose(flux, levels, rtol=1e-5))
+        self.assertAlmostEqual(self.flame.x_distance_to_heat_flux_val(4732), distances[1])
+        self.assertEqual(self.flame.x_distance_to_heat_flux_val(1e-6, xmax=100), 100)
+
+    def test_humidity_ensemble(self):
+        humidities = [0.2, 0.5, 0.89]
+        fluxes = self.flame.Qrad_ensemble(self.x, self.y, self.z, humidities)
+        self.assertEqual(fluxes.shape, (3,) + self.x.shape)
+        for RH, flux in zip(humidities, fluxes):
+            self.assertTrue(np.allclose(flux, self.flame.Qrad_multi(self.x, self.y, self.z, RH)))
+        self.assertTrue(np.all(np.diff(fluxes, axis=0) < 0))
+        fluxes_co2 = self.flame.Qrad_ensemble(self.x, self.y, self.z, 0.5, [335, 420])
+        self.assertTrue(np.allclose(fluxes_co2[0], fluxes[1]))
+        self.assertTrue(np.all(fluxes_co2[1] < fluxes_co2[0]))
+        with self.assertRaises(ValueError):
+            self.flame.Qrad_ensemble(self.x, self.y, self.z, [[0.2, 0.5]])
+
+    def test_merged_sources_conserve_power(self):
+        w, sources = self.flame._radiative_sources()
+        levels = self.flame._merged_sources(w, sources)
+        self.assertEqual(len(levels[0][0]), len(w))
+        self.assertEqual(len(levels[-1][0]), 1)
+        for weights, centers, radius in levels:
+            self.assertAlmostEqual(np.sum(weights), np.sum(w))
+            self.assertTrue(np.allclose(weights @ centers, w @ sources))
+        self.assertAlmostEqual(levels[0][2], 0)
+
+
+class TestFlameBatch(unittest.TestCase):
+    """
+    Tests of flames at several release angles integrated together
+    """
+    angles = [0, np.pi / 4, np.pi / 2]
+
+    @classmethod
+    def setUpClass(cls):
+        cls.batch = _flame.FlameBatch(RELEASE_FLUID, ORIFICE, AMBIENT_FLUID, cls.angles)
+
+    def test_matches_individual_flames(self):
+        x, y, z = np.array([1., 2., 3.]), np.array([0.5, 1., 2.]), 1.
+        fluxes = self.batch.heat_flux(x, y, z, 0.89)
+        self.assertEqual(fluxes.shape, (len(self.angles), 3))
+        for angle, batch_flame, flux in zip(self.angles, self.batch.flames, fluxes):
+            flame = FLAME if angle == 0 else _flame.Flame(RELEASE_FLUID, ORIFICE, AMBIENT_FLUID, theta0=angle,
+                                                          verbose=VERBOSE)
+            self.assertIs(batch_flame.chem, self.batch.flames[0].chem)
+            self.assertEqual(batch_flame.Lvis, flame.Lvis)
+            self.assertAlmostEqual(batch_flame.initial_node.y, flame.initial_node.y)
+            self.assertTrue(np.allclose(np.interp(flame.S, batch_flame.S, batch_flame.x), flame.x, atol=1e-3))
+            self.assertTrue(np.allclose(np.interp(flame.S, batch_flame.S, batch_flame.y), flame.y, atol=1e-3))
+            self.assertTrue(np.allclose(flux, flame.Qrad_multi(x, y, z, 0.89), rtol=1e-4))
+
+    def test_reject_nested_angles(self):
+        with self.assertRaises(ValueError):
+            _flame.FlameBatch(RELEASE_FLUID, ORIFICE, AMBIENT_FLUID, [[0, np.pi / 2]])
+
+
+class TestTransientFlame(unittest.TestCase):
+    """
+    Tests of jet fires from a blowdown
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.orifice = phys_comps.Orifice(0.001)
+        cls.flame = _flame.TransientFlame(phys_comps.Source(0.01, RELEASE_FLUID), cls.orifice, AMBIENT_FLUID)
+        cls.x, cls.y, cls.z = np.array([1., 2., 0.5]), np.array([0.5, 0., 1.]), np.array([0.5, 1., 0.])
+
+    def test_matches_solved_flames(self):
+        flux = self.flame.heat_flux(self.x, self.y, self.z, 0.89)
+        self.assertEqual(flux.shape, (len(self.flame.times), 3))
+        self.assertTrue(np.allclose(flux[0], self.flame.flames[-1].Qrad_multi(self.x, self.y, self.z, 0.89)))
+        i = np.argmin(np.abs(np.log(self.flame.mdot / np.sqrt(self.flame.mdot[0] * self.flame.mdot[-1]))))
+        flame = _flame.Flame(self.flame.fluids[i], self.orifice, AMBIENT_FLUID, verbose=VERBOSE)
+        self.assertAlmostEqual(self.flame.Lvis[i], flame.Lvis)
+        self.assertAlmostEqual(self.flame.Srad[i], flame.Srad)
+        self.assertTrue(np.allclose(flux[i], flame.Qrad_multi(self.x, self.y, self.z, 0.89), rtol=0.1))
+
+    def test_thermal_dose(self):
+        dose = self.flame.thermal_dose(self.x, self.y, self.z, 0.89)
+        steady_flux = self.flame.heat_flux(self.x, self.y, self.z, 0.89, times=0)[0]
+        self.assertTrue(np.all(dose < steady_flux ** (4 / 3) * self.flame.times[-1]))
+        self.assertTrue(np.allclose(dose, self.flame.thermal_dose(self.x, self.y, self.z, 0.89, num_times=1000),
+                                    rtol=1e-3))
+        partial = self.flame.thermal_dose(self.x, self.y, self.z, 0.89, exposure_time=5)
+        self.assertTrue(np.all((partial > 0) & (partial < dose)))
+        self.assertTrue(np.all(self.flame.heat_flux(self.x, self.y, self.z, 0.89, times=2 * self.flame.times[-1]) == 0))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,213 @@
+"""
+Copyright 2015-2022 National Technology & Engineering Solutions of Sandia, LLC (NTESS).
+Under the terms of Contract DE-NA0003525 with NTESS, the U.S. Government retains certain rights in this software.
+
+You should have received a copy of the GNU General Public License along with HyRAM+.
+If not, see https://www.gnu.org/licenses/.
+"""
+
+import unittest
+
+import numpy as np
+
+from hyram.phys import _jet
+from hyram.phys._layer import LayeringJet
+import hyram.phys.api as phys_api
+import hyram.phys._comps as phys_comps
+
+
+VERBOSE = False
+
+
+def setUpModule():
+    """
+    Solves the jet shared (and not modified) by the tests in this module
+    """
+    global RELEASE_FLUID, AMBIENT_FLUID, ORIFICE, JET
+    RELEASE_FLUID = phys_api.create_fluid('H2', temp=288, pres=35e6)
+    AMBIENT_FLUID = phys_api.create_fluid('AIR', temp=288, pres=101325)
+    ORIFICE = phys_comps.Orifice(0.003)
+    JET = _jet.Jet(RELEASE_FLUID, ORIFICE, AMBIENT_FLUID, verbose=VERBOSE)
+
+
+class TestJetFieldSampling(unittest.TestCase):
+    """
+    Tests of lazy, chunked sampling of jet plume fields
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.jet = JET
+
+    def test_default_contour_data_shape(self):
+        x, y, X, Y, v, T = self.jet.get_contour_data()
+        for field in [x, y, X, Y, v, T]:
+            self.assertEqual(field.shape, (len(self.jet.S), 101))
+        self.assertTrue(np.allclose(X[:, 50], self.jet.X_cl))
+        self.assertTrue(np.allclose(y[:, 50], self.jet.y))
+
+    def test_chunks_match_full_sample(self):
+        full = self.jet.sample_fields(('X', 'T'))
+        chunks = list(self.jet.iter_fields(('X', 'T'), chunk_size=10))
+        self.assertEqual(len(chunks), int(np.ceil(len(self.jet.S) / 10)))
+        self.assertTrue(np.array_equal(np.concatenate([c['X'] for c in chunks]), full['X']))
+        self.assertTrue(np.array_equal(np.concatenate([c['T'] for c in chunks]), full['T']))
+
+    def test_only_requested_fields(self):
+        data = self.jet.sample_fields(['Y'], nS=40, nr=10, dtype=np.float32)
+        self.assertEqual(set(data.keys()), {'S', 'Y'})
+        self.assertEqual(data['Y'].shape, (40, 21))
+        self.assertEqual(data['Y'].dtype, np.float32)
+
+    def test_bounding_box(self):
+        S_end = self.jet.S[-1]
+        data = self.jet.sample_fields(['x'], bbox=(0, 0.25 * S_end, -1, 1))
+        self.assertLess(len(data['S']), len(self.jet.S))
+        self.assertLessEqual(data['S'][-2], 0.25 * S_end)
+        data = self.jet.sample_fields(['x'], bbox=(-10, -5, -1, 1))
+        self.assertEqual(len(data['S']), 0)
+
+    def test_reject_unknown_field(self):
+        with self.assertRaises(ValueError):
+            self.jet.sample_fields(['P'])
+
+
+class TestStreamlineIndex(unittest.TestCase):
+    """
+    Tests of cached centerline interpolation
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.jet = JET
+
+    def test_inverse_lookup(self):
+        S = self.jet.streamline_distance_to_mole_fraction(0.08)
+        self.assertAlmostEqual(S, np.interp(0.08, self.jet.X_cl[::-1], self.jet.S[::-1]))
+
+    def test_interp_many_matches_interp(self):
+        S = np.linspace(-1, 2 * self.jet.S[-1], 200)
+        B, y = self.jet.streamline_index.interp_many(S, ['B', 'y'])
+        self.assertTrue(np.allclose(B, np.interp(S, self.jet.S, self.jet.B)))
+        self.assertTrue(np.allclose(y, np.interp(S, self.jet.S, self.jet.y)))
+
+    def test_index_rebuilt_after_solve(self):
+        # re-solves the jet, so uses its own rather than the shared one
+        jet = _jet.Jet(RELEASE_FLUID, ORIFICE, AMBIENT_FLUID, verbose=VERBOSE)
+        index = jet.streamline_index
+        self.assertIs(index, jet.streamline_index)
+        jet.solve(Ymin=1e-2)
+        self.assertIsNot(index, jet.streamline_index)
+        self.assertAlmostEqual(jet.streamline_index.interp(jet.S[-1], fp='Y_cl'), jet.Y_cl[-1])
+
+
+class TestConcentrationAt(unittest.TestCase):
+    """
+    Tests of mole fraction queries at arbitrary locations
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.jet = JET
+
+    def test_centerline(self):
+        X = self.jet.concentration_at(self.jet.x, self.jet.y)
+        self.assertTrue(np.allclose(X, self.jet.X_cl))
+
+    def test_matches_sampled_fields(self):
+        data = self.jet.sample_fields(('x', 'y', 'X'), nr=10)
+        interior = slice(1, len(self.jet.S) // 2)
+        X = self.jet.concentration_at(data['x'][interior], data['y'][interior])
+        self.assertEqual(X.shape, data['X'][interior].shape)
+        self.assertTrue(np.allclose(X, data['X'][interior], rtol=1e-3, atol=1e-6))
+
+    def test_out_of_plane_symmetry(self):
+        S = self.jet.S[len(self.jet.S) // 2]
+        x, y = self.jet.streamline_index.interp_many(S, ['x', 'y'])
+        B = self.jet.streamline_index.interp(S, fp='B')
+        X_plus, X_minus = self.jet.concentration_at(x, y, [B, -B])
+        self.assertAlmostEqual(X_plus, X_minus)
+        self.assertLess(X_plus, self.jet.concentration_at(x, y))
+
+    def test_zero_beyond_jet(self):
+        X = self.jet.concentration_at([-1, self.jet.x[-1] + 1], [self.jet.y[0], self.jet.y[-1]])
+        self.assertTrue(np.all(X == 0))
+
+
+class TestConcentrationEnvelope(unittest.TestCase):
+    """
+    Tests of analytic iso-concentration envelopes
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.jet = JET
+
+    def test_vertices_on_iso_concentration(self):
+        for envelope in self.jet.concentration_envelope([0.04, 0.08]):
+            vertices = envelope['vertices'][1:-1]
+            X = self.jet.concentration_at(vertices[:, 0], vertices[:, 1])
+            self.assertTrue(np.allclose(X, envelope['mole_fraction'], rtol=1e-3))
+
+    def test_extents_and_volume(self):
+        lean, rich = self.jet.concentration_envelope([0.04, 0.08])
+        self.assertAlmostEqual(lean['x_extent'][1], self.jet.streamline_index.interp(
+            self.jet.streamline_distance_to_mole_fraction(0.04), fp='x'), places=2)
+        self.assertGreater(lean['x_extent'][1], rich['x_extent'][1])
+        self.assertGreater(lean['y_extent'][1], rich['y_extent'][1])
+        self.assertGreater(lean['volume'], rich['volume'])
+        self.assertGreater(rich['volume'], 0)
+
+    def test_empty_envelope(self):
+        envelope, = self.jet.concentration_envelope(0.9999)
+        self.assertEqual(len(envelope['vertices']), 0)
+        self.assertEqual(envelope['volume'], 0)
+
+
+class TestJetBatch(unittest.TestCase):
+    """
+    Tests of jets integrated together as one system
+    """
+    diameters = [0.0006, 0.003, 0.019]
+
+    def test_matches_individual_jets(self):
+        orifices = [phys_comps.Orifice(d) for d in self.diameters]
+        batch = _jet.JetBatch(RELEASE_FLUID, orifices, AMBIENT_FLUID, theta0=np.pi/4)
+        self.assertEqual(len(batch.jets), len(orifices))
+        for orifice, batch_jet in zip(orifices, batch.jets):
+            jet = _jet.Jet(RELEASE_FLUID, orifice, AMBIENT_FLUID, theta0=np.pi/4)
+            self.assertAlmostEqual(batch_jet.mass_flow_rate, jet.mass_flow_rate)
+            self.assertLessEqual(batch_jet.Y_cl[-1], 7e-4)
+            S_batch = batch_jet.streamline_distance_to_mole_fraction(0.04)
+            S_single = jet.streamline_distance_to_mole_fraction(0.04)
+            self.assertAlmostEqual(S_batch / S_single, 1, places=2)
+
+    def test_single_jet_matches_jet(self):
+        layering_jet = LayeringJet(RELEASE_FLUID, ORIFICE, AMBIENT_FLUID, Smax=3., Ymin=3e-3)
+        for jet, kwargs in [(JET, {}), (layering_jet, {'Smax': 3., 'Ymin': 3e-3})]:
+            jet_class = type(jet)
+            batch_jet, = _jet.JetBatch(RELEASE_FLUID, ORIFICE, AMBIENT_FLUID,
+                                       jet_class=jet_class, **kwargs).jets
+            self.assertIsInstance(batch_jet, jet_class)
+            self.assertAlmostEqual(batch_jet.S[-1], jet.S[-1])
+            for key in ['V_cl', 'B', 'rho_cl', 'Y_cl', 'theta', 'x', 'y', 'T_cl']:
+                np.testing.assert_allclose(getattr(batch_jet, key)[-1], getattr(jet, key)[-1],
+                                           rtol=1e-7, atol=1e-12)
+
+    def test_hazard_distances(self):
+        orifices = [phys_comps.Orifice(d) for d in self.diameters]
+        batch = _jet.JetBatch(RELEASE_FLUID, orifices, AMBIENT_FLUID)
+        levels = [0.04, 0.08, 0.3]
+        distances = batch.hazard_distances(levels)
+        self.assertEqual(distances.shape, (len(orifices), len(levels), 4))
+        for jet, jet_distances in zip(batch.jets, distances):
+            for level, (S, x, y, B) in zip(levels, jet_distances):
+                self.assertAlmostEqual(S, jet.streamline_distance_to_mole_fraction(level))
+                self.assertAlmostEqual(x, np.interp(S, jet.S, jet.x))
+                self.assertAlmostEqual(B, np.interp(S, jet.S, jet.B))
+        self.assertTrue(np.all(np.diff(distances[:, 0, 0]) > 0))
+
+    def test_reject_mismatched_lists(self):
+        orifices = [phys_comps.Orifice(d) for d in self.diameters]
+        with self.assertRaises(ValueError):
+            _jet.JetBatch(RELEASE_FLUID, orifices, AMBIENT_FLUID, theta0=[0, np.pi/2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,7 +5,11 @@ Under the terms of Contract DE-NA0003525 with NTESS, the U.S. Government retains
 You should have received a copy of the GNU General Public License along with HyRAM+.
 If not, see https://www.gnu.org/licenses/.
 """
+import os
+import shutil
+import tempfile
 import unittest
+from unittest import mock
 
 import numpy as np
 
@@ -65,6 +69,39 @@ class GenericMethodTestCase(unittest.TestCase):
         generic_larger_flam = hyram_overp.Generic_overpressure_method(self.jet_object)
         self.assertGreater(generic_larger_flam.flammable_mass, generic_smaller_flam.flammable_mass)
 
+    def test_flammable_mass_reused(self):
+        flammable_mass = self.jet_object.m_flammable(0.1, 0.75)
+        calls = []
+        integrate = self.jet_object._m_flammable
+        self.jet_object._m_flammable = lambda *args: calls.append(args) or integrate(*args)
+        generic_calc = hyram_overp.Generic_overpressure_method(self.jet_object, flammability_limits=(0.1, 0.75))
+        self.assertEqual(generic_calc.flammable_mass, flammable_mass)
+        self.assertEqual(calls, [])
+        # a new solution is integrated again
+        jet = self.jet_object
+        jet._set_solution(jet.S, np.column_stack([jet.V_cl, jet.B, jet.rho_cl, jet.Y_cl, jet.theta, jet.x, jet.y]))
+        self.assertEqual(jet.m_flammable(0.1, 0.75), flammable_mass)
+        self.assertEqual(len(calls), 1)
+
+
+class SmallOrificeTestCase(unittest.TestCase):
+    """
+    Tests of overpressure from a jet whose centerline mass fraction at the interpolated node at the
+    upper flammability limit is only just above it
+    """
+    def setUp(self):
+        ambient_fluid = Fluid(P=101325., T=288., species='air')
+        release_fluid = Fluid(T=288., P=35e6, species='hydrogen')
+        orifice = Orifice(np.sqrt(1e-3)*0.00945)  # m
+        nozzle_cons_momentum, nozzle_t_param = misc_utils.convert_nozzle_model_to_params('yuce', release_fluid)
+        self.jet_object = Jet(release_fluid, orifice, ambient_fluid,
+                              nn_conserve_momentum=nozzle_cons_momentum, nn_T=nozzle_t_param)
+
+    def test_overpressure(self):
+        locations = [(5., 0., 0.)]
+        self.assertAlmostEqual(BST_method(self.jet_object, 5.2).calc_overpressure(locations)[0], 2660, delta=1)
+        self.assertAlmostEqual(TNT_method(self.jet_object, 0.03).calc_overpressure(locations)[0], 2396, delta=1)
+
 
 class BstMethodTestCase(unittest.TestCase):
     """
@@ -128,6 +165,21 @@ class BstMethodTestCase(unittest.TestCase):
         for calc_val, test_val in zip(calculated_values, test_values):
             self.assertAlmostEqual(calc_val, test_val, places=0)
 
+    def test_calc_overpressure_grid(self):
+        x, y, z = np.meshgrid(np.linspace(-10, 10, 4), np.linspace(0, 5, 5), np.linspace(-2, 2, 3), indexing='ij')
+        locations = np.stack([x, y, z], axis=-1)  # m
+        overpressure, impulse = self.BST_calc.calc_overpressure_and_impulse(locations, chunk_size=7)
+        self.assertEqual(overpressure.shape, x.shape)
+        self.assertEqual(impulse.shape, x.shape)
+        location_list = [tuple(location) for location in locations.reshape(-1, 3)]
+        self.assertTrue(np.array_equal(overpressure.ravel(), self.BST_calc.calc_overpressure(location_list)))
+        self.assertTrue(np.array_equal(impulse.ravel(), self.BST_calc.calc_impulse(location_list)))
+        # coordinates are broadcast together
+        self.assertTrue(np.array_equal(self.BST_calc.calculate_overpressure_for_list_of_locations(x[:, :, 0], y[:, :, 0], -2),
+                                       overpressure[:, :, 0]))
+        with self.assertRaises(ValueError):
+            self.BST_calc.calc_overpressure([(1, 2)])
+
     def test_get_scaled_impulse(self):
         scaled_distance = 1.  # m/kg^(1/3)
         scaled_impulse = self.BST_calc.get_scaled_impulse(scaled_distance=scaled_distance)  # Pa*s*(m/s)/J^(1/3)/Pa^(1/3)
@@ -154,6 +206,20 @@ class BstMethodTestCase(unittest.TestCase):
         self.BST_calc.set_mach_flame_speed(mach_flame_speed=mach_flame_speed)
         self.assertEqual(self.BST_calc.mach_flame_speed, mach_flame_speed)
 
+    def test_calc_all_curves(self):
+        locations = [(1, 0, 0), (5, 1, 0), (20, 0, 3)]  # m
+        overpressure, impulse = self.BST_calc.calc_all_curves(locations)
+        self.assertEqual(overpressure.shape, (9, 3))
+        for i, mach_flame_speed in enumerate(self.BST_calc.mach_flame_speeds):
+            self.BST_calc.set_mach_flame_speed(mach_flame_speed)
+            self.assertTrue(np.allclose(overpressure[i], self.BST_calc.calc_overpressure(locations), rtol=1e-12))
+            self.assertTrue(np.allclose(impulse[i], self.BST_calc.calc_impulse(locations), rtol=1e-12))
+        overpressure, impulse = self.BST_calc.calc_all_curves(locations, [5.2, 1])
+        self.BST_calc.set_mach_flame_speed(1.0)
+        self.assertTrue(np.allclose(overpressure[1], self.BST_calc.calc_overpressure(locations), rtol=1e-12))
+        with self.assertRaises(ValueError):
+            self.BST_calc.calc_all_curves(locations, [0.5])
+
     def test_value_left_of_figure_data_returns_initial_value(self):
         for Mf in [0.2, 0.35, 0.7, 1.0, 1.4, 2.0, 3.0, 4.0, 5.2]:
             self.BST_calc.set_mach_flame_speed(mach_flame_speed=Mf)
@@ -231,6 +297,7 @@ class BauwensMethodTestCase(unittest.TestCase):
         jet_object = Jet(release_fluid, orifice, ambient_fluid,
                          nn_conserve_momentum=nozzle_cons_momentum, nn_T=nozzle_t_param)
 
+        self.jet_object = jet_object
         self.Bauwens_calc = Bauwens_method(jet_object)
 
     def test_calc_overpressure(self):
@@ -249,6 +316,88 @@ class BauwensMethodTestCase(unittest.TestCase):
         # test to check that result is non-zero
         self.assertGreater(self.Bauwens_calc.energy, 0)
 
+    def test_streamed_detonable_mass(self):
+        # detonable mass from the whole (streamline x radial) mesh at once
+        calc = self.Bauwens_calc
+        streamline_points, indices, interpolated_indices = calc.calc_streamline_discretization(50)
+        radial, streamline = calc.calc_radial_and_streamline_meshgrid(50, interpolated_indices)
+        x, y = calc.calc_spatial_discretization(radial, streamline, indices)
+        mole_fraction, mass_fraction, density = calc.get_plume_mixture_properties(indices, streamline, radial)
+        cell_size = calc.calc_detonable_cell_size(mole_fraction)
+        gradient = calc.calc_cell_size_gradient(x, y, cell_size)
+        number_cells = calc.calc_number_detonable_cells(mole_fraction, radial, gradient, cell_size, 0.1)
+        detonable_mass = calc.calc_detonable_mass(mass_fraction, number_cells, 5, density, radial, streamline_points)
+        self.assertAlmostEqual(calc.detonable_mass, detonable_mass, delta=1e-10*detonable_mass)
+        self.assertAlmostEqual(Bauwens_method(self.jet_object, block_size=5).detonable_mass, detonable_mass,
+                               delta=1e-10*detonable_mass)
+
+    def test_detonable_mass_and_origin_reused(self):
+        discretization = Bauwens_method.calc_streamline_discretization
+        with mock.patch.object(Bauwens_method, 'calc_streamline_discretization', autospec=True,
+                               side_effect=discretization) as discretize:
+            calc = Bauwens_method(self.jet_object)
+            self.assertEqual(discretize.call_count, 0)
+            self.assertEqual(calc.detonable_mass, self.Bauwens_calc.detonable_mass)
+            self.assertIs(TNT_method(self.jet_object, 0.03).origin, self.Bauwens_calc.origin)
+            # a new solution is discretized again
+            jet = self.jet_object
+            jet._set_solution(jet.S, np.column_stack([jet.V_cl, jet.B, jet.rho_cl, jet.Y_cl, jet.theta, jet.x, jet.y]))
+            self.assertAlmostEqual(Bauwens_method(jet).detonable_mass, calc.detonable_mass,
+                                   delta=1e-12*calc.detonable_mass)
+            self.assertEqual(discretize.call_count, 1)
+
+    def test_calc_overpressure_and_impulse_grid(self):
+        locations = np.zeros((2, 3, 3))
+        locations[..., 0] = [[2, 4, 6], [8, 10, 12]]  # m
+        overpressure, impulse = self.Bauwens_calc.calc_overpressure_and_impulse(locations)
+        self.assertTrue(np.array_equal(overpressure.ravel(), self.Bauwens_calc.calc_overpressure(locations.reshape(-1, 3))))
+        self.assertEqual(impulse.shape, (2, 3))
+        self.assertTrue(np.all(np.isnan(impulse)))
+
+    def test_calc_distance_to_overpressure(self):
+        overpressures = np.array([1e3, 5e3, 16e3, 70e3, 2e5])  # Pa
+        distances = self.Bauwens_calc.calc_distance_to_overpressure(overpressures)
+        self.assertEqual(distances.shape, overpressures.shape)
+        origin = self.Bauwens_calc.origin
+        locations = [(distance, origin[1], origin[2]) for distance in distances]
+        self.assertTrue(np.allclose(self.Bauwens_calc.calc_overpressure(locations), overpressures, rtol=1e-12))
+        self.assertAlmostEqual(self.Bauwens_calc.calc_distance_to_overpressure(16e3), distances[2])
+
+    def test_bisection_matches_closed_form(self):
+        scaled_overpressures = np.array([[0.01, 0.1], [0.5, 2.]])
+        generic_distances = hyram_overp.Generic_overpressure_method.get_scaled_distance_from_scaled_overpressure(
+            self.Bauwens_calc, scaled_overpressures)
+        distances = self.Bauwens_calc.calc_unscaled_distance(
+            self.Bauwens_calc.get_scaled_distance_from_scaled_overpressure(scaled_overpressures))
+        self.assertEqual(generic_distances.shape, (2, 2))
+        self.assertTrue(np.allclose(generic_distances, distances, rtol=1e-10))
+
+    def test_scalar_distance_is_float(self):
+        generic_distance = hyram_overp.Generic_overpressure_method.get_scaled_distance_from_scaled_overpressure(
+            self.Bauwens_calc, 0.1)
+        self.assertIs(type(generic_distance), float)
+        self.assertIs(type(self.Bauwens_calc.get_scaled_distance_from_scaled_overpressure(0.1)), float)
+
+    def test_bisection_stops_at_tolerance(self):
+        with mock.patch.object(self.Bauwens_calc, 'calc_overpressure',
+                               wraps=self.Bauwens_calc.calc_overpressure) as calc_overpressure:
+            hyram_overp.Generic_overpressure_method.get_scaled_distance_from_scaled_overpressure(
+                self.Bauwens_calc, np.array([0.01, 0.1]))
+        # interval of at most 500 m halved until below 1e-9 m
+        self.assertLess(calc_overpressure.call_count, 40)
+
+    def test_distance_with_offset_origin(self):
+        # distances are x-locations between the origin and max_distance, wherever the origin is
+        overpressures = np.array([16e3, 10.])  # Pa
+        distances = self.Bauwens_calc.calc_distance_to_overpressure(overpressures)
+        self.Bauwens_calc.origin = (self.Bauwens_calc.origin[0] + 3, self.Bauwens_calc.origin[1], 0.)
+        shifted_distances = self.Bauwens_calc.calc_distance_to_overpressure(overpressures)
+        generic_distances = hyram_overp.Generic_overpressure_method.get_scaled_distance_from_scaled_overpressure(
+            self.Bauwens_calc, self.Bauwens_calc.calc_scaled_overpressure(overpressures))
+        self.assertAlmostEqual(shifted_distances[0], distances[0] + 3)
+        self.assertEqual(shifted_distances[1], self.Bauwens_calc.max_distance)
+        self.assertTrue(np.allclose(generic_distances, shifted_distances, rtol=1e-10))
+
 
 class TntMethodTestCase(unittest.TestCase):
     """
@@ -426,6 +575,46 @@ class TestJallaisOverpressureH2(unittest.TestCase):
             self.assertGreater(overpressure, 0)
 
 
+class TestBlastCurves(unittest.TestCase):
+    """
+    Tests of the shared, read-only blast-wave curves
+    """
+    def test_parsed_once_and_shared(self):
+        curves = hyram_overp.BlastCurves.load('BST_OverpressureCurves.csv')
+        self.assertIs(curves, hyram_overp.BlastCurves.load('BST_OverpressureCurves.csv'))
+        csv_values = hyram_overp.Generic_overpressure_method.read_blast_wave_csv(
+            os.path.join(hyram_overp.Generic_overpressure_method.data_dir, 'BST_OverpressureCurves.csv'))
+        self.assertEqual(set(curves.keys()), set(csv_values.keys()))
+        for name, values in csv_values.items():
+            self.assertTrue(np.array_equal(curves[name], values))
+            self.assertTrue(np.array_equal(curves.reversed(name), values[::-1]))
+            self.assertFalse(curves[name].flags.writeable)
+            self.assertFalse(curves.reversed(name).flags.writeable)
+
+    def test_compiled_curves(self):
+        with tempfile.TemporaryDirectory() as data_dir:
+            shutil.copy(os.path.join(hyram_overp.Generic_overpressure_method.data_dir, 'TNT_scaled_impulse.csv'),
+                        data_dir)
+            compiled_path = hyram_overp.BlastCurves.compile('TNT_scaled_impulse.csv', data_dir)
+            self.assertTrue(os.path.exists(compiled_path))
+            hyram_overp.BlastCurves._registry.clear()
+            curves = hyram_overp.BlastCurves.load('TNT_scaled_impulse.csv', data_dir)
+            expected = hyram_overp.BlastCurves.load('TNT_scaled_impulse.csv')
+            for name in expected.keys():
+                self.assertTrue(np.array_equal(curves[name], expected[name]))
+
+    def test_interpolated_curves(self):
+        curves = hyram_overp.BlastCurves.load('BST_ImpulseCurves.csv')
+        suffixes = ['_Mf0.2', '_Mf1.0', '_Mf5.2']
+        x_names = ['scaled_distance' + suffix for suffix in suffixes]
+        y_names = ['scaled_impulse' + suffix for suffix in suffixes]
+        # includes points on steps (repeated distances) and outside of the curves
+        x = np.concatenate([curves[x_names[0]], curves[x_names[2]], np.geomspace(1e-3, 1e2, 500)])
+        values = curves.interp_curves(x, x_names, y_names)
+        self.assertEqual(values.shape, (3, len(x)))
+        for row, x_name, y_name in zip(values, x_names, y_names):
+            self.assertTrue(np.allclose(row, np.interp(x, curves[x_name], curves[y_name]), rtol=1e-12, atol=0))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,97 @@
+"""
+Copyright 2015-2022 National Technology & Engineering Solutions of Sandia, LLC (NTESS).
+Under the terms of Contract DE-NA0003525 with NTESS, the U.S. Government retains certain rights in this software.
+
+You should have received a copy of the GNU General Public License along with HyRAM+.
+If not, see https://www.gnu.org/licenses/.
+"""
+
+import unittest
+
+import numpy as np
+
+from hyram.phys import _flame, _jet, _surrogate
+import hyram.phys.api as phys_api
+import hyram.phys._comps as phys_comps
+
+
+class TestJetSurrogate(unittest.TestCase):
+    """
+    Tests of the similarity-solution jet surrogate
+    """
+    def setUp(self):
+        self.ambient_fluid = phys_api.create_fluid('AIR', temp=288, pres=101325)
+        release_fluids = [phys_api.create_fluid('H2', temp=288, pres=pres) for pres in [5e6, 35e6]]
+        self.surrogate = _surrogate.JetSurrogate.from_conditions(release_fluids, [0.001, 0.01],
+                                                                 self.ambient_fluid,
+                                                                 angles=[0, np.pi/2])
+
+    def test_prediction_against_full_solve(self):
+        release_fluid = phys_api.create_fluid('H2', temp=288, pres=15e6)
+        orifice = phys_comps.Orifice(0.003)
+        predicted = self.surrogate.predict(release_fluid, orifice, self.ambient_fluid, theta0=np.pi/2)
+        jet = _jet.Jet(release_fluid, orifice, self.ambient_fluid, theta0=np.pi/2)
+        self.assertAlmostEqual(predicted.mass_flow_rate, jet.mass_flow_rate)
+        errors = self.surrogate.compare(predicted, jet)
+        self.assertLess(np.max(np.abs(errors['streamline_distance'])), 0.05)
+        self.assertLess(errors['trajectory'], 0.05)
+        self.assertLess(errors['half_width'], 0.1)
+
+    def test_library_jet_reproduced(self):
+        release_fluid = phys_api.create_fluid('H2', temp=288, pres=5e6)
+        orifice = phys_comps.Orifice(0.001)
+        predicted = self.surrogate.predict(release_fluid, orifice, self.ambient_fluid)
+        jet = _jet.Jet(release_fluid, orifice, self.ambient_fluid)
+        errors = self.surrogate.compare(predicted, jet)
+        self.assertLess(np.max(np.abs(errors['streamline_distance'])), 0.01)
+
+    def test_validation_errors_reported(self):
+        errors = self.surrogate.validate()
+        self.assertEqual(set(errors.keys()), {'streamline_distance', 'trajectory', 'half_width'})
+        for error in errors.values():
+            self.assertGreaterEqual(error, 0)
+
+
+class TestFlameSurrogate(unittest.TestCase):
+    """
+    Tests of the normalized-trajectory flame surrogate
+    """
+    def setUp(self):
+        self.ambient_fluid = phys_api.create_fluid('AIR', temp=288, pres=101325)
+        release_fluids = [phys_api.create_fluid('H2', temp=288, pres=pres) for pres in [5e6, 35e6]]
+        self.surrogate = _surrogate.FlameSurrogate.from_conditions(release_fluids, [0.001, 0.01],
+                                                                   self.ambient_fluid,
+                                                                   angles=[0, np.pi/2])
+
+    def test_prediction_against_full_solve(self):
+        release_fluid = phys_api.create_fluid('H2', temp=288, pres=20e6)
+        orifice = phys_comps.Orifice(0.005)
+        predicted = self.surrogate.predict(release_fluid, orifice, self.ambient_fluid, theta0=np.pi/4)
+        self.assertIsNotNone(predicted.surrogate_weights)
+        flame = _flame.Flame(release_fluid, orifice, self.ambient_fluid, theta0=np.pi/4)
+        self.assertAlmostEqual(predicted.Lvis, flame.Lvis)
+        self.assertAlmostEqual(predicted.Srad, flame.Srad)
+        errors = self.surrogate.compare(predicted, flame)
+        self.assertLess(errors['trajectory'], 0.05)
+        self.assertLess(errors['half_width'], 0.15)
+        self.assertLess(np.max(np.abs(errors['heat_flux'])), 0.01)
+
+    def test_fallback_outside_library(self):
+        release_fluid = phys_api.create_fluid('H2', temp=288, pres=35e6)
+        orifice = phys_comps.Orifice(0.02)
+        predicted = self.surrogate.predict(release_fluid, orifice, self.ambient_fluid)
+        self.assertIsNone(predicted.surrogate_weights)
+        flame = _flame.Flame(release_fluid, orifice, self.ambient_fluid)
+        self.assertTrue(np.allclose(predicted.x, flame.x))
+        with self.assertRaises(ValueError):
+            self.surrogate.predict(release_fluid, orifice, self.ambient_fluid, fallback=False)
+
+    def test_validation_errors_reported(self):
+        errors = self.surrogate.validate()
+        self.assertEqual(set(errors.keys()), {'trajectory', 'half_width'})
+        for error in errors.values():
+            self.assertGreaterEqual(error, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()